@@ -1,42 +1,101 @@
 # anonymizer.py
-import google.generativeai as genai
 import os
+import asyncio
 import json
-from dotenv import load_dotenv
-load_dotenv()
+import logging
+import time
+from json_stream import SectionStreamParser, repair_json
+from metrics import stage_timer, prompt_chars, response_chars, json_repairs, first_section_seconds, resume_tokens, compaction_removed_lines, missing_fields
+from prompt_compaction import compact_resume_text, estimate_tokens, PROMPT_COMPACTION, PROMPT_TOKEN_BUDGET
+from resume_schema import Resume, normalize_resume
+from model_client import ModelClient, ModelUnavailableError
 
-# Configure the Gemini API key
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+logger = logging.getLogger(__name__)
 
-def parse_resume_to_json_gemini(resume_text: str) -> dict:
+MODEL_NAME = "gemini-2.5-flash"
+# Bump whenever the prompts change so cached parses from older prompts are not reused;
+# compaction settings are part of it since they change the text the model sees
+PROMPT_VERSION = f"4.{PROMPT_TOKEN_BUDGET}" if PROMPT_COMPACTION else "3"
+
+# System prompt defining the role and constraints of the AI
+SYSTEM_PROMPT = (
+    "You are a professional resume parser and anonymizer. "
+    "Your job is to extract only professional information "
+    "from resumes and strictly remove ALL personal information "
+    "EXCEPT for the person's name. Never include phone numbers, "
+    "email addresses, home addresses, LinkedIn URLs, or social media profiles. "
+    "Placeholders such as [EMAIL], [PHONE], [URL] or [ADDRESS] mark details that "
+    "were already removed; leave them out of the output."
+)
+
+def create_gemini_model(model_name: str):
     """
-    Parses resume text to JSON using the Google Gemini API, anonymizing personal information.
+    Default model factory. The Gemini SDK takes over a second to import, so it
+    is imported and configured here, on first use or at warmup, not at startup.
     """
-    # System prompt defining the role and constraints of the AI
-    system_prompt = (
-        "You are a professional resume parser and anonymizer. "
-        "Your job is to extract only professional information "
-        "from resumes and strictly remove ALL personal information "
-        "EXCEPT for the person's name. Never include phone numbers, "
-        "email addresses, home addresses, LinkedIn URLs, or social media profiles."
-    )
+    import google.generativeai as genai
 
-    # User prompt with instructions and the resume text
-    user_prompt = f"""
-Given this resume text:
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai.GenerativeModel(model_name)
 
-\"\"\"
-{resume_text}
-\"\"\"
+# Shared, rate-limited model client for every request in the process
+model_client = ModelClient(MODEL_NAME, create_gemini_model)
 
-1. Parse it and output valid JSON with these keys:
-- Name (string)
+def set_model_factory(factory) -> None:
+    """
+    Replace the model client factory, e.g. with a fake for benchmarks. The
+    factory takes the model name and returns an object with generate_content
+    and generate_content_async methods.
+    """
+    model_client.set_factory(factory)
+
+GENERATION_CONFIG = {"temperature": 0.1}  # Lower temperature for more consistent JSON output
+# Stream single-resume responses and parse them section by section as they arrive
+MODEL_STREAMING = os.getenv("MODEL_STREAMING", "true").lower() == "true"
+# Tokens reserved per resume for the model's answer when pacing to the TPM quota
+RESPONSE_TOKEN_ESTIMATE = 1500
+# Re-ask the model for just the required fields missing from its answer, instead
+# of failing the resume; at most SCHEMA_REPAIR_MAX_FIELDS are asked for, the rest stay empty
+SCHEMA_REPAIR = os.getenv("SCHEMA_REPAIR", "true").lower() == "true"
+SCHEMA_REPAIR_MAX_FIELDS = int(os.getenv("SCHEMA_REPAIR_MAX_FIELDS", "12"))
+REPAIR_TOKENS_PER_FIELD = 40
+
+RESUME_SCHEMA = """- Name (string)
 - Summary (string)
 - Skills (array of strings)
 - Experience (array of objects: job_title, company, dates, description)
 - Education (array of objects: degree, school, dates, description)
 - Projects (array of objects: title, description, technologies, dates)
-- Achievements (array of strings)
+- Achievements (array of strings)"""
+
+def compact(resume_text: str) -> str:
+    """
+    Compact resume text for the prompt when PROMPT_COMPACTION is on
+    """
+    if not PROMPT_COMPACTION:
+        return resume_text
+    with stage_timer("compact"):
+        compacted, stats = compact_resume_text(resume_text)
+    resume_tokens.observe(stats["tokensBefore"], stage="raw")
+    resume_tokens.observe(stats["tokensAfter"], stage="compacted")
+    for reason, count in stats["linesRemoved"].items():
+        compaction_removed_lines.inc(count, reason=reason)
+    logger.info(f"Compacted resume text from ~{stats['tokensBefore']} to ~{stats['tokensAfter']} tokens")
+    return compacted
+
+def build_user_prompt(resume_text: str) -> str:
+    """
+    Builds the user prompt with instructions and the resume text.
+    """
+    return f"""
+Given this resume text:
+
+\"\"\"
+{resume_text}
+\"\"\"
+
+1. Parse it and output valid JSON with these keys:
+{RESUME_SCHEMA}
 
 2. Do not include any phone number, email, address, links, or personal identifiers other than the name.
 
@@ -45,30 +104,213 @@ Given this resume text:
 Return ONLY the JSON.
 """
 
-    # Initialize the Generative Model
-    model = genai.GenerativeModel('gemini-2.5-flash')
-    
+def build_batch_prompt(resume_texts: list) -> str:
+    """
+    Builds one user prompt carrying several resumes, answered with a JSON array.
+    """
+    resumes = "\n\n".join(
+        f"Resume {i}:\n\"\"\"\n{text}\n\"\"\"" for i, text in enumerate(resume_texts, start=1)
+    )
+    return f"""
+Given these {len(resume_texts)} resume texts:
+
+{resumes}
+
+1. Parse each resume separately and output a valid JSON array with exactly {len(resume_texts)} objects,
+in the same order as the resumes above. Each object has these keys:
+{RESUME_SCHEMA}
+
+2. Do not include any phone number, email, address, links, or personal identifiers other than the name.
+
+3. Never mix information between resumes, and make sure your JSON is clean and does not contain any keys with personal information.
+
+Return ONLY the JSON array.
+"""
+
+def _describe_field(resume: Resume, path: str) -> str:
+    """
+    The missing field's path, with the fields already known for its entry so
+    the model can tell which entry is meant
+    """
+    section, _, _ = path.partition("[")
+    if section == path:
+        return f"- {path}"
+    index = int(path[len(section) + 1:path.index("]")])
+    entry = getattr(resume, section.lower())[index]
+    known = ", ".join(f'{name}: "{value}"' for name, value in entry.to_dict().items() if isinstance(value, str) and value)
+    return f"- {path} (the entry with {known})" if known else f"- {path}"
+
+def build_repair_prompt(resume_text: str, resume: Resume, missing: list) -> str:
+    """
+    Builds a prompt asking only for the given missing fields of an earlier parse.
+    """
+    fields = "\n".join(_describe_field(resume, path) for path in missing)
+    return f"""
+Given this resume text:
+
+\"\"\"
+{resume_text}
+\"\"\"
+
+An earlier parse of it left out these fields:
+{fields}
+
+Return ONLY a JSON object with exactly these keys (as written above, e.g. "Experience[0].company"),
+each mapped to the field's value as a string, or "" if the resume does not state it.
+Do not include any phone number, email, address, links, or personal identifiers other than the name.
+"""
+
+async def complete_resume(resume_text: str, parsed) -> dict:
+    """
+    Normalize parsed model output to the resume schema, asking the model again
+    for required fields it left out. A failed repair leaves those fields empty.
+    """
+    resume, missing = normalize_resume(parsed)
+    if not missing:
+        return resume.to_dict()
+    if not SCHEMA_REPAIR:
+        missing_fields.inc(len(missing), outcome="skipped")
+        return resume.to_dict()
+
+    asked = missing[:SCHEMA_REPAIR_MAX_FIELDS]
+    if len(missing) > len(asked):
+        missing_fields.inc(len(missing) - len(asked), outcome="skipped")
+    logger.info(f"Model output is missing {len(missing)} field(s), asking again for {len(asked)}: {', '.join(asked)}")
     try:
-        # Generate content with the specified JSON output format
-        response = model.generate_content(
-            [system_prompt, user_prompt],
-            generation_config={"temperature": 0.1}  # Lower temperature for more consistent JSON output
+        user_prompt = build_repair_prompt(resume_text, resume, asked)
+        prompt_chars.observe(len(SYSTEM_PROMPT) + len(user_prompt))
+        response = await model_client.generate(
+            [SYSTEM_PROMPT, user_prompt],
+            tokens=estimate_tokens(SYSTEM_PROMPT + user_prompt) + REPAIR_TOKENS_PER_FIELD * len(asked),
+            stage="model_repair",
+            generation_config=GENERATION_CONFIG
         )
-        print(response.text)
-        
-        # Extract and parse the JSON from the response
-        # Clean the response text to ensure it only contains the JSON part
-        response_text = response.text.strip()
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]  # Remove ```
-        
-        response_text = response_text.strip()
+        values = parse_model_response(response.text)
+        if not isinstance(values, dict):
+            raise ValueError("Expected a JSON object of field values")
+    except Exception as e:
+        logger.warning(f"Could not repair missing fields, leaving them empty: {str(e)}")
+        missing_fields.inc(len(asked), outcome="unrepaired")
+        return resume.to_dict()
+
+    repaired = sum(1 for path in asked if path in values and resume.set_path(path, values[path]))
+    missing_fields.inc(repaired, outcome="repaired")
+    if repaired < len(asked):
+        missing_fields.inc(len(asked) - repaired, outcome="unrepaired")
+    return resume.to_dict()
+
+def parse_model_response(raw_text: str):
+    """
+    Extracts and parses the JSON from a model response.
+    """
+    response_chars.observe(len(raw_text))
+    with stage_timer("json_parse"):
+        return _load_json(raw_text)
+
+def _load_json(raw_text: str):
+    # Clean the response text to ensure it only contains the JSON part
+    response_text = raw_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]  # Remove ```json
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]  # Remove ```
+
+    response_text = response_text.strip()
+    try:
         return json.loads(response_text)
-        
     except json.JSONDecodeError as e:
-        # Log the error and the response for debugging
-        raise ValueError(f"Failed to parse JSON from Gemini response: {e}\nResponse text: {response.text}")
+        error = e
+    # Fix trailing commas, truncation and similar slips locally instead of asking again
+    try:
+        parsed = repair_json(raw_text)
+    except ValueError:
+        # Keep the response in the error for debugging
+        raise ValueError(f"Failed to parse JSON from Gemini response: {error}\nResponse text: {raw_text}")
+    json_repairs.inc()
+    logger.warning(f"Repaired malformed JSON in Gemini response ({error})")
+    return parsed
+
+async def parse_resume_to_json_gemini_async(resume_text: str, on_section=None) -> dict:
+    """
+    Parse resume text to JSON with Gemini, anonymizing personal information.
+    The call goes through the shared model client, so it is paced to the
+    quota, and is awaited on the async transport. With
+    MODEL_STREAMING, on_section(key, value) is called once for each
+    top-level section as soon as it has been received.
+    """
+    try:
+        resume_text = compact(resume_text)
+        user_prompt = build_user_prompt(resume_text)
+        prompt_chars.observe(len(SYSTEM_PROMPT) + len(user_prompt))
+        tokens = estimate_tokens(SYSTEM_PROMPT + user_prompt) + RESPONSE_TOKEN_ESTIMATE
+        if MODEL_STREAMING:
+            # Sections already handed on; a retried attempt streams them again
+            sent = set()
+            raw_text = await model_client.generate(
+                [SYSTEM_PROMPT, user_prompt],
+                tokens=tokens,
+                consume=lambda response: _read_stream(response, on_section, sent),
+                stream=True,
+                generation_config=GENERATION_CONFIG
+            )
+        else:
+            response = await model_client.generate(
+                [SYSTEM_PROMPT, user_prompt],
+                tokens=tokens,
+                generation_config=GENERATION_CONFIG
+            )
+            raw_text = response.text
+        logger.debug("Gemini response: %s", raw_text)
+        return await complete_resume(resume_text, parse_model_response(raw_text))
+
+    except (ValueError, ModelUnavailableError):
+        raise
     except Exception as e:
         raise ValueError(f"Error while processing with Gemini API: {str(e)}")
+
+async def _read_stream(response, on_section, sent: set) -> str:
+    """
+    Collect a streamed response, handing completed sections not in sent to
+    on_section and adding them to it
+    """
+    parser = SectionStreamParser()
+    chunks = []
+    start = time.perf_counter()
+    first = True
+    async for chunk in response:
+        chunks.append(chunk.text)
+        for key, value in parser.feed(chunk.text):
+            if first:
+                first_section_seconds.observe(time.perf_counter() - start)
+                first = False
+            if on_section is not None and key not in sent:
+                sent.add(key)
+                on_section(key, value)
+    return "".join(chunks)
+
+async def parse_resumes_batch_gemini_async(resume_texts: list) -> list:
+    """
+    Parses several resumes with a single Gemini request and splits the JSON
+    array back into one dict per resume, in input order.
+    """
+    try:
+        resume_texts = [compact(text) for text in resume_texts]
+        user_prompt = build_batch_prompt(resume_texts)
+        prompt_chars.observe(len(SYSTEM_PROMPT) + len(user_prompt))
+        response = await model_client.generate(
+            [SYSTEM_PROMPT, user_prompt],
+            tokens=estimate_tokens(SYSTEM_PROMPT + user_prompt) + RESPONSE_TOKEN_ESTIMATE * len(resume_texts),
+            stage="model_batch",
+            generation_config=GENERATION_CONFIG
+        )
+        logger.debug("Gemini response: %s", response.text)
+        parsed = parse_model_response(response.text)
+
+    except (ValueError, ModelUnavailableError):
+        raise
+    except Exception as e:
+        raise ValueError(f"Error while processing with Gemini API: {str(e)}")
+
+    if not isinstance(parsed, list) or len(parsed) != len(resume_texts):
+        raise ValueError(f"Expected a JSON array of {len(resume_texts)} resumes from Gemini batch response")
+    return list(await asyncio.gather(*(complete_resume(text, data) for text, data in zip(resume_texts, parsed))))
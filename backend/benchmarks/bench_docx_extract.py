@@ -0,0 +1,164 @@
+# benchmarks/bench_docx_extract.py
+"""
+Benchmark of DOCX text extraction: the streaming extractor against loading
+the document with python-docx and joining its paragraphs, with a parity
+check on a corpus of plain, templated (tables, headers, footers, a text box)
+and very long resumes.
+
+Run from the backend directory:
+    python benchmarks/bench_docx_extract.py [--iterations 20] [--long-jobs 400]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+from docx.oxml import parse_xml
+from corpus import resume_lines, write_docx
+from docx_extract import extract_docx_text
+
+TEXT_BOX_XML = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+def python_docx_text(source) -> str:
+    """
+    The previous extraction path: body paragraphs only
+    """
+    return "\n".join(p.text for p in Document(source).paragraphs)
+
+def write_templated_docx(path: str, rng: random.Random) -> list:
+    """
+    A CV laid out like common templates: contact details in the header,
+    work history in a dates | details table, a sidebar text box and a footer.
+    Returns the lines that must appear in the extracted text, each once.
+    """
+    lines = resume_lines(rng, jobs=4)
+    doc = Document()
+    section = doc.sections[0]
+    section.header.paragraphs[0].text = lines[0]
+    section.header.add_paragraph(lines[1])
+    footer = f"{lines[0]} - Curriculum Vitae"
+    section.footer.paragraphs[0].text = footer
+
+    doc.add_paragraph(lines[2])
+    summary = doc.add_paragraph(lines[3])
+    summary.add_run().add_break()
+    summary.add_run("Open to\trelocation")
+    text_box = f"Languages: English, {rng.choice(['Malay', 'Mandarin', 'Tamil'])}"
+    doc.add_paragraph()._p.append(parse_xml(TEXT_BOX_XML.format(text=text_box)))
+
+    doc.add_paragraph("Work Experience")
+    expected = [lines[0], lines[1], footer, lines[3], text_box, "Open to\trelocation"]
+    table = doc.add_table(rows=0, cols=2)
+    for index in range(4):
+        dates = f"{2020 - 2 * index} - {2022 - 2 * index}"
+        left, right = table.add_row().cells
+        left.text = dates
+        right.text = f"Engineer at Company {index}"
+        for bullet in range(3):
+            right.add_paragraph(f"Delivered improvement {index}.{bullet}")
+        expected += [dates, f"Engineer at Company {index}", f"Delivered improvement {index}.2"]
+    skills = table.add_row().cells
+    skills[0].text = "Skills"
+    skills[1].text = lines[5]
+    expected.append(f"Skills\t{lines[5]}")
+
+    doc.add_paragraph("Education")
+    doc.add_paragraph(lines[-1])
+    expected.append(lines[-1])
+    doc.save(path)
+    return expected
+
+def is_subsequence(needles: list, haystack: list) -> bool:
+    remaining = iter(haystack)
+    return all(any(line == needle for line in remaining) for needle in needles)
+
+def check_parity(path: str, expected: list) -> list:
+    """
+    Problems found: body paragraphs missing or out of order, expected lines
+    missing or repeated
+    """
+    problems = []
+    lines = extract_docx_text(path).split("\n")
+    if not is_subsequence(python_docx_text(path).split("\n"), lines):
+        problems.append(f"{os.path.basename(path)}: body paragraphs missing or out of order")
+    for needle in expected:
+        count = lines.count(needle)
+        if count != 1:
+            problems.append(f"{os.path.basename(path)}: {needle!r} found {count} times")
+    return problems
+
+def measure(fn, path: str, iterations: int) -> tuple:
+    """
+    Mean seconds per call and peak memory traced by tracemalloc in one call.
+    Only Python allocations are traced, so python-docx's lxml tree (C memory)
+    is not counted and its figure is a lower bound.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(path)
+    seconds = (time.perf_counter() - start) / iterations
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--long-jobs", type=int, default=400, help="Jobs in the long resume")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = {}
+        plain_path = os.path.join(tmp, "plain.docx")
+        write_docx(plain_path, resume_lines(rng, jobs=4))
+        corpus["plain"] = (plain_path, [])
+        for index in range(3):
+            path = os.path.join(tmp, f"templated_{index}.docx")
+            corpus[f"templated_{index}"] = (path, write_templated_docx(path, rng))
+        long_path = os.path.join(tmp, "long.docx")
+        write_docx(long_path, resume_lines(rng, jobs=args.long_jobs))
+        corpus["long"] = (long_path, [])
+
+        problems = [problem for path, expected in corpus.values() for problem in check_parity(path, expected)]
+
+        print(f"{'document':<12} {'KB':>7} {'python-docx ms':>15} {'streaming ms':>13} {'speedup':>8} "
+              f"{'python-docx MB':>15} {'streaming MB':>13} {'chars old/new':>15}")
+        for label in ("plain", "templated_0", "long"):
+            path = corpus[label][0]
+            old_seconds, old_peak = measure(python_docx_text, path, args.iterations)
+            new_seconds, new_peak = measure(extract_docx_text, path, args.iterations)
+            chars = f"{len(python_docx_text(path))}/{len(extract_docx_text(path))}"
+            print(f"{label:<12} {os.path.getsize(path) / 1024:>7.1f} {old_seconds * 1000:>15.2f} {new_seconds * 1000:>13.2f} "
+                  f"{old_seconds / new_seconds:>7.1f}x {old_peak / 1e6:>15.2f} {new_peak / 1e6:>13.2f} {chars:>15}")
+
+    print("MB is peak Python heap per call; python-docx also holds the whole lxml tree outside it")
+    print(f"parity: {'ok' if not problems else 'MISMATCH'}")
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
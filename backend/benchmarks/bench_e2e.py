@@ -0,0 +1,210 @@
+# benchmarks/bench_e2e.py
+"""
+End-to-end throughput benchmark of the backend against a local fake Gemini.
+
+Starts the FastAPI app with uvicorn on a local port, replaces the model
+client with benchmarks/fake_gemini.py, generates a synthetic PDF/DOCX corpus
+and drives /anonymize-single and /anonymize-batch at several concurrency
+levels. Reports p50/p95/p99 latency, requests per second, mean time per
+pipeline stage and peak RSS per scenario.
+
+Run from the backend directory:
+    python benchmarks/bench_e2e.py --requests 40 --concurrency 1,4,16 --latency 1.0
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux and bytes on macOS; only the peak is available here
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+class RssSampler:
+    """
+    Samples process RSS in the background and tracks the peak per scenario
+    """
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_mb())
+            time.sleep(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def reset(self):
+        self.peak = current_rss_mb()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    # Nearest rank
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def stage_means(before: dict, after: dict) -> dict:
+    means = {}
+    for key, (count, total) in after.items():
+        prev_count, prev_total = before.get(key, (0, 0.0))
+        if count > prev_count:
+            means[dict(key)["stage"]] = (total - prev_total) / (count - prev_count)
+    return means
+
+async def run_scenario(client, corpus: list, endpoint: str, requests: int, concurrency: int, batch_size: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            if endpoint == "/anonymize-batch":
+                paths = [corpus[(i * batch_size + j) % len(corpus)] for j in range(batch_size)]
+                files = [("files", (os.path.basename(p), open(p, "rb").read())) for p in paths]
+            else:
+                path = corpus[i % len(corpus)]
+                files = {"file": (os.path.basename(path), open(path, "rb").read())}
+            start = time.perf_counter()
+            response = await client.post(endpoint, files=files, params={"bypass_cache": "true"})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+            elif endpoint == "/anonymize-batch":
+                errors += sum(1 for result in response.json()["results"] if "error" in result)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    resumes = requests * (batch_size if endpoint == "/anonymize-batch" else 1)
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "requests_per_second": requests / elapsed,
+        "resumes_per_second": resumes / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end backend benchmark against a fake Gemini")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per scenario")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--corpus-size", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=10, help="Files per /anonymize-batch request (0 skips batch scenarios)")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Uniform +/- jitter on the fake latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake model calls that fail with a 429")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    report = sys.stdout
+    workdir = tempfile.mkdtemp(prefix="resume-bench-")
+    # Keep benchmark state out of the working tree and run job workers only on demand
+    os.environ.setdefault("RESULT_CACHE_PATH", os.path.join(workdir, "result_cache.db"))
+    os.environ.setdefault("JOB_DB_PATH", os.path.join(workdir, "jobs.db"))
+    os.environ.setdefault("JOB_WORKERS", "0")
+    os.chdir(workdir)
+
+    import httpx
+    import uvicorn
+    from corpus import generate_corpus
+    from fake_gemini import FakeGeminiFactory
+
+    sampler = RssSampler()
+    sampler.start()
+    scenarios = []
+
+    sampler.reset()
+    start = time.perf_counter()
+    corpus = generate_corpus(os.path.join(workdir, "corpus"), args.corpus_size)
+    print(f"corpus: {len(corpus)} files in {time.perf_counter() - start:.2f} s, peak RSS {sampler.peak:.1f} MB", file=report)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import anonymizer
+        import main as app_module
+        import metrics
+        logging.getLogger().setLevel(logging.WARNING)
+
+        fake = FakeGeminiFactory(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+        anonymizer.set_model_factory(fake)
+
+        server = uvicorn.Server(uvicorn.Config(app_module.app, host="127.0.0.1", port=args.port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        async def drive():
+            timeout = httpx.Timeout(600.0)
+            limits = httpx.Limits(max_connections=None)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=timeout, limits=limits) as client:
+                plans = [("/anonymize-single", int(c)) for c in args.concurrency.split(",")]
+                if args.batch_size > 0:
+                    plans += [("/anonymize-batch", int(c)) for c in args.concurrency.split(",")]
+                for endpoint, concurrency in plans:
+                    requests = args.requests if endpoint == "/anonymize-single" else max(1, args.requests // args.batch_size)
+                    sampler.reset()
+                    before = metrics.stage_seconds.snapshot()
+                    calls_before = fake.calls
+                    result = await run_scenario(client, corpus, endpoint, requests, concurrency, args.batch_size)
+                    result["stage_mean_seconds"] = stage_means(before, metrics.stage_seconds.snapshot())
+                    result["model_calls"] = fake.calls - calls_before
+                    result["peak_rss_mb"] = sampler.peak
+                    scenarios.append(result)
+
+        asyncio.run(drive())
+        server.should_exit = True
+        thread.join()
+    sampler.stop()
+
+    print(f"fake model latency {args.latency}s ± {args.jitter}s, error rate {args.error_rate}", file=report)
+    print(f"{'endpoint':<18} {'conc':>4} {'reqs':>5} {'err':>4} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+          f"{'req/s':>7} {'cv/s':>7} {'calls':>5} {'RSS MB':>7}", file=report)
+    for r in scenarios:
+        print(f"{r['endpoint']:<18} {r['concurrency']:>4} {r['requests']:>5} {r['errors']:>4} {r['p50']:>7.3f} "
+              f"{r['p95']:>7.3f} {r['p99']:>7.3f} {r['requests_per_second']:>7.2f} {r['resumes_per_second']:>7.2f} "
+              f"{r['model_calls']:>5} {r['peak_rss_mb']:>7.1f}", file=report)
+        stages = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in sorted(r["stage_mean_seconds"].items()))
+        print(f"{'':<18} stage means: {stages}", file=report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "scenarios": scenarios}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
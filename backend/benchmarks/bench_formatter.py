@@ -0,0 +1,105 @@
+# benchmarks/bench_formatter.py
+"""
+Microbenchmark of DOCX formatting: the precompiled template engine against
+building every document from scratch with python-docx, plus the PDF and
+HTML preview renderers on the same resume.
+
+Run from the backend directory:
+    python benchmarks/bench_formatter.py [--iterations 200] [--entries 5]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+from formatter import get_template_engine
+from reference_formatter import render_with_python_docx
+from renderers import render_resume
+
+def sample_resume(entries: int) -> dict:
+    return {
+        "Name": "Alex Tan",
+        "Summary": "Backend engineer with experience building APIs and data pipelines.",
+        "Skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes"],
+        "Experience": [
+            {
+                "job_title": f"Software Engineer {i}",
+                "company": f"Company {i}",
+                "dates": f"{2010 + i} - {2011 + i}",
+                "description": [f"Delivered project {i}.{j}" for j in range(4)],
+            }
+            for i in range(entries)
+        ],
+        "Education": [
+            {"degree": "BSc Computer Science", "school": "National University", "dates": "2006 - 2010", "description": "Honours"},
+        ],
+        "Projects": [
+            {"title": f"Project {i}", "description": f"Line one\nLine two", "technologies": "Python, Redis", "dates": "2020"}
+            for i in range(entries)
+        ],
+        "Achievements": [f"Award {i}" for i in range(entries)],
+    }
+
+def paragraph_signature(path_or_bytes) -> list:
+    """
+    Text, style and run formatting of every body paragraph, for parity checks
+    """
+    source = io.BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
+    doc = Document(source)
+    header = [cell.text for cell in doc.tables[0].rows[0].cells]
+    paragraphs = [
+        (p.style.name, p.text, [(r.bold, r.italic, r.font.size) for r in p.runs], p.paragraph_format.space_after)
+        for p in doc.paragraphs
+    ]
+    return [header] + paragraphs
+
+def time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=5, help="Experience/project entries per resume")
+    args = parser.parse_args()
+
+    data = sample_resume(args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_path = os.path.join(tmp, "reference.docx")
+        engine_path = os.path.join(tmp, "engine.docx")
+
+        start = time.perf_counter()
+        engine = get_template_engine()
+        setup = time.perf_counter() - start
+
+        render_with_python_docx(data, reference_path)
+        engine.render(data, engine_path)
+        parity = paragraph_signature(reference_path) == paragraph_signature(engine_path)
+
+        reference = time_per_call(lambda: render_with_python_docx(data, reference_path), args.iterations)
+        precompiled = time_per_call(lambda: engine.render(data, engine_path), args.iterations)
+        render_resume(data, "pdf")
+        pdf = time_per_call(lambda: render_resume(data, "pdf"), args.iterations)
+        preview = time_per_call(lambda: render_resume(data, "html"), args.iterations)
+
+    print(f"entries per section:   {args.entries}")
+    print(f"engine one-time setup: {setup * 1000:.2f} ms")
+    print(f"python-docx per doc:   {reference * 1000:.2f} ms")
+    print(f"template engine:       {precompiled * 1000:.2f} ms")
+    print(f"speedup:               {reference / precompiled:.1f}x")
+    print(f"pdf renderer:          {pdf * 1000:.2f} ms")
+    print(f"html preview:          {preview * 1000:.2f} ms")
+    print(f"output parity:         {'ok' if parity else 'MISMATCH'}")
+    if not parity:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/bench_logging.py
+"""
+Benchmark of logging overhead on the request path: the previous setup
+(synchronous file and console handlers, an eagerly built JSON debug line and
+the model response printed to stdout) against the queued logging pipeline
+with lazy payloads, measured as time spent in the calling thread.
+
+Run from the backend directory:
+    python benchmarks/bench_logging.py [--requests 2000] [--gap-ms 2]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_gemini import CANNED_RESUME
+from log_config import LazyJson, configure_logging, shutdown_logging
+
+logger = logging.getLogger("bench")
+RESPONSE_TEXT = "```json\n" + json.dumps(CANNED_RESUME) + "\n```"
+
+def old_request(index: int) -> None:
+    """
+    The log calls of one upload before the logging pipeline
+    """
+    logger.info(f"Starting to process file: resume_{index}.pdf (Type: .pdf)")
+    logger.info(f"Generated file ID: {index}")
+    logger.info(f"Processing PDF file: resume_{index}.pdf")
+    logger.info(f"Successfully extracted 4210 characters from PDF")
+    logger.info(f"Redacted before AI processing: email=1, phone=1")
+    logger.info(f"Starting AI model processing for resume_{index}.pdf")
+    print(RESPONSE_TEXT)
+    logger.info("AI model processing completed successfully")
+    logger.debug(f"Parsed data: {json.dumps(CANNED_RESUME, indent=2)}")
+    logger.info(f"Generating anonymized document: {index}_resume_anonymized.docx")
+    logger.info(f"Successfully processed resume_{index}.pdf in 1.52 seconds")
+
+def new_request(index: int) -> None:
+    """
+    The same log calls with the model response and parsed data as lazy debug records
+    """
+    logger.info(f"Starting to process file: resume_{index}.pdf (Type: .pdf)")
+    logger.info(f"Generated file ID: {index}")
+    logger.info(f"Processing PDF file: resume_{index}.pdf")
+    logger.info(f"Successfully extracted 4210 characters from PDF")
+    logger.info(f"Redacted before AI processing: email=1, phone=1")
+    logger.info(f"Starting AI model processing for resume_{index}.pdf")
+    logger.debug("Gemini response: %s", RESPONSE_TEXT)
+    logger.info("AI model processing completed successfully")
+    logger.debug("Parsed data: %s", LazyJson(CANNED_RESUME, indent=2))
+    logger.info(f"Generating anonymized document: {index}_resume_anonymized.docx")
+    logger.info(f"Successfully processed resume_{index}.pdf in 1.52 seconds")
+
+def time_requests(request, count: int, gap: float) -> list:
+    """
+    Time each request's log calls, pausing gap seconds between requests as a
+    server does while it awaits the model, which is when the writer thread runs
+    """
+    durations = []
+    for index in range(count):
+        start = time.perf_counter()
+        request(index)
+        durations.append(time.perf_counter() - start)
+        time.sleep(gap)
+    return durations
+
+def report(label: str, durations: list, drain: float = 0.0) -> None:
+    durations = sorted(durations)
+    p99 = durations[int(len(durations) * 0.99) - 1]
+    line = f"{label:<28} mean {statistics.mean(durations) * 1e6:8.1f} us   p99 {p99 * 1e6:8.1f} us"
+    if drain:
+        line += f"   writer drain {drain * 1000:.1f} ms"
+    print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--gap-ms", type=float, default=2.0, help="Idle time between requests")
+    args = parser.parse_args()
+
+    gap = args.gap_ms / 1000
+    root = logging.getLogger()
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        # Console output goes to /dev/null in both setups, so only the handler work is compared
+        old_handlers = [logging.FileHandler(os.path.join(tmp, "old.log")), logging.StreamHandler(devnull)]
+        for handler in old_handlers:
+            handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+            root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        with contextlib.redirect_stdout(devnull):
+            old = time_requests(old_request, args.requests, gap)
+        for handler in old_handlers:
+            root.removeHandler(handler)
+            handler.close()
+
+        stderr, sys.stderr = sys.stderr, devnull
+        try:
+            # A queue large enough for the whole run, so no record is dropped and timings stay comparable
+            queue_size = args.requests * 11 + 1
+            configure_logging("INFO", os.path.join(tmp, "new.log"), queue_size=queue_size)
+            queued = time_requests(new_request, args.requests, gap)
+            start = time.perf_counter()
+            shutdown_logging()
+            drain = time.perf_counter() - start
+
+            configure_logging("DEBUG", os.path.join(tmp, "debug.log"), queue_size=queue_size, debug_sample_rate=0.1)
+            debug = time_requests(new_request, args.requests, gap)
+            start = time.perf_counter()
+            shutdown_logging()
+            debug_drain = time.perf_counter() - start
+        finally:
+            sys.stderr = stderr
+
+    print(f"{args.requests} simulated requests, 11 log calls each; time spent in the request thread")
+    report("synchronous (before)", old)
+    report("queued, INFO", queued, drain)
+    report("queued, DEBUG sampled 10%", debug, debug_drain)
+    print(f"request-path speedup at INFO: {statistics.mean(old) / statistics.mean(queued):.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_prompt.py
+"""
+Benchmark of prompt compaction: estimated prompt tokens per resume before and
+after compact_resume_text on synthetic multi-page extractions with running
+headers, page numbers, table junk and low-value sections, plus its CPU cost.
+
+Run from the backend directory:
+    python benchmarks/bench_prompt.py [--resumes 200] [--pages 3] [--budget 6000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from anonymizer import SYSTEM_PROMPT, build_user_prompt
+from corpus import resume_lines
+from prompt_compaction import compact_resume_text, estimate_tokens
+
+def extracted_text(rng: random.Random, pages: int) -> str:
+    """
+    Resume text shaped like a pdfplumber extraction: form-feed separated pages,
+    each with the name and a footer, ragged spacing and ruled table rows
+    """
+    lines = resume_lines(rng, jobs=4 * pages)
+    lines += ["Hobbies", "Chess, hiking and photography", "References", "Available upon request"]
+    name = lines[0]
+    per_page = -(-len(lines) // pages)
+    out = []
+    for number in range(pages):
+        body = [
+            line.replace(" ", "   ") if rng.random() < 0.3 else line
+            for line in lines[number * per_page:(number + 1) * per_page]
+        ]
+        if rng.random() < 0.5:
+            body.insert(len(body) // 2, "|  |  |")
+            body.insert(len(body) // 2, "(cid:127) " + "." * 12)
+        out.append("\n".join([f"{name}   Curriculum Vitae"] + body + [f"Page {number + 1} of {pages}"]))
+    return "\f".join(out)
+
+def prompt_tokens(text: str) -> int:
+    return estimate_tokens(SYSTEM_PROMPT + build_user_prompt(text))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=6000, help="Token budget for the resume text")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [extracted_text(rng, args.pages) for _ in range(args.resumes)]
+
+    before, after, seconds = [], [], []
+    for text in texts:
+        start = time.perf_counter()
+        compacted, _ = compact_resume_text(text, args.budget)
+        seconds.append(time.perf_counter() - start)
+        before.append(prompt_tokens(text))
+        after.append(prompt_tokens(compacted))
+
+    reduction = 1 - sum(after) / sum(before)
+    print(f"resumes:                {args.resumes} x {args.pages} pages")
+    print(f"prompt tokens before:   mean {statistics.mean(before):.0f}, max {max(before)}")
+    print(f"prompt tokens after:    mean {statistics.mean(after):.0f}, max {max(after)}")
+    print(f"reduction:              {reduction:.1%}")
+    print(f"compaction per resume:  {statistics.mean(seconds) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
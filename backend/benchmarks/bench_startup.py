@@ -0,0 +1,124 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark of worker cold start: seconds to import the API module in a fresh
+interpreter, the modules that dominate it, and the background warm-up that
+runs before /readyz reports ready. With --history each run is appended to a
+JSON lines file, and the recorded runs are listed, so cold-start time can be
+tracked from commit to commit.
+
+Run from the backend directory:
+    python benchmarks/bench_startup.py [--runs 5] [--history startup_history.jsonl]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints its timings as JSON on the last line
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {backend!r})
+start = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - start
+result = {{"import": import_seconds}}
+if {warm_up!r}:
+    start = time.perf_counter()
+    result["steps"] = main.pipeline.warm_up()
+    result["warmup"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+def run_child(workdir: str, warm_up: bool = False, trace: bool = False) -> tuple:
+    """
+    Import main (and optionally warm up) in a new interpreter. Returns the
+    child's timings and, when traced with -X importtime (which slows the
+    import down), the cumulative import microseconds of each module main
+    imported directly.
+    """
+    env = dict(
+        os.environ,
+        JOB_DB_PATH=os.path.join(workdir, "jobs.db"),
+        JOB_WORKERS="0",
+        RESULT_CACHE_PATH=os.path.join(workdir, "cache.db"),
+        OUTPUT_DIR=os.path.join(workdir, "outputs"),
+        OUTPUT_INDEX_PATH=os.path.join(workdir, "outputs.db"),
+        LOG_FILE="",
+        LOG_CONSOLE="false",
+    )
+    completed = subprocess.run(
+        [sys.executable, *(["-X", "importtime"] if trace else []), "-c", CHILD.format(backend=BACKEND_DIR, warm_up=warm_up)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Names are indented two spaces per nesting level; main's direct imports
+        # are one level in, and everything nested is already in their totals
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) == 3:
+            modules[name.strip()] = modules.get(name.strip(), 0) + int(cumulative)
+    return json.loads(completed.stdout.strip().splitlines()[-1]), modules
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_history(path: str, limit: int = 10) -> None:
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    print(f"\nlast {min(limit, len(entries))} of {len(entries)} runs in {path}")
+    print(f"{'date':<20} {'commit':<10} {'import s':>9} {'warm-up s':>10} {'cold start s':>13}")
+    for entry in entries[-limit:]:
+        print(f"{entry['date'][:19]:<20} {entry['commit']:<10} {entry['import_seconds']:>9.3f} "
+              f"{entry['warmup_seconds']:>10.3f} {entry['import_seconds'] + entry['warmup_seconds']:>13.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time the import in")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports of main to list")
+    parser.add_argument("--history", help="JSON lines file to append this run to")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [run_child(workdir)[0]["import"] for _ in range(args.runs)]
+        _, modules = run_child(workdir, trace=True)
+        warm, _ = run_child(workdir, warm_up=True)
+
+    import_seconds = statistics.median(runs)
+    print(f"import main: median {import_seconds:.3f}s over {args.runs} fresh interpreters "
+          f"(min {min(runs):.3f}s, max {max(runs):.3f}s)")
+    print("\nslowest imports made by main (-X importtime, which inflates them):")
+    for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<36} {micros / 1e6:>7.3f}s")
+    print(f"\nwarm-up before ready: {warm['warmup']:.3f}s")
+    for step, seconds in warm["steps"].items():
+        print(f"  {step:<36} {seconds:>7.3f}s")
+    print(f"cold start to ready: {import_seconds + warm['warmup']:.3f}s")
+
+    if args.history:
+        entry = {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "import_seconds": round(import_seconds, 4),
+            "warmup_seconds": round(warm["warmup"], 4),
+            "warmup_steps": {step: round(seconds, 4) for step, seconds in warm["steps"].items()},
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        print_history(args.history)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/corpus.py
+"""
+Synthetic resume corpus for benchmarks: PDFs written with a minimal
+pure-Python PDF writer and DOCX files written with python-docx.
+"""
+import os
+import random
+
+from docx import Document
+
+FIRST_NAMES = ["Alex", "Priya", "Wei", "Maria", "Tom", "Aisha", "Kenji", "Sara"]
+LAST_NAMES = ["Tan", "Sharma", "Lim", "Garcia", "Brown", "Rahman", "Sato", "Cohen"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech"]
+ROLES = ["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer", "QA Engineer"]
+SKILLS = ["Python", "Java", "SQL", "Docker", "Kubernetes", "AWS", "React", "Go", "Terraform", "Spark"]
+
+def resume_lines(rng: random.Random, jobs: int) -> list:
+    """
+    Plain-text resume with contact details, headed sections and dated entries
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | +65 9{rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "Professional Summary",
+        f"{rng.choice(ROLES)} with {jobs + 2} years of experience delivering reliable systems.",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 5)),
+        "Work Experience",
+    ]
+    year = 2024
+    for _ in range(jobs):
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} {year - 2} - {year}")
+        lines.extend(f"• Delivered improvement {rng.randint(1, 99)} across {rng.randint(2, 9)} teams" for _ in range(4))
+        year -= 2
+    lines += ["Education", "National University of Singapore", f"Bachelor of Computing, {year - 4} - {year}"]
+    return lines
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace").decode("latin-1")
+
+def make_pdf(pages: list) -> bytes:
+    """
+    Minimal PDF with one Helvetica text block per page; pages is a list of line lists
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    font_id = 3 + 2 * len(pages)
+    for i, lines in enumerate(pages):
+        content = "BT /F1 10 Tf 72 750 Td 13 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in lines) + " ET"
+        stream = content.encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+def write_pdf(path: str, lines: list, lines_per_page: int = 50) -> None:
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    with open(path, "wb") as f:
+        f.write(make_pdf(pages))
+
+def write_docx(path: str, lines: list) -> None:
+    doc = Document()
+    for line in lines:
+        if line.startswith("• "):
+            doc.add_paragraph(line[2:], style="List Bullet")
+        else:
+            doc.add_paragraph(line)
+    doc.save(path)
+
+def generate_corpus(directory: str, count: int, seed: int = 7) -> list:
+    """
+    Write count resumes, alternating PDF and DOCX with varying length, and return their paths
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        # Mostly one-page resumes, with some long multi-page ones
+        jobs = rng.choice([2, 3, 4, 5, 30])
+        lines = resume_lines(rng, jobs)
+        if i % 2 == 0:
+            path = os.path.join(directory, f"resume_{i:04d}.pdf")
+            write_pdf(path, lines)
+        else:
+            path = os.path.join(directory, f"resume_{i:04d}.docx")
+            write_docx(path, lines)
+        paths.append(path)
+    return paths
@@ -0,0 +1,118 @@
+# benchmarks/fake_gemini.py
+"""
+Local stand-in for the Gemini model client. Returns canned resume JSON after
+a configurable latency with jitter, and can inject errors, so the backend
+can be benchmarked without API quota.
+
+Install it with anonymizer.set_model_factory(FakeGeminiFactory(...)).
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+from google.api_core.exceptions import ResourceExhausted
+
+CANNED_RESUME = {
+    "Name": "Alex Tan",
+    "Summary": "Software engineer with experience delivering reliable systems.",
+    "Skills": ["Python", "SQL", "Docker", "Kubernetes", "AWS"],
+    "Experience": [
+        {
+            "job_title": "Software Engineer",
+            "company": "Acme Corp",
+            "dates": "2020 - 2024",
+            "description": ["Delivered improvement 12 across 4 teams", "Led the move to containers"],
+        },
+        {
+            "job_title": "Data Analyst",
+            "company": "Globex",
+            "dates": "2018 - 2020",
+            "description": "Built reporting pipelines\nAutomated weekly dashboards",
+        },
+    ],
+    "Education": [
+        {"degree": "Bachelor of Computing", "school": "National University of Singapore", "dates": "2014 - 2018", "description": ""},
+    ],
+    "Projects": [
+        {"title": "Resume Anonymizer", "description": ["FastAPI service"], "technologies": "Python, FastAPI", "dates": "2023"},
+    ],
+    "Achievements": ["Hackathon winner"],
+}
+
+_BATCH_RE = re.compile(r"Given these (\d+) resume texts")
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGeminiModel:
+    def __init__(self, factory: "FakeGeminiFactory"):
+        self.factory = factory
+
+    def _answer(self, contents) -> FakeResponse:
+        self.factory.record_call()
+        if self.factory.rng_uniform() < self.factory.error_rate:
+            raise ResourceExhausted("Resource has been exhausted (e.g. check quota).")
+        prompt = contents[-1] if isinstance(contents, (list, tuple)) else str(contents)
+        match = _BATCH_RE.search(prompt)
+        payload = [CANNED_RESUME] * int(match.group(1)) if match else CANNED_RESUME
+        return FakeResponse("```json\n" + json.dumps(payload) + "\n```")
+
+    def generate_content(self, contents, **kwargs):
+        time.sleep(self.factory.delay())
+        return self._answer(contents)
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        delay = self.factory.delay()
+        if not stream:
+            await asyncio.sleep(delay)
+            return self._answer(contents)
+        # Like the real API: the first chunk arrives early and the rest trickle in
+        await asyncio.sleep(delay * 0.2)
+        return FakeStreamResponse(self._answer(contents).text, delay * 0.8)
+
+class FakeStreamResponse:
+    CHUNK_CHARS = 120
+
+    def __init__(self, text: str, duration: float):
+        self.text = text
+        self.duration = duration
+
+    async def __aiter__(self):
+        chunks = [self.text[i:i + self.CHUNK_CHARS] for i in range(0, len(self.text), self.CHUNK_CHARS)]
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(self.duration / len(chunks))
+            yield FakeResponse(chunk)
+
+class FakeGeminiFactory:
+    """
+    Model factory producing FakeGeminiModel instances that share latency,
+    jitter and error settings, and count calls
+    """
+
+    def __init__(self, latency: float = 1.0, jitter: float = 0.2, error_rate: float = 0.0, seed: int = 7):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, model_name: str) -> FakeGeminiModel:
+        return FakeGeminiModel(self)
+
+    def rng_uniform(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
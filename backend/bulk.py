@@ -0,0 +1,358 @@
+# bulk.py
+"""
+Command-line bulk anonymizer for backfills.
+
+Walks a directory tree of PDF/DOCX resumes (or reads a manifest of paths),
+extracts and redacts text and renders the outputs in a process pool, while a
+bounded async stage parses through the same engine router as the API
+(PARSER_ENGINE), calling the model through the shared, paced model client.
+Writes a tree of anonymized files mirroring the input plus results.jsonl with
+one parsed record per resume. results.jsonl doubles as the checkpoint: a rerun
+skips every resume already recorded there.
+
+Run from the backend directory:
+    python bulk.py INPUT_DIR OUTPUT_DIR [--manifest paths.txt] [--workers 4] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+# Load .env before the project modules below read their settings at import
+load_dotenv()
+
+import pdf_extract
+import pipeline
+from anonymizer import MODEL_NAME, PROMPT_VERSION
+from cache import result_cache, make_key, RESULT_CACHE_ENABLED
+from docx_extract import extract_docx_text
+from formatter import format_resume_from_json
+from model_client import ModelUnavailableError, MODEL_CONCURRENCY
+from redactor import redact_text, find_leaks, scrub_leaks, summarize_redactions, REDACTION_ENABLED
+from renderers import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, get_renderer, render_resume
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+RESULTS_FILE = "results.jsonl"
+FAILURES_FILE = "failures.jsonl"
+REPORT_FILE = "report.json"
+# Attempts per resume when the model stays unavailable after the client's own retries
+MODEL_ATTEMPTS = 3
+PROGRESS_EVERY = 100
+STAGES = ("extract", "model", "format")
+
+def discover(input_dir: str, manifest: str = None) -> list:
+    """
+    Relative paths of the resumes to process: every PDF/DOCX under input_dir,
+    or the paths listed one per line in manifest (relative to input_dir)
+    """
+    if manifest is None:
+        found = []
+        for root, dirs, files in os.walk(input_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    found.append(os.path.relpath(os.path.join(root, name), input_dir))
+        return found
+
+    found = []
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            path = line.strip()
+            if not path or path.startswith("#"):
+                continue
+            relative = os.path.relpath(os.path.join(input_dir, path), input_dir)
+            if relative.startswith(os.pardir):
+                logger.warning(f"Skipping manifest entry outside {input_dir}: {path}")
+            elif os.path.splitext(relative)[1].lower() not in SUPPORTED_EXTENSIONS:
+                logger.warning(f"Skipping unsupported file in manifest: {path}")
+            else:
+                found.append(relative)
+    return list(dict.fromkeys(found))
+
+def output_names(sources: list, extension: str) -> dict:
+    """
+    Relative output path per source, mirroring the input tree. Where a PDF and
+    a DOCX share a name, the later one keeps its source extension in the name.
+    """
+    names, taken = {}, set()
+    for source in sources:
+        stem, source_extension = os.path.splitext(source)
+        name = f"{stem}_anonymized{extension}"
+        if name in taken:
+            name = f"{stem}_{source_extension.lstrip('.').lower()}_anonymized{extension}"
+        taken.add(name)
+        names[source] = name
+    return names
+
+def load_checkpoint(path: str) -> set:
+    """
+    Sources already recorded in results.jsonl. A line cut short by an
+    interrupted run is dropped, so appending continues on a clean line.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        data = f.read()
+    if data and not data.endswith(b"\n"):
+        data = data[:data.rfind(b"\n") + 1]
+        with open(path, "wb") as f:
+            f.write(data)
+    done = set()
+    for line in data.splitlines():
+        try:
+            done.add(json.loads(line)["source"])
+        except (ValueError, KeyError):
+            logger.warning("Ignoring unreadable line in checkpoint")
+    return done
+
+def _init_worker() -> None:
+    # The pool already runs one document per process; do not fan out again per PDF
+    pdf_extract.PDF_PROCESS_WORKERS = 1
+
+def _warm_up() -> None:
+    # pdfplumber is imported on first use; load it here rather than on a worker's first document
+    pdf_extract.warm_up()
+
+def extract_and_redact(path: str) -> tuple:
+    """
+    Extract a resume's text and strip contact details. Runs in the process pool.
+    """
+    if path.lower().endswith(".pdf"):
+        text = pdf_extract.extract_pdf_text(path)
+    else:
+        text = extract_docx_text(path)
+    if not REDACTION_ENABLED:
+        return text, {}
+    return redact_text(text)
+
+def render_to_file(parsed_data: dict, path: str, output_format: str) -> None:
+    """
+    Render parsed resume data to path, replacing it atomically. Runs in the process pool.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    if output_format == "docx":
+        format_resume_from_json(parsed_data, temp_path)
+    else:
+        with open(temp_path, "wb") as f:
+            f.write(render_resume(parsed_data, output_format))
+    os.replace(temp_path, path)
+
+class StageStats:
+    """
+    Durations of one pipeline stage, for the throughput report
+    """
+    __slots__ = ("durations", "failures", "first_start", "last_end")
+
+    def __init__(self):
+        self.durations = []
+        self.failures = 0
+        self.first_start = None
+        self.last_end = None
+
+    def add(self, start: float) -> None:
+        end = time.perf_counter()
+        self.durations.append(end - start)
+        if self.first_start is None or start < self.first_start:
+            self.first_start = start
+        self.last_end = end
+
+    def report(self, wall_seconds: float) -> dict:
+        durations = sorted(self.durations)
+        count = len(durations)
+        active = self.last_end - self.first_start if count else 0
+        return {
+            "files": count,
+            "failures": self.failures,
+            "meanSeconds": round(sum(durations) / count, 4) if count else 0,
+            "p95Seconds": round(durations[min(count - 1, int(count * 0.95))], 4) if count else 0,
+            # Average number of resumes in this stage at once; compare with its limit to find the bottleneck
+            "avgInFlight": round(sum(durations) / wall_seconds, 2) if wall_seconds else 0,
+            # Over the span from the first resume entering the stage to the last leaving it
+            "filesPerSecond": round(count / active, 2) if active else 0,
+        }
+
+class BulkRun:
+    """
+    One pass over the pending resumes. A fixed set of worker coroutines pulls
+    from a bounded queue, so the number of resumes held in memory stays flat
+    however large the backlog is.
+    """
+
+    def __init__(self, input_dir: str, output_dir: str, pool: ProcessPoolExecutor, workers: int,
+                 concurrency: int, output_format: str, bypass_cache: bool):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.pool = pool
+        self.workers = workers
+        self.output_format = output_format
+        self.use_cache = RESULT_CACHE_ENABLED and not bypass_cache
+        self.model_slots = asyncio.Semaphore(concurrency)
+        self.in_flight = concurrency + 2 * workers
+        self.stats = {stage: StageStats() for stage in STAGES}
+        self.succeeded = 0
+        self.failed = 0
+        self.cache_hits = 0
+
+    async def run(self, sources: list, names: dict) -> None:
+        queue = asyncio.Queue(maxsize=self.in_flight)
+        total = len(sources)
+        self.started = time.perf_counter()
+        with open(os.path.join(self.output_dir, RESULTS_FILE), "a", encoding="utf-8") as results, \
+                open(os.path.join(self.output_dir, FAILURES_FILE), "w", encoding="utf-8") as failures:
+
+            async def worker():
+                while (source := await queue.get()) is not None:
+                    record = await self.process(source, names[source])
+                    (failures if "error" in record else results).write(json.dumps(record) + "\n")
+                    if "error" in record:
+                        failures.flush()
+                    else:
+                        results.flush()
+                    done = self.succeeded + self.failed
+                    if done % PROGRESS_EVERY == 0 or done == total:
+                        rate = done / (time.perf_counter() - self.started)
+                        logger.info(f"{done}/{total} resumes ({self.failed} failed, {rate:.2f}/s)")
+
+            tasks = [asyncio.create_task(worker()) for _ in range(self.in_flight)]
+            for source in sources:
+                await queue.put(source)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        self.wall_seconds = time.perf_counter() - self.started
+
+    async def process(self, source: str, output_name: str) -> dict:
+        loop = asyncio.get_running_loop()
+        stage = "extract"
+        try:
+            start = time.perf_counter()
+            text, redaction_map = await loop.run_in_executor(self.pool, extract_and_redact, os.path.join(self.input_dir, source))
+            self.stats[stage].add(start)
+            if not text.strip():
+                raise ValueError("Could not extract any text")
+
+            stage = "model"
+            start = time.perf_counter()
+            async with self.model_slots:
+                parsed_data, cached = await self.parse(text)
+            self.stats[stage].add(start)
+            if leaks := find_leaks(parsed_data, redaction_map):
+                logger.warning(f"Model output for {source} contained {len(leaks)} redacted value(s); scrubbing them")
+                parsed_data = scrub_leaks(parsed_data, leaks)
+
+            stage = "format"
+            start = time.perf_counter()
+            await loop.run_in_executor(self.pool, render_to_file, parsed_data, os.path.join(self.output_dir, output_name), self.output_format)
+            self.stats[stage].add(start)
+        except Exception as e:
+            self.stats[stage].failures += 1
+            self.failed += 1
+            logger.error(f"Failed to process {source} at {stage}: {str(e)}")
+            return {"source": source, "stage": stage, "error": str(e)}
+
+        self.succeeded += 1
+        self.cache_hits += cached
+        return {
+            "source": source,
+            "output": output_name,
+            "cached": cached,
+            "redactions": summarize_redactions(redaction_map),
+            "parsed": parsed_data,
+        }
+
+    async def parse(self, text: str) -> tuple:
+        """
+        Parse redacted text through the same engine router, result cache and
+        in-flight deduplication as the API. Returns (parsed_data, cached),
+        cached telling whether the cache already held a model parse of the text.
+        """
+        cached = (self.use_cache and pipeline.PARSER_ENGINE != "local"
+                  and await asyncio.to_thread(result_cache.contains, make_key(text, PROMPT_VERSION, MODEL_NAME)))
+
+        for attempt in range(1, MODEL_ATTEMPTS + 1):
+            try:
+                parsed_data = await pipeline.parse_resume(text, bypass_cache=not self.use_cache)
+                break
+            except ModelUnavailableError as e:
+                # Quota or breaker: wait it out rather than failing the rest of the backlog
+                if attempt == MODEL_ATTEMPTS:
+                    raise
+                delay = e.retry_after or 2 ** attempt
+                logger.warning(f"Model unavailable, retrying in {delay:.1f} seconds: {str(e)}")
+                await asyncio.sleep(delay)
+        return parsed_data, cached
+
+    def report(self, skipped: int) -> dict:
+        return {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": skipped,
+            "cacheHits": self.cache_hits,
+            "wallSeconds": round(self.wall_seconds, 3),
+            "filesPerSecond": round((self.succeeded + self.failed) / self.wall_seconds, 2) if self.wall_seconds else 0,
+            "stages": {stage: stats.report(self.wall_seconds) for stage, stats in self.stats.items()},
+        }
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['succeeded']} anonymized, {report['failed']} failed, {report['skipped']} skipped (already done), "
+          f"{report['cacheHits']} from cache")
+    print(f"{report['wallSeconds']:.1f} s wall, {report['filesPerSecond']:.2f} resumes/s\n")
+    print(f"{'stage':<8} {'files':>7} {'failed':>7} {'mean s':>8} {'p95 s':>8} {'in flight':>10} {'files/s':>8}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<8} {row['files']:>7} {row['failures']:>7} {row['meanSeconds']:>8.3f} {row['p95Seconds']:>8.3f} "
+              f"{row['avgInFlight']:>10.2f} {row['filesPerSecond']:>8.2f}")
+
+async def run_bulk(args) -> dict:
+    extension = get_renderer(args.format).extension
+    sources = discover(args.input_dir, args.manifest)
+    os.makedirs(args.output_dir, exist_ok=True)
+    done = load_checkpoint(os.path.join(args.output_dir, RESULTS_FILE))
+    names = output_names(sources, extension)
+    pending = [source for source in sources if source not in done]
+    if args.limit:
+        pending = pending[:args.limit]
+    logger.info(f"Found {len(sources)} resumes, {len(sources) - len(pending)} already done, processing {len(pending)}")
+
+    # spawn, since the parent runs an event loop and threads that must not be forked
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker) as pool:
+        # Start the workers before the clock runs, so imports do not count as extraction time
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm_up) for _ in range(args.workers)))
+        logger.info(f"Worker pool ready in {time.perf_counter() - start:.1f} seconds")
+        run = BulkRun(args.input_dir, args.output_dir, pool, args.workers, args.concurrency, args.format, args.bypass_cache)
+        await run.run(pending, names)
+
+    report = run.report(len(sources) - len(pending))
+    with open(os.path.join(args.output_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(description="Anonymize a directory tree of resumes in bulk")
+    parser.add_argument("input_dir", help="Directory of PDF/DOCX resumes, searched recursively")
+    parser.add_argument("output_dir", help=f"Directory for the anonymized tree, {RESULTS_FILE}, {FAILURES_FILE} and {REPORT_FILE}")
+    parser.add_argument("--manifest", help="File listing resume paths relative to input_dir, one per line, instead of walking it")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for extraction and formatting")
+    parser.add_argument("--concurrency", type=int, default=MODEL_CONCURRENCY, help="Model calls in flight")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT, help="Output format")
+    parser.add_argument("--bypass-cache", action="store_true", help="Always call the model, ignoring cached parses")
+    parser.add_argument("--limit", type=int, help="Process at most this many pending resumes")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_bulk(args))
+    print_report(report)
+    return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    main()
@@ -0,0 +1,116 @@
+# bundle.py
+import csv
+import io
+import json
+import os
+import zipfile
+
+BUNDLE_CHUNK_SIZE = 64 * 1024
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+MANIFEST_COLUMNS = ["originalName", "file", "error", "Name", "Summary", "Skills", "Experience", "Education", "Projects", "Achievements"]
+
+class _ChunkSink:
+    """
+    Write-only, unseekable file object collecting what zipfile writes until
+    it is drained; without tell() zipfile streams entries with data descriptors
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self):
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
+
+def archive_name(original_name: str, output_name: str, taken: set) -> str:
+    """
+    Readable, unique name inside the archive: the uploaded file's name with
+    an _anonymized suffix, numbered on collisions
+    """
+    stem = os.path.splitext(os.path.basename(original_name))[0] if original_name else os.path.splitext(output_name)[0]
+    extension = os.path.splitext(output_name)[1]
+    candidate = f"{stem}_anonymized{extension}" if original_name else output_name
+    counter = 2
+    while candidate in taken:
+        candidate = f"{stem}_anonymized ({counter}){extension}"
+        counter += 1
+    taken.add(candidate)
+    return candidate
+
+def _join(items, describe) -> str:
+    if isinstance(items, str):
+        return items
+    return "; ".join(describe(item) for item in items or [] if item)
+
+def _describe_entry(*fields):
+    def describe(item):
+        if not isinstance(item, dict):
+            return str(item)
+        head, *rest = [str(item.get(field) or "").strip() for field in fields]
+        extra = ", ".join(value for value in rest if value)
+        return f"{head} ({extra})" if extra else head
+    return describe
+
+def manifest_row(item: dict) -> dict:
+    """
+    Flatten a manifest item's parsed fields into one CSV row
+    """
+    parsed = item.get("parsed") or {}
+    return {
+        "originalName": item.get("originalName") or "",
+        "file": item.get("file") or "",
+        "error": item.get("error") or "",
+        "Name": parsed.get("Name", ""),
+        "Summary": parsed.get("Summary", ""),
+        "Skills": _join(parsed.get("Skills"), str),
+        "Experience": _join(parsed.get("Experience"), _describe_entry("job_title", "company", "dates")),
+        "Education": _join(parsed.get("Education"), _describe_entry("degree", "school", "dates")),
+        "Projects": _join(parsed.get("Projects"), _describe_entry("title", "dates")),
+        "Achievements": _join(parsed.get("Achievements"), str),
+    }
+
+def build_manifest(items: list, manifest_format: str) -> tuple:
+    """
+    Return (archive name, bytes) of the manifest in "json" or "csv" format
+    """
+    if manifest_format == "json":
+        return "manifest.json", json.dumps(items, indent=2).encode("utf-8")
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=MANIFEST_COLUMNS)
+    writer.writeheader()
+    for item in items:
+        writer.writerow(manifest_row(item))
+    return "manifest.csv", buffer.getvalue().encode("utf-8-sig")
+
+def stream_bundle(members: list, manifest: tuple = None):
+    """
+    Yield a ZIP archive of members, a list of (archive name, file path), in
+    chunks as it is written, plus an optional (name, bytes) manifest. Files
+    are copied BUNDLE_CHUNK_SIZE at a time and stored uncompressed, since
+    DOCX is already deflated, so memory stays flat however many files there are.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as archive:
+        for name, path in members:
+            info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_STORED
+            with open(path, "rb") as source, archive.open(info, "w") as target:
+                while chunk := source.read(BUNDLE_CHUNK_SIZE):
+                    target.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+        if manifest is not None:
+            info = zipfile.ZipInfo(manifest[0], date_time=_ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, manifest[1])
+    yield from sink.drain()
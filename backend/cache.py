@@ -0,0 +1,117 @@
+# cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from metrics import cache_lookups
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "result_cache.db")
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize extracted text so cosmetic differences (line endings, runs of
+    whitespace, trailing blanks) do not produce different cache keys
+    """
+    return " ".join(text.split())
+
+def make_key(text: str, prompt_version: str, model_name: str) -> str:
+    """
+    Content address for a parse: the normalized text plus everything that can
+    change the model output for that text
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{prompt_version}\0{model_name}\0".encode("utf-8"))
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+class ResultCache:
+    """
+    Persistent SQLite cache of parsed resumes with TTL and LRU size eviction
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_accessed ON results (last_accessed)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                cache_lookups.inc(result="miss")
+                return None
+            self._conn.execute("UPDATE results SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            cache_lookups.inc(result="hit")
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether a fresh entry exists for key, without counting a lookup or refreshing it
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT created_at FROM results WHERE key = ?", (key,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        # Drop expired entries first, then the least recently used ones over the size cap
+        expired = self._conn.execute(
+            "DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        overflow = max(0, count - self.max_entries)
+        if overflow:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+        self.evictions += expired + overflow
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {
+            "enabled": RESULT_CACHE_ENABLED,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+result_cache = ResultCache(RESULT_CACHE_PATH, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,141 @@
+# docx_extract.py
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P = _W + "p"
+_T = _W + "t"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+# Run content standing for characters, as python-docx renders them in paragraph.text
+_CHARACTERS = {_W + "tab": "\t", _W + "ptab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+# Alternate content repeats text boxes in a legacy form for older readers; only the first choice is read
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_DOCUMENT_PART = "word/document.xml"
+_DOCUMENT_RELS = "word/_rels/document.xml.rels"
+_DIGITS_RE = re.compile(r"(\d+)")
+
+def _part_lines(stream):
+    """
+    Yield the text lines of a WordprocessingML part in reading order, parsing
+    it incrementally and dropping each paragraph and table once read, so
+    memory stays flat however long the document is. Paragraphs in text boxes
+    and nested tables come out as their own lines. A table row whose cells
+    hold at most one paragraph each is one tab-separated line; other rows
+    give each cell's paragraphs in turn.
+    """
+    paragraphs = []  # text pieces of each open paragraph, innermost last
+    rows = []  # cells of each open table row, each a list of lines
+    open_elements = []
+    fallback_depth = 0
+
+    def emit(line):
+        if rows and rows[-1]:
+            rows[-1][-1].append(line)
+            return None
+        return line
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            open_elements.append(elem)
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif tag == _P:
+                paragraphs.append([])
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _TC and rows:
+                rows[-1].append([])
+            continue
+
+        open_elements.pop()
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+            continue
+        if fallback_depth:
+            continue
+        if tag == _T:
+            if paragraphs:
+                paragraphs[-1].append(elem.text or "")
+        elif tag in _CHARACTERS:
+            if paragraphs:
+                paragraphs[-1].append(_CHARACTERS[tag])
+        elif tag == _P:
+            line = emit("".join(paragraphs.pop()))
+            if line is not None:
+                yield line
+        elif tag == _TR:
+            cells = rows.pop()
+            if all(len(cell) <= 1 for cell in cells):
+                lines = ["\t".join(cell[0] for cell in cells if cell and cell[0].strip())]
+            else:
+                lines = [line for cell in cells for line in cell]
+            for line in lines:
+                line = emit(line)
+                if line is not None:
+                    yield line
+
+        if tag in (_P, _TBL):
+            elem.clear()
+            # Children of the body (or header/footer root) are removed outright
+            if len(open_elements) <= 2 and open_elements:
+                open_elements[-1].remove(elem)
+
+def _natural_key(name: str) -> list:
+    return [int(part) if part.isdigit() else part for part in _DIGITS_RE.split(name)]
+
+def _header_footer_parts(archive: zipfile.ZipFile) -> tuple:
+    """
+    Header and footer part names referenced by the main document, in numeric order
+    """
+    try:
+        rels = ET.fromstring(archive.read(_DOCUMENT_RELS))
+    except KeyError:
+        return [], []
+    parts = {"header": [], "footer": []}
+    for rel in rels.iter(_RELS_NS + "Relationship"):
+        kind = rel.get("Type", "").rsplit("/", 1)[-1]
+        if kind in parts and rel.get("TargetMode") != "External":
+            target = rel.get("Target", "")
+            name = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("word", target))
+            if name in archive.NameToInfo:
+                parts[kind].append(name)
+    return sorted(set(parts["header"]), key=_natural_key), sorted(set(parts["footer"]), key=_natural_key)
+
+def _running_text(archive: zipfile.ZipFile, names: list) -> list:
+    """
+    Non-empty lines of header or footer parts, each distinct part once
+    (first-page, even and default headers often repeat each other)
+    """
+    lines, seen = [], set()
+    for name in names:
+        with archive.open(name) as stream:
+            part = tuple(line for line in _part_lines(stream) if line.strip())
+        if part and part not in seen:
+            seen.add(part)
+            lines.extend(part)
+    return lines
+
+def extract_docx_text(source) -> str:
+    """
+    Extract text from a DOCX path or seekable binary file object without
+    loading the document model: headers, then the body including tables and
+    text boxes, then footers, one line per paragraph.
+    """
+    try:
+        with zipfile.ZipFile(source) as archive:
+            headers, footers = _header_footer_parts(archive)
+            with archive.open(_DOCUMENT_PART) as stream:
+                body = list(_part_lines(stream))
+            lines = _running_text(archive, headers) + body + _running_text(archive, footers)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise ValueError(f"Not a readable DOCX file: {e}")
+    return "\n".join(lines)
@@ -1,236 +1,206 @@
 # formatter.py
+import copy
+import io
+import threading
+import zipfile
 from docx import Document
-from docx.shared import Pt, RGBColor, Inches, Cm
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.enum.table import WD_ALIGN_VERTICAL
+from lxml import etree
+from layout import Layout, build_layout
 import os
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+LOGO_PATH = os.path.join(TEMPLATE_DIR, "company_logo.png")
 
-def format_resume_from_json(data: dict, output_path: str, template_filename: str = "company_template.docx"):
-    # Create a new document
-    doc = Document()
-    
-    # Set up page margins for a clean look
-    sections = doc.sections
-    for section in sections:
-        section.left_margin = Pt(72)    # 1 inch
-        section.right_margin = Pt(72)   # 1 inch
-        section.top_margin = Pt(72)     # 1 inch
-        section.bottom_margin = Pt(72)  # 1 inch
-
-    # Create a table for the header (1 row, 2 columns)
-    header_table = doc.add_table(rows=1, cols=2)
-    header_table.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    header_table.allow_autofit = True
-    
-    from docx.enum.table import WD_ALIGN_VERTICAL
-    
-    # Left cell for name
-    name_cell = header_table.cell(0, 0)
-    name_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    name_paragraph = name_cell.paragraphs[0]
-    name_run = name_paragraph.add_run(data.get("Name", ""))
-    name_run.bold = True
-    name_run.font.size = Pt(20)
-    name_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-    
-    # Right cell for logo
-    logo_cell = header_table.cell(0, 1)
-    logo_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    logo_paragraph = logo_cell.paragraphs[0]
-    logo_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-    
-    # Add the logo
-    logo_path = os.path.join(TEMPLATE_DIR, "company_logo.png")
-    if os.path.exists(logo_path):
-        logo_run = logo_paragraph.add_run()
-        logo_run.add_picture(logo_path, width=Inches(1.0))  # Adjust size as needed
-    
-    # Add spacing after header
-    doc.add_paragraph()
-    doc.add_paragraph()
-    
-    # Add extra spacing after name
-    if summary := data.get("Summary"):
-        heading = doc.add_paragraph()
-        heading_run = heading.add_run("Professional Summary")
-        heading_run.bold = True
-        heading_run.font.size = Pt(16)
-        heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
-        heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        doc.add_paragraph(summary)
-        doc.add_paragraph()  # Add spacing
+_W_T = qn("w:t")
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_NAME_MARKER = "{{Name}}"
+_DOCUMENT_PART = "word/document.xml"
+# Fixed zip entry timestamps, so identical resumes render to identical bytes
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+def _zip_entry(filename: str) -> zipfile.ZipInfo:
+    entry = zipfile.ZipInfo(filename, date_time=_ZIP_DATE_TIME)
+    entry.compress_type = zipfile.ZIP_DEFLATED
+    return entry
+
+def format_resume_from_json(data: dict, output_path: str):
+    """
+    Render parsed resume data to an anonymized DOCX at output_path
+    """
+    get_template_engine().render(data, output_path)
+
+def format_resume_to_bytes(data: dict) -> bytes:
+    """
+    Render parsed resume data to anonymized DOCX bytes
+    """
+    return get_template_engine().render_bytes(data)
+
+class TemplateEngine:
+    """
+    Precompiled DOCX renderer.
+
+    The fixed parts of every output (package parts, styles, margins, header
+    table and embedded logo) are built once. Each render deep-copies the
+    prebuilt document element, clones paragraph fragments for the content,
+    and appends the new word/document.xml to a copy of the prebuilt package,
+    so the cost scales with the resume, not with document setup.
+    """
+
+    def __init__(self):
+        doc = Document()
+
+        # Set up page margins for a clean look
+        for section in doc.sections:
+            section.left_margin = Pt(72)    # 1 inch
+            section.right_margin = Pt(72)   # 1 inch
+            section.top_margin = Pt(72)     # 1 inch
+            section.bottom_margin = Pt(72)  # 1 inch
+
+        # Header table: name on the left, logo on the right
+        header_table = doc.add_table(rows=1, cols=2)
+        header_table.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        header_table.allow_autofit = True
+
+        name_cell = header_table.cell(0, 0)
+        name_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        name_paragraph = name_cell.paragraphs[0]
+        name_run = name_paragraph.add_run(_NAME_MARKER)
+        name_run.bold = True
+        name_run.font.size = Pt(20)
+        name_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+
+        logo_cell = header_table.cell(0, 1)
+        logo_cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        logo_paragraph = logo_cell.paragraphs[0]
+        logo_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
+        if os.path.exists(LOGO_PATH):
+            logo_paragraph.add_run().add_picture(LOGO_PATH, width=Inches(1.0))
+
+        # Add spacing after header
+        doc.add_paragraph()
+        doc.add_paragraph()
+
+        # Paragraph fragments, built with the same calls as the reference builder
+        # in benchmarks/reference_formatter.py; each "x" is a text slot filled in
+        # order at render time
+        fragments = {}
 
-    if skills := data.get("Skills"):
-        heading = doc.add_paragraph()
-        heading_run = heading.add_run("Technical Skills")
-        heading_run.bold = True
-        heading_run.font.size = Pt(16)
-        heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
-        heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        skills_para = doc.add_paragraph()
-        skills_para.add_run(", ".join(skills))
-        doc.add_paragraph()  # Add spacing
-
-    if exp_list := data.get("Experience"):
-        # Professional History section
-        heading = doc.add_paragraph()
-        heading_run = heading.add_run("Professional History")
-        heading_run.bold = True
-        heading_run.font.size = Pt(16)
-        heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
-        heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        for exp in exp_list:
-            # Company and title
-            p = doc.add_paragraph()
-            title_run = p.add_run(f"{exp['company']}")
-            title_run.bold = True
-            title_run.font.size = Pt(12)
-            
-            # Role and dates on next line
-            p = doc.add_paragraph()
-            role_run = p.add_run(f"{exp['job_title']}")
-            role_run.italic = True
-            p.add_run(f" ({exp['dates']})")
-            
-            # Description with bullet points
-            description = exp.get('description', '')
-            if isinstance(description, list):
-                desc_lines = description
-            elif isinstance(description, str):
-                desc_lines = description.split('\n')
-            else:
-                desc_lines = []
-                
-            for line in desc_lines:
-                if isinstance(line, str) and line.strip():
-                    bullet_p = doc.add_paragraph(style='List Bullet')
-                    bullet_p.add_run(line.strip())
-            
-            doc.add_paragraph()  # Add spacing
-
-    if edu_list := data.get("Education"):
-        heading = doc.add_paragraph()
-        heading_run = heading.add_run("Education")
-        heading_run.bold = True
-        heading_run.font.size = Pt(16)
-        heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
-        heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        for edu in edu_list:
-            # School name
-            p = doc.add_paragraph()
-            school_run = p.add_run(f"{edu['school']}")
-            school_run.bold = True
-            school_run.font.size = Pt(12)
-            
-            # Degree and dates
-            p = doc.add_paragraph()
-            degree_run = p.add_run(f"{edu['degree']}")
-            degree_run.italic = True
-            p.add_run(f" ({edu['dates']})")
-            
-            if edu.get('description'):
-                desc_p = doc.add_paragraph()
-                desc_p.add_run(edu['description'])
-            
-            doc.add_paragraph()  # Add spacing
-
-    if projects := data.get("Projects"):
-        heading = doc.add_paragraph()
-        heading_run = heading.add_run("Projects")
-        heading_run.bold = True
-        heading_run.font.size = Pt(16)
-        heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
-        heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        for project in projects:
-            # Project title
-            p = doc.add_paragraph()
-            project_run = p.add_run(project['title'])
-            project_run.bold = True
-            project_run.font.size = Pt(12)
-            if project.get('dates'):
-                p.add_run(f" ({project['dates']})")
-            
-            # Technologies
-            if tech := project.get('technologies'):
-                tech_p = doc.add_paragraph()
-                tech_p.add_run("Technologies: ").bold = True
-                
-                # Handle both string and list formats, and clean up the technology string
-                if isinstance(tech, str):
-                    # Remove extra spaces and split by commas
-                    cleaned_tech = "".join(tech.split())  # Remove all whitespace
-                    tech_list = [t.strip() for t in cleaned_tech.split(',') if t.strip()]
-                else:
-                    tech_list = tech
-                
-                tech_p.add_run(", ".join(tech_list))
-            
-            # Description with bullet points
-            if desc := project.get('description'):
-                # Handle both string and list formats
-                if isinstance(desc, list):
-                    desc_lines = desc
-                elif isinstance(desc, str):
-                    desc_lines = desc.split('\n')
-                else:
-                    desc_lines = []
-                
-                for line in desc_lines:
-                    if isinstance(line, str) and line.strip():
-                        # Keep existing bullet points, add bullets if not present
-                        line = line.strip()
-                        if not line.startswith('•'):
-                            bullet_p = doc.add_paragraph(style='List Bullet')
-                        else:
-                            bullet_p = doc.add_paragraph()
-                        bullet_p.add_run(line)
-            
-            doc.add_paragraph()  # Add spacing
-
-    if achievements := data.get("Achievements"):
         heading = doc.add_paragraph()
-        heading_run = heading.add_run("Achievements")
+        heading_run = heading.add_run("x")
         heading_run.bold = True
         heading_run.font.size = Pt(16)
         heading_run.font.color.rgb = RGBColor(0, 0, 0)
-        
-        # Add double line under the heading
         heading.paragraph_format.space_after = Pt(0)
-        border_paragraph = doc.add_paragraph("_" * 80)
-        border_paragraph.paragraph_format.space_after = Pt(12)
-        
-        # Create a bullet list for achievements
-        for achievement in achievements:
-            p = doc.add_paragraph(style='List Bullet')
-            p.add_run(achievement)
-        doc.add_paragraph()  # Add spacing
-
-    # Save the document
-    doc.save(output_path)
+        fragments["heading"] = heading
+
+        border = doc.add_paragraph("_" * 80)
+        border.paragraph_format.space_after = Pt(12)
+        fragments["border"] = border
+
+        fragments["text"] = doc.add_paragraph("x")
+        fragments["blank"] = doc.add_paragraph()
+
+        entry_title = doc.add_paragraph()
+        entry_run = entry_title.add_run("x")
+        entry_run.bold = True
+        entry_run.font.size = Pt(12)
+        fragments["entry_title"] = entry_title
+
+        entry_title_dates = doc.add_paragraph()
+        entry_run = entry_title_dates.add_run("x")
+        entry_run.bold = True
+        entry_run.font.size = Pt(12)
+        entry_title_dates.add_run("x")
+        fragments["entry_title_dates"] = entry_title_dates
+
+        role = doc.add_paragraph()
+        role.add_run("x").italic = True
+        role.add_run("x")
+        fragments["role"] = role
+
+        bullet = doc.add_paragraph(style='List Bullet')
+        bullet.add_run("x")
+        fragments["bullet"] = bullet
+
+        labeled = doc.add_paragraph()
+        labeled.add_run("x").bold = True
+        labeled.add_run("x")
+        fragments["labeled"] = labeled
+
+        # Detach the fragments so the document holds only the fixed skeleton
+        body = doc.element.body
+        self._fragments = {}
+        for kind, paragraph in fragments.items():
+            body.remove(paragraph._p)
+            self._fragments[kind] = paragraph._p
+        self._document = doc.element
+
+        # Every package part except word/document.xml never changes between renders
+        saved = io.BytesIO()
+        doc.save(saved)
+        prefix = io.BytesIO()
+        with zipfile.ZipFile(saved) as source, zipfile.ZipFile(prefix, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                if item.filename != _DOCUMENT_PART:
+                    target.writestr(_zip_entry(item.filename), source.read(item.filename))
+        self._package_prefix = prefix.getvalue()
+
+    def _build_document(self, layout: Layout):
+        root = copy.deepcopy(self._document)
+        body = root.body
+        sect_pr = body[-1]
+
+        name_t = next(t for t in body[0].iter(_W_T) if t.text == _NAME_MARKER)
+        name_t.text = layout.name
+
+        for kind, texts in layout.blocks:
+            paragraph = copy.deepcopy(self._fragments[kind])
+            for t, text in zip(paragraph.iter(_W_T), texts):
+                t.text = text
+                t.set(_XML_SPACE, "preserve")
+            sect_pr.addprevious(paragraph)
+
+        return root
+
+    def render_bytes(self, data: dict) -> bytes:
+        """
+        Render parsed resume data to DOCX bytes
+        """
+        return self.render_layout(build_layout(data))
+
+    def render_layout(self, layout: Layout) -> bytes:
+        """
+        Render a prepared layout to DOCX bytes
+        """
+        document_xml = etree.tostring(self._build_document(layout), xml_declaration=True, encoding="UTF-8", standalone=True)
+        package = io.BytesIO(self._package_prefix)
+        package.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(package, "a", zipfile.ZIP_DEFLATED) as target:
+            target.writestr(_zip_entry(_DOCUMENT_PART), document_xml)
+        return package.getvalue()
+
+    def render(self, data: dict, output_path: str) -> None:
+        """
+        Render parsed resume data to a DOCX file at output_path
+        """
+        content = self.render_bytes(data)
+        with open(output_path, "wb") as f:
+            f.write(content)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_template_engine() -> TemplateEngine:
+    """
+    Return the shared template engine, building it on first use
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TemplateEngine()
+    return _engine
@@ -0,0 +1,248 @@
+# heuristic_parser.py
+import re
+
+# Heading synonyms per output section, matched against whole lines
+SECTION_HEADINGS = {
+    "Summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    "Skills": ["skills", "technical skills", "core skills", "key skills", "core competencies",
+               "competencies", "technologies", "tools and technologies", "skills and tools"],
+    "Experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "professional history", "career history",
+                   "relevant experience", "internships", "internship experience"],
+    "Education": ["education", "academic background", "academic qualifications", "qualifications",
+                  "education and training", "educational background"],
+    "Projects": ["projects", "personal projects", "academic projects", "selected projects", "key projects"],
+    "Achievements": ["achievements", "awards", "honors", "honours", "awards and achievements",
+                     "certifications", "certifications and awards", "accomplishments"],
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# Headings of sections with no place in the output; their lines are dropped,
+# since they often hold personal details the model would have removed
+SKIPPED_HEADINGS = [
+    "personal details", "personal information", "personal particulars", "personal data", "personal info",
+    "contact", "contacts", "contact details", "contact information", "contact info",
+    "references", "referees", "references available upon request",
+    "hobbies", "interests", "hobbies and interests", "activities", "extracurricular activities",
+    "additional information", "other information", "declaration",
+]
+_SKIPPED = ""
+_HEADING_LOOKUP.update({heading: _SKIPPED for heading in SKIPPED_HEADINGS})
+# Uppercase lines without digits, or a few capitalised words and a colon, look like
+# headings ("NATIONAL SERVICE", "Military Service:")
+HEADING_SHAPE_RE = re.compile(r"^[A-Z][A-Z&/' ]{2,40}:?$|^[A-Z][a-z]+(?: [A-Za-z][a-z]*){0,3}:$")
+
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:\d{{1,2}}/)?(?:19|20)\d{{2}}"
+DATE_RANGE_RE = re.compile(
+    rf"{_DATE}(?:\s*(?:-|–|—|to)\s*(?:{_DATE}|Present|Current|Now|Ongoing|Today))?",
+    re.IGNORECASE,
+)
+BULLET_RE = re.compile(r"^\s*(?:[•▪◦●\-*–·]|\d+[.)])\s+")
+DEGREE_RE = re.compile(
+    r"\b(?:Bachelor|Master|Doctor|Ph\.?D|B\.?Sc|M\.?Sc|B\.?Eng|M\.?Eng|B\.?A|M\.?A|MBA|B\.?Tech|M\.?Tech|"
+    r"Diploma|Degree|Certificate|GCE|A[- ]Levels?|O[- ]Levels?|Associate)\b",
+    re.IGNORECASE,
+)
+SCHOOL_RE = re.compile(r"\b(?:University|College|Institute|School|Polytechnic|Academy|Universit[äé]t)\b", re.IGNORECASE)
+NAME_RE = re.compile(r"^[A-Z][A-Za-z'’.-]+(?:\s+[A-Z][A-Za-z'’.-]+){1,3}$")
+_TITLE_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+")
+_SKILL_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*")
+
+def _heading_for(line: str):
+    """
+    The output section a heading line starts, _SKIPPED for a known section
+    with no place in the output, or None when the line is not a known heading
+    """
+    key = line.strip().strip(":").strip().lower()
+    if len(key) > 40:
+        return None
+    return _HEADING_LOOKUP.get(key)
+
+def _strip_bullet(line: str) -> str:
+    return BULLET_RE.sub("", line).strip()
+
+def _split_sections(lines: list) -> tuple:
+    """
+    Group lines under detected headings. Returns (preamble_lines,
+    {section: lines}, uncertain). Lines under skipped headings are dropped,
+    so they cannot reach the output. uncertain is set when a section holds
+    a heading-shaped line that is not a known heading: it may start a
+    section of personal details, or just be an uppercase company name.
+    """
+    preamble, sections, current, uncertain = [], {}, None, False
+    for line in lines:
+        section = _heading_for(line)
+        if section is None and current not in (None, _SKIPPED) and HEADING_SHAPE_RE.match(line) and len(line.split()) <= 4:
+            uncertain = True
+        if section is not None:
+            current = section
+            if section != _SKIPPED:
+                sections.setdefault(section, [])
+        elif current is None:
+            preamble.append(line)
+        elif current != _SKIPPED:
+            sections[current].append(line)
+    return preamble, sections, uncertain
+
+def _split_entries(lines: list) -> list:
+    """
+    Split a section into entries of {header, dates, body}. A non-bullet line
+    starts a new entry when it carries a date range, or is directly followed
+    by one, and the current entry already has its dates or description.
+    """
+    entries, current = [], None
+    for i, line in enumerate(lines):
+        is_bullet = bool(BULLET_RE.match(line))
+        date_match = None if is_bullet else DATE_RANGE_RE.search(line)
+        next_has_date = (
+            i + 1 < len(lines)
+            and not BULLET_RE.match(lines[i + 1])
+            and bool(DATE_RANGE_RE.search(lines[i + 1]))
+        )
+
+        if current is None or (
+            not is_bullet
+            and (date_match or next_has_date)
+            and (current["body"] or (date_match and current["dates"]))
+        ):
+            current = {"header": [], "dates": "", "body": []}
+            entries.append(current)
+
+        if date_match and not current["dates"] and not current["body"]:
+            current["dates"] = date_match.group().strip()
+            rest = (line[:date_match.start()] + line[date_match.end():]).strip(" ,|()–—-")
+            if rest:
+                current["header"].append(rest)
+        elif not is_bullet and not current["body"] and len(current["header"]) < 2 and not (
+            current["dates"] and current["header"]
+        ):
+            current["header"].append(line.strip())
+        else:
+            current["body"].append(_strip_bullet(line))
+    return entries
+
+def _split_title(header: list) -> tuple:
+    """
+    Return (first, second) header fields: two header lines, or one line split on a separator
+    """
+    if len(header) >= 2:
+        return header[0], header[1]
+    if not header:
+        return "", ""
+    parts = [part for part in _TITLE_SPLIT_RE.split(header[0], maxsplit=1) if part]
+    if len(parts) == 2:
+        return parts[0].strip(), parts[1].strip()
+    return header[0], ""
+
+def _parse_experience(lines: list) -> list:
+    experience = []
+    for entry in _split_entries(lines):
+        first, second = _split_title(entry["header"])
+        if len(entry["header"]) >= 2:
+            # Two-line headers are usually company first, then the role
+            company, job_title = first, second
+        else:
+            job_title, company = first, second
+        experience.append({
+            "job_title": job_title,
+            "company": company,
+            "dates": entry["dates"],
+            "description": [line for line in entry["body"] if line],
+        })
+    return experience
+
+def _parse_education(lines: list) -> list:
+    education = []
+    for entry in _split_entries(lines):
+        first, second = _split_title(entry["header"])
+        if DEGREE_RE.search(second) or SCHOOL_RE.search(first):
+            school, degree = first, second
+        else:
+            degree, school = first, second
+        education.append({
+            "degree": degree,
+            "school": school,
+            "dates": entry["dates"],
+            "description": " ".join(line for line in entry["body"] if line),
+        })
+    return education
+
+def _parse_projects(lines: list) -> list:
+    projects, current = [], None
+    for line in lines:
+        text = _strip_bullet(line)
+        lowered = text.lower()
+        if lowered.startswith(("technologies:", "tech stack:", "tools:", "stack:")) and current is not None:
+            current["technologies"] = [t for t in _SKILL_SPLIT_RE.split(text.split(":", 1)[1].strip()) if t]
+        elif current is None or (not BULLET_RE.match(line) and current["description"]):
+            match = DATE_RANGE_RE.search(text)
+            title = (text[:match.start()] + text[match.end():]).strip(" ,|()–—-") if match else text
+            current = {"title": title, "description": [], "technologies": [], "dates": match.group() if match else ""}
+            projects.append(current)
+        else:
+            current["description"].append(text)
+    return projects
+
+def _parse_list(lines: list, split_inline: bool) -> list:
+    items = []
+    for line in lines:
+        text = _strip_bullet(line)
+        if split_inline:
+            if ":" in text and len(text.split(":", 1)[0]) < 30:
+                text = text.split(":", 1)[1]  # "Languages: Python, Go" -> "Python, Go"
+            items.extend(item.strip() for item in _SKILL_SPLIT_RE.split(text) if item.strip())
+        elif text:
+            items.append(text)
+    return items
+
+def _find_name(preamble: list) -> str:
+    for line in preamble[:5]:
+        candidate = line.strip()
+        if "[" not in candidate and NAME_RE.match(candidate) and _heading_for(candidate) is None:
+            return candidate
+    return ""
+
+def _confidence(name: str, sections: dict, preamble: list, lines: list, parsed: dict) -> float:
+    """
+    Score in [0, 1] for how completely the text was understood
+    """
+    if not lines:
+        return 0.0
+    entries = parsed["Experience"] + parsed["Education"]
+    if entries:
+        complete = sum(
+            1 for entry in entries
+            if entry["dates"] and (entry.get("company") or entry.get("school"))
+            and (entry.get("job_title") or entry.get("degree"))
+        )
+        entry_quality = complete / len(entries)
+    else:
+        entry_quality = 0.0
+    # Lines not under any heading, beyond the name/contact block, were not understood
+    coverage = 1 - max(0, len(preamble) - 4) / len(lines)
+    section_score = min(1.0, len(sections) / 4)
+    return round(0.15 * bool(name) + 0.25 * section_score + 0.25 * coverage + 0.35 * entry_quality, 3)
+
+def parse_resume_heuristic(resume_text: str) -> tuple:
+    """
+    Parse resume text into the same JSON schema as the AI model, using
+    heading detection and line rules only. Returns (parsed_data, confidence).
+    """
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()]
+    preamble, sections, uncertain = _split_sections(lines)
+    name = _find_name(preamble)
+
+    parsed = {
+        "Name": name,
+        "Summary": " ".join(_strip_bullet(line) for line in sections.get("Summary", [])),
+        "Skills": _parse_list(sections.get("Skills", []), split_inline=True),
+        "Experience": _parse_experience(sections.get("Experience", [])),
+        "Education": _parse_education(sections.get("Education", [])),
+        "Projects": _parse_projects(sections.get("Projects", [])),
+        "Achievements": _parse_list(sections.get("Achievements", []), split_inline=False),
+    }
+    if uncertain:
+        # An unrecognised heading may have left personal details in an entry; leave it to the model
+        return parsed, 0.0
+    return parsed, _confidence(name, sections, preamble, lines, parsed)
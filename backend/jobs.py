@@ -0,0 +1,262 @@
+# jobs.py
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import BrokenExecutor
+from dotenv import load_dotenv
+
+# Load .env before the project modules below read their settings at import
+load_dotenv()
+
+import pipeline
+from log_config import configure_logging, request_id
+from metrics import resumes_processed
+from model_client import ModelUnavailableError
+from output_store import output_name
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))
+
+class PermanentJobError(Exception):
+    """
+    A failure that retrying cannot fix, e.g. a document with no text
+    """
+
+class JobQueue:
+    """
+    Persistent SQLite-backed queue of resume processing jobs.
+
+    Jobs are claimed with a lease, so a job held by a worker that died is
+    picked up again once the lease expires, including across restarts and
+    from other worker processes sharing the same database file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " filename TEXT NOT NULL,"
+            " input_path TEXT NOT NULL,"
+            " bypass_cache INTEGER NOT NULL DEFAULT 0,"
+            " status TEXT NOT NULL,"
+            " stage TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_run_at REAL NOT NULL,"
+            " lease_expires_at REAL,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL,"
+            " timings TEXT NOT NULL DEFAULT '{}',"
+            " output_filename TEXT,"
+            " error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, next_run_at)")
+
+    def submit(self, filename: str, input_path: str, bypass_cache: bool = False, job_id: str = None) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, filename, input_path, bypass_cache, status, stage, next_run_at, created_at)"
+                " VALUES (?, ?, ?, ?, 'queued', 'queued', ?, ?)",
+                (job_id, filename, input_path, int(bypass_cache), now, now),
+            )
+        return job_id
+
+    def claim(self):
+        """
+        Atomically take the next runnable job, or return None. Jobs whose
+        lease expired after their last allowed attempt (the worker crashed or
+        hung on them) are failed instead of being taken again.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                abandoned = self._conn.execute(
+                    "SELECT id, input_path FROM jobs"
+                    " WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, JOB_MAX_ATTEMPTS),
+                ).fetchall()
+                for job in abandoned:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'failed', stage = 'failed', error = ?,"
+                        " finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                        (f"Worker stopped responding on each of {JOB_MAX_ATTEMPTS} attempts", now, job["id"]),
+                    )
+                row = self._conn.execute(
+                    "SELECT * FROM jobs"
+                    " WHERE (status = 'queued' AND next_run_at <= ?)"
+                    " OR (status = 'running' AND lease_expires_at < ?)"
+                    " ORDER BY next_run_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                        " lease_expires_at = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                        (now + JOB_LEASE_SECONDS, now, row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        for job in abandoned:
+            logger.error(f"Job {job['id']} failed: its lease expired after the last allowed attempt")
+            resumes_processed.inc(outcome="error")
+            if os.path.exists(job["input_path"]):
+                os.remove(job["input_path"])
+        return dict(row) if row is not None else None
+
+    def set_stage(self, job_id: str, stage: str, timings: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET stage = ?, timings = ? WHERE id = ?",
+                (stage, json.dumps(timings), job_id),
+            )
+
+    def succeed(self, job_id: str, output_filename: str, timings: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', stage = 'done', output_filename = ?, timings = ?,"
+                " error = NULL, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (output_filename, json.dumps(timings), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str, retry: bool, min_delay: float = 0) -> None:
+        """
+        Record a failed attempt. Retryable failures are requeued with jittered
+        exponential backoff, waiting at least min_delay seconds, until
+        JOB_MAX_ATTEMPTS is reached.
+        """
+        now = time.time()
+        with self._lock:
+            attempts = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            if retry and attempts < JOB_MAX_ATTEMPTS:
+                delay = max(min_delay, JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1) * random.uniform(0.5, 1.5))
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = 'retrying', error = ?,"
+                    " next_run_at = ?, lease_expires_at = NULL WHERE id = ?",
+                    (error, now + delay, job_id),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', stage = 'failed', error = ?,"
+                    " finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                    (error, now, job_id),
+                )
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+class JobWorker:
+    """
+    Drains the job queue, running each job through the extract, parse and format stages
+    """
+
+    def __init__(self, queue: JobQueue):
+        self.queue = queue
+        self.wakeup = asyncio.Event()
+
+    async def run(self, name: str) -> None:
+        logger.info(f"Job worker {name} started")
+        while True:
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # Log records of the job carry its id, like request ids on the API path
+            token = request_id.set(job["id"])
+            try:
+                await self.process(job)
+            finally:
+                request_id.reset(token)
+
+    async def process(self, job: dict) -> None:
+        job_id = job["id"]
+        timings = json.loads(job["timings"])
+        logger.info(f"Job {job_id}: processing {job['filename']} (attempt {job['attempts'] + 1})")
+
+        async def stage(name, coro):
+            await asyncio.to_thread(self.queue.set_stage, job_id, name, timings)
+            start = time.time()
+            result = await coro
+            timings[name] = round(time.time() - start, 3)
+            return result
+
+        try:
+            file_extension = os.path.splitext(job["input_path"])[1].lower()
+            try:
+                text = await stage("extracting", pipeline.extract_text(job["input_path"], file_extension))
+            except BrokenExecutor:
+                raise
+            except Exception as e:
+                # A corrupt or unsupported document fails the same way on every attempt
+                raise PermanentJobError(f"Could not read {job['filename']}: {str(e)}") from e
+            if not text.strip():
+                raise PermanentJobError(f"Could not extract any text from {job['filename']}")
+
+            text, redaction_map = pipeline.redact(text)
+            parsed_data = await stage("parsing", pipeline.parse_resume(text, bypass_cache=bool(job["bypass_cache"])))
+            parsed_data = pipeline.verify_redactions(parsed_data, redaction_map)
+
+            output_filename = output_name(job_id, job["filename"], ".docx")
+            await stage("formatting", pipeline.format_resume(parsed_data, output_filename, job["filename"]))
+        except PermanentJobError as e:
+            resumes_processed.inc(outcome="error")
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            await asyncio.to_thread(self.queue.fail, job_id, str(e), False)
+        except ModelUnavailableError as e:
+            # Wait out the quota or breaker cooldown before the next attempt
+            logger.error(f"Job {job_id} attempt failed: {str(e)}")
+            await asyncio.to_thread(self.queue.fail, job_id, str(e), True, e.retry_after or 0)
+        except Exception as e:
+            logger.error(f"Job {job_id} attempt failed: {str(e)}")
+            await asyncio.to_thread(self.queue.fail, job_id, str(e), True)
+        else:
+            await asyncio.to_thread(self.queue.succeed, job_id, output_filename, timings)
+            resumes_processed.inc(outcome="success")
+            logger.info(f"Job {job_id} finished in {sum(timings.values()):.2f} seconds")
+        finally:
+            # Keep the upload only while the job can still be retried
+            current = await asyncio.to_thread(self.queue.get, job_id)
+            if current["status"] != "queued" and os.path.exists(job["input_path"]):
+                os.remove(job["input_path"])
+
+def start_workers(worker: JobWorker, count: int) -> list:
+    return [asyncio.create_task(worker.run(f"worker-{i}")) for i in range(count)]
+
+if __name__ == "__main__":
+    # Standalone worker process: scales separately from the API processes,
+    # sharing the queue through JOB_DB_PATH
+    # Same queued handlers and JSON log file as the API processes, with job ids on each record
+    configure_logging()
+
+    async def main():
+        worker = JobWorker(JobQueue(JOB_DB_PATH))
+        await asyncio.gather(*start_workers(worker, max(JOB_WORKERS, 1)))
+
+    asyncio.run(main())
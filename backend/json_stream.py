@@ -0,0 +1,155 @@
+# json_stream.py
+import json
+import re
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_DANGLING_KEY_RE = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+_PARTIAL_LITERAL_RE = re.compile(r"(?<=[:\[,])(\s*)(?:t|tr|tru|f|fa|fal|fals|n|nu|nul|-|\d+\.)$")
+_UNPARSED = object()
+
+def _last_significant(out: list) -> str:
+    for ch in reversed(out):
+        if not ch.isspace():
+            return ch
+    return ""
+
+def _drop_trailing_comma(out: list) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+def repair_json(text: str):
+    """
+    Parse JSON from model output, repairing common malformations: code
+    fences and prose around the document, trailing commas, raw newlines in
+    strings, missing commas between objects, and output truncated mid-way
+    (unterminated strings, dangling keys, unclosed brackets).
+    Raises ValueError if the text still does not parse.
+    """
+    text = _FENCE_RE.sub("", text)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("No JSON object or array found")
+    text = text[min(starts):]
+
+    out, stack = [], []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch in "\n\r\t":
+                out.append({"\n": "\\n", "\r": "\\r", "\t": "\\t"}[ch])
+                continue
+            out.append(ch)
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            if _last_significant(out) in ("}", "]"):
+                out.append(",")
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not stack:
+                break
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+            if not stack:
+                break
+            continue
+        out.append(ch)
+
+    # Truncated output: close the open string, drop the incomplete tail, close brackets
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    if stack:
+        repaired = _PARTIAL_LITERAL_RE.sub(r"\1null", repaired)
+        repaired = repaired.rstrip().rstrip(",")
+        if stack[-1] == "}":
+            repaired = _DANGLING_KEY_RE.sub(r"\1", repaired).rstrip().rstrip(",")
+        repaired += "".join(reversed(stack))
+    return json.loads(repaired)
+
+class SectionStreamParser:
+    """
+    Incremental scanner over a streamed JSON object. feed() takes the next
+    chunk of model output and returns the (key, value) pairs of top-level
+    members completed so far, so each section is available before the
+    whole response has arrived.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.expect = "start"  # start, key, value or done
+        self.key_start = None
+        self.key = None
+        self.value_start = None
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        sections = []
+        buffer = self.buffer
+        for i in range(self.pos, len(buffer)):
+            ch = buffer[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.expect == "key":
+                        self.key = json.loads(buffer[self.key_start:i + 1])
+                continue
+            if self.expect == "start":
+                # Skip code fences or prose before the object
+                if ch == "{":
+                    self.depth, self.expect = 1, "key"
+                continue
+            if self.expect == "done":
+                break
+            if ch == '"':
+                self.in_string = True
+                if self.depth == 1 and self.expect == "key":
+                    self.key_start = i
+            elif ch == ":" and self.depth == 1 and self.expect == "key":
+                self.expect, self.value_start = "value", i + 1
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self._complete(buffer[self.value_start:i], sections)
+                    self.expect = "done"
+            elif ch == "," and self.depth == 1 and self.expect == "value":
+                self._complete(buffer[self.value_start:i], sections)
+                self.expect = "key"
+        self.pos = len(buffer)
+        return sections
+
+    def _complete(self, value_text: str, sections: list) -> None:
+        if self.expect != "value" or self.key is None:
+            return
+        try:
+            value = json.loads(value_text)
+        except ValueError:
+            try:
+                value = repair_json(value_text)
+            except ValueError:
+                # Left for the final parse of the whole response
+                value = _UNPARSED
+        if value is not _UNPARSED:
+            sections.append((self.key, value))
+        self.key = self.value_start = None
@@ -0,0 +1,81 @@
+# layout.py
+from resume_schema import normalize_resume
+
+class Layout:
+    """
+    Format-independent layout of an anonymized resume: the candidate name for
+    the header and a list of (kind, texts) blocks in reading order. Block kinds:
+    heading, border, text, blank, entry_title, entry_title_dates (title, dates),
+    role (role, dates), bullet and labeled (label, value).
+    """
+    __slots__ = ("name", "blocks")
+
+    def __init__(self, name: str, blocks: list):
+        self.name = name
+        self.blocks = blocks
+
+def build_layout(data) -> Layout:
+    """
+    Lay out parsed resume data (a dict or a Resume) once, for every renderer to draw from
+    """
+    resume, _ = normalize_resume(data)
+    blocks = []
+
+    def add(kind, *texts):
+        blocks.append((kind, texts))
+
+    def add_heading(title):
+        add("heading", title)
+        add("border")
+
+    if resume.summary:
+        add_heading("Professional Summary")
+        add("text", resume.summary)
+        add("blank")
+
+    if resume.skills:
+        add_heading("Technical Skills")
+        add("text", ", ".join(resume.skills))
+        add("blank")
+
+    if resume.experience:
+        add_heading("Professional History")
+        for exp in resume.experience:
+            add("entry_title", exp.company)
+            add("role", exp.job_title, f" ({exp.dates})")
+            for line in exp.description:
+                add("bullet", line)
+            add("blank")
+
+    if resume.education:
+        add_heading("Education")
+        for edu in resume.education:
+            add("entry_title", edu.school)
+            add("role", edu.degree, f" ({edu.dates})")
+            if edu.description:
+                add("text", edu.description)
+            add("blank")
+
+    if resume.projects:
+        add_heading("Projects")
+        for project in resume.projects:
+            if project.dates:
+                add("entry_title_dates", project.title, f" ({project.dates})")
+            else:
+                add("entry_title", project.title)
+
+            if project.technologies:
+                add("labeled", "Technologies: ", ", ".join(project.technologies))
+
+            # Keep existing bullet points, add bullets if not present
+            for line in project.description:
+                add("text" if line.startswith('•') else "bullet", line)
+            add("blank")
+
+    if resume.achievements:
+        add_heading("Achievements")
+        for achievement in resume.achievements:
+            add("bullet", achievement)
+        add("blank")
+
+    return Layout(resume.name, blocks)
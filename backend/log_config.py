@@ -0,0 +1,154 @@
+# log_config.py
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from metrics import Counter
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Empty to log to the console only
+LOG_FILE = os.getenv("LOG_FILE", "resume_anonymizer.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# Plain text on the console; the file always gets one JSON object per line
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "true").lower() == "true"
+# Records waiting for the writer thread; beyond it records are dropped instead of blocking requests
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Share of DEBUG records kept, so verbose payloads can stay on under load
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] [%(request_id)s] %(message)s"
+
+# Id of the request (or job) being handled, stamped on every record logged for it
+request_id = contextvars.ContextVar("request_id", default="-")
+
+dropped_records = Counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+
+# Attributes every LogRecord has; anything else was passed as extra= and goes into the JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+class LazyJson:
+    """
+    Log argument serialized to JSON only when the record is written, on the
+    writer thread, and not at all when the record is filtered out
+    """
+    __slots__ = ("value", "indent")
+
+    def __init__(self, value, indent: int = None):
+        self.value = value
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.value, indent=self.indent, default=str)
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, request id, message,
+    any extra= fields and the formatted exception
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "requestId": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class _ContextFilter(logging.Filter):
+    """
+    Runs in the logging thread before a record is queued: stamps the request id
+    and samples DEBUG records
+    """
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and self.debug_sample_rate < 1 and random.random() >= self.debug_sample_rate:
+            return False
+        record.request_id = request_id.get()
+        return True
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the writer thread as they are, leaving message and
+    exception formatting to it, and drops them when the queue is full
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records.inc()
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than failing to stop when the queue is full
+        self.queue.put(self._sentinel)
+
+_listener = None
+_queue_handler = None
+
+def configure_logging(level: str = LOG_LEVEL, log_file: str = LOG_FILE, console: bool = LOG_CONSOLE,
+                      queue_size: int = LOG_QUEUE_SIZE, debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE) -> None:
+    """
+    Route the root logger through a bounded queue to a background writer
+    thread feeding a size-rotated JSON log file and the console. Safe to call
+    more than once; only the first call installs the handlers.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    handlers = []
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = _NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(_ContextFilter(debug_sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener = _Listener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """
+    Write out the queued records and stop the writer thread
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = _queue_handler = None
@@ -1,39 +1,149 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from anonymizer import parse_resume_to_json_gemini
-from formatter import format_resume_from_json
+from dotenv import load_dotenv
+
+# Load environment variables from .env before the project modules below read their settings
+load_dotenv()
+
+import pipeline
+from cache import result_cache
+from redactor import summarize_redactions
+import metrics
+from metrics import stage_timer
+from jobs import JobQueue, JobWorker, start_workers, JOB_DB_PATH, JOB_WORKERS
+from anonymizer import model_client
+from model_client import ModelUnavailableError
+from output_store import output_store, output_name, sweep_periodically, valid_output_name
+from bundle import archive_name, build_manifest, stream_bundle
+from renderers import RENDERERS, OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, get_renderer, renderer_for_name
+from log_config import configure_logging, request_id, LazyJson
+import asyncio
 import os
 import uuid
-import shutil
-import pdfplumber
-from docx import Document
-from dotenv import load_dotenv
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, Optional
 import json
 import logging
-from datetime import datetime
+import math
 import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler('resume_anonymizer.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging: records are written by a background thread, off the event loop
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file
-load_dotenv()
+# Define directories for uploads and templates (outputs live in the output store)
+UPLOAD_DIR = "uploads"
+TEMPLATE_DIR = "templates"
+# Create directories if they don't exist
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(TEMPLATE_DIR, exist_ok=True)
+
+# Output format query parameter shared by the processing endpoints
+OUTPUT_FORMAT_PATTERN = f"^({'|'.join(OUTPUT_FORMATS)})$"
+OUTPUT_FORMAT_DESCRIPTION = "Format rendered right away; the others are rendered when first downloaded"
+
+# Per-file upload limit, and the limit on whole request bodies of /anonymize-batch,
+# which carry several files; both are refused from Content-Length before the body is read
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(100 * 1024 * 1024)))
+# Room for multipart boundaries and the other form fields next to a single file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Comment lines sent on idle progress streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+job_queue = JobQueue(JOB_DB_PATH)
+job_worker = JobWorker(job_queue)
+
+# Warm the worker up in the background at startup; /readyz answers 503 until it is done,
+# so load balancers only route uploads to workers that will not pay for cold imports
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+readiness = {"ready": False, "warmup": None}
+
+async def warm_up_worker() -> None:
+    start = time.perf_counter()
+    steps = await asyncio.to_thread(pipeline.warm_up)
+    seconds = time.perf_counter() - start
+    readiness["warmup"] = {
+        "seconds": round(seconds, 3),
+        "steps": {step: round(step_seconds, 3) for step, step_seconds in steps.items()},
+    }
+    readiness["ready"] = True
+    logger.info(f"Worker ready after a {seconds:.2f}s warm-up")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # In-process job workers; set JOB_WORKERS=0 and run `python jobs.py` to scale them separately
+    worker_tasks = start_workers(job_worker, JOB_WORKERS)
+    await asyncio.to_thread(output_store.import_legacy)
+    await asyncio.to_thread(output_store.sweep)
+    sweeper = asyncio.create_task(sweep_periodically(output_store))
+    if WARMUP_ON_START:
+        warmup = asyncio.create_task(warm_up_worker())
+    else:
+        warmup = None
+        readiness["ready"] = True
+    yield
+    # Stop taking new traffic while in-flight work drains
+    readiness["ready"] = False
+    if warmup is not None:
+        warmup.cancel()
+    sweeper.cancel()
+    for task in worker_tasks:
+        task.cancel()
+    # Let in-flight extraction and formatting work finish before the worker exits
+    pipeline.shutdown()
 
 app = FastAPI(
     title="Resume Anonymizer API",
-    description="Upload resumes (PDF or DOCX), and get anonymized, formatted DOCX files back.",
+    description="Upload resumes (PDF or DOCX), and get anonymized, formatted DOCX, PDF or HTML files back.",
+    lifespan=lifespan,
 )
 
+@app.middleware("http")
+async def assign_request_id(request, call_next):
+    """
+    Tag every log record of a request with its id, taken from an X-Request-ID
+    header when the caller sends one, and return the id in the response
+    """
+    rid = (request.headers.get("x-request-id") or uuid.uuid4().hex[:16])[:64]
+    token = request_id.set(rid)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id.reset(token)
+    response.headers["X-Request-ID"] = rid
+    return response
+
+@app.middleware("http")
+async def limit_request_size(request, call_next):
+    """
+    Refuse request bodies over the upload limits from their Content-Length,
+    before Starlette reads and spools them
+    """
+    length = request.headers.get("content-length")
+    if length and length.isdigit():
+        limit = MAX_REQUEST_BYTES if request.url.path == "/anonymize-batch" else MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+        if int(length) > limit:
+            logger.error(f"Request too large: {length} bytes for {request.url.path}")
+            return JSONResponse(status_code=413, content={"detail": f"Request exceeds the maximum upload size of {limit} bytes"})
+    return await call_next(request)
+
+@app.middleware("http")
+async def server_timing(request, call_next):
+    """
+    Add per-stage durations as a Server-Timing header when METRICS_TIMING_HEADER is on
+    """
+    if not metrics.METRICS_TIMING_HEADER:
+        return await call_next(request)
+    timings = metrics.start_request_timings()
+    response = await call_next(request)
+    if timings:
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+    return response
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -43,20 +153,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Define directories for uploads, outputs, and templates
-UPLOAD_DIR = "uploads"
-OUTPUT_DIR = "outputs"
-TEMPLATE_DIR = "templates"
-# Create directories if they don't exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(TEMPLATE_DIR, exist_ok=True)
+def upload_stream(file: UploadFile):
+    """
+    The upload's file object, rewound, for the extractors to read in place.
+    Starlette has already spooled the body (in memory up to 1 MB, then in an
+    anonymous temp file), so only its size is checked here.
+    """
+    stream = file.file
+    size = file.size if file.size is not None else stream.seek(0, os.SEEK_END)
+    if size > MAX_UPLOAD_BYTES:
+        logger.error(f"Upload too large: {file.filename} exceeds {MAX_UPLOAD_BYTES} bytes")
+        raise HTTPException(status_code=413, detail=f"{file.filename} exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes")
+    metrics.upload_bytes.inc(size)
+    stream.seek(0)
+    return stream
 
-async def process_single_file(file: UploadFile) -> dict:
+def save_upload(stream, path: str) -> None:
+    with open(path, "wb") as f:
+        while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
+
+async def extract_upload(file: UploadFile) -> tuple:
     """
-    Process a single resume file and return its download URL
+    Validate an uploaded resume, extract its text and return (file_id, text)
     """
-    start_time = time.time()
     file_extension = os.path.splitext(file.filename)[1].lower()
     logger.info(f"Starting to process file: {file.filename} (Type: {file_extension})")
 
@@ -65,101 +185,485 @@ async def process_single_file(file: UploadFile) -> dict:
         raise HTTPException(status_code=400, detail=f"Unsupported file type for {file.filename}. Please upload .pdf or .docx files only.")
 
     file_id = str(uuid.uuid4())
-    input_path = os.path.join(UPLOAD_DIR, f"{file_id}{file_extension}")
     logger.info(f"Generated file ID: {file_id}")
     
-    try:
-        # Save the uploaded file temporarily
-        logger.info(f"Saving uploaded file to temporary location: {input_path}")
-        with open(input_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        logger.info(f"File saved successfully: {input_path}")
-
-        # Extract text from the saved file
-        text = ""
-        if file_extension == ".pdf":
-            logger.info(f"Processing PDF file: {file.filename}")
-            try:
-                with pdfplumber.open(input_path) as pdf:
-                    text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-                    logger.info(f"Successfully extracted {len(text)} characters from PDF")
-            except Exception as e:
-                logger.error(f"PDF extraction failed for {file.filename}: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"Failed to extract text from PDF: {e}")
-        elif file_extension == ".docx":
-            logger.info(f"Processing DOCX file: {file.filename}")
-            try:
-                doc = Document(input_path)
-                text = "\n".join(p.text for p in doc.paragraphs)
-                logger.info(f"Successfully extracted {len(text)} characters from DOCX")
-            except Exception as e:
-                logger.error(f"DOCX extraction failed for {file.filename}: {str(e)}")
-                raise HTTPException(status_code=500, detail=f"Failed to extract text from DOCX: {e}")
-        
-        if not text.strip():
-            logger.error(f"No text content found in file: {file.filename}")
-            raise HTTPException(status_code=400, detail=f"Could not extract any text from {file.filename}")
-
-        # Parse with Gemini
-        logger.info(f"Starting AI model processing for {file.filename}")
+    stream = upload_stream(file)
+    # Extract text straight from the spooled upload
+    text = ""
+    if file_extension == ".pdf":
+        logger.info(f"Processing PDF file: {file.filename}")
         try:
-            parsed_data = parse_resume_to_json_gemini(text)
-            logger.info("AI model processing completed successfully")
-            logger.debug(f"Parsed data: {json.dumps(parsed_data, indent=2)}")
+            text = await pipeline.extract_text(stream, file_extension)
+            logger.info(f"Successfully extracted {len(text)} characters from PDF")
         except Exception as e:
-            logger.error(f"AI model processing failed: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to parse {file.filename} with the AI model: {e}")
-
-        # Format into new DOCX
-        original_filename = os.path.splitext(os.path.basename(file.filename))[0]
-        output_filename = f"{file_id}_{original_filename}_anonymized.docx"
-        output_path = os.path.join(OUTPUT_DIR, output_filename)
-        logger.info(f"Preparing to create anonymized document: {output_filename}")
-        
+            logger.error(f"PDF extraction failed for {file.filename}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to extract text from PDF: {e}")
+    elif file_extension == ".docx":
+        logger.info(f"Processing DOCX file: {file.filename}")
         try:
-            logger.info(f"Formatting anonymized resume for {file.filename}")
-            format_resume_from_json(parsed_data, output_path)
-            processing_time = time.time() - start_time
-            logger.info(f"Successfully processed {file.filename} in {processing_time:.2f} seconds")
-            return {
-                "originalName": file.filename,
-                "downloadUrl": f"http://localhost:8000/download/{output_filename}"
-            }
+            text = await pipeline.extract_text(stream, file_extension)
+            logger.info(f"Successfully extracted {len(text)} characters from DOCX")
         except Exception as e:
-            logger.error(f"Failed to format resume {file.filename}: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to format {file.filename}. Error: {e}")
+            logger.error(f"DOCX extraction failed for {file.filename}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to extract text from DOCX: {e}")
+    
+    if not text.strip():
+        logger.error(f"No text content found in file: {file.filename}")
+        raise HTTPException(status_code=400, detail=f"Could not extract any text from {file.filename}")
 
-    finally:
-        # Clean up the input file
-        if os.path.exists(input_path):
-            logger.info(f"Cleaning up temporary file: {input_path}")
-            os.remove(input_path)
-            logger.info("Temporary file cleaned up successfully")
+    return file_id, text
+
+def output_links(output_filename: str) -> dict:
+    """
+    Download URL of an output in every format, keyed by format
+    """
+    stem = os.path.splitext(output_filename)[0]
+    return {
+        output_format: f"http://localhost:8000/download/{stem}{renderer.extension}"
+        for output_format, renderer in RENDERERS.items()
+    }
+
+async def write_anonymized(file_id: str, filename: str, parsed_data: dict, output_format: str = DEFAULT_OUTPUT_FORMAT) -> dict:
+    """
+    Render parsed resume data in output_format and return its download info,
+    with links to the other formats, which are rendered on first download
+    """
+    output_filename = output_name(file_id, filename, get_renderer(output_format).extension)
+    logger.info(f"Preparing to create anonymized document: {output_filename}")
+    
+    try:
+        logger.info(f"Formatting anonymized resume for {filename}")
+        await pipeline.format_resume(parsed_data, output_filename, filename)
+        links = output_links(output_filename)
+        return {
+            "originalName": filename,
+            "fileName": output_filename,
+            "downloadUrl": f"http://localhost:8000/download/{output_filename}",
+            "previewUrl": links["html"],
+            "downloads": links,
+        }
+    except Exception as e:
+        logger.error(f"Failed to format resume {filename}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to format {filename}. Error: {e}")
+
+def _ignore_progress(event: str, **data) -> None:
+    pass
+
+async def process_single_file(
+    file: UploadFile,
+    bypass_cache: bool = False,
+    progress=_ignore_progress,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+    preview: bool = False,
+) -> dict:
+    """
+    Process a single resume file and return its download URL. progress(event, **data)
+    is called as the file moves through the pipeline; with preview, the HTML
+    preview is rendered first and announced before the requested format.
+    """
+    start_time = time.time()
+    try:
+        with stage_timer("total"):
+            result = await _process_single_file(file, bypass_cache, progress, output_format, preview)
+    except Exception:
+        metrics.resumes_processed.inc(outcome="error")
+        raise
+    metrics.resumes_processed.inc(outcome="success")
+    processing_time = time.time() - start_time
+    logger.info(f"Successfully processed {file.filename} in {processing_time:.2f} seconds")
+    return result
+
+async def _process_single_file(file: UploadFile, bypass_cache: bool, progress, output_format: str, preview: bool) -> dict:
+    progress("received", originalName=file.filename, bytes=file.size)
+    file_id, text = await extract_upload(file)
+    progress("extracted", chars=len(text))
+    text, redaction_map = pipeline.redact(text)
+    progress("redacted", redactions=summarize_redactions(redaction_map))
+
+    # Parse with Gemini
+    logger.info(f"Starting AI model processing for {file.filename}")
+    progress("model_started")
+    model_start = time.time()
+    try:
+        parsed_data = await pipeline.parse_resume(
+            text,
+            bypass_cache=bypass_cache,
+            on_section=lambda section, value: progress("section", section=section),
+        )
+        logger.info("AI model processing completed successfully")
+        logger.debug("Parsed data: %s", LazyJson(parsed_data, indent=2))
+    except ModelUnavailableError as e:
+        # Quota, deadline or breaker errors tell the client to come back later
+        logger.error(f"AI model unavailable: {str(e)}")
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        raise HTTPException(status_code=e.status_code, detail=f"Failed to parse {file.filename}: {e}", headers=headers)
+    except Exception as e:
+        logger.error(f"AI model processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to parse {file.filename} with the AI model: {e}")
+    progress("model_finished", seconds=round(time.time() - model_start, 3))
+    parsed_data = pipeline.verify_redactions(parsed_data, redaction_map)
+
+    # The HTML preview takes milliseconds, so show it before the heavier format
+    if preview and output_format != "html":
+        preview_result = await write_anonymized(file_id, file.filename, parsed_data, "html")
+        progress("preview", previewUrl=preview_result["downloadUrl"])
+
+    # Format into the requested output format
+    result = await write_anonymized(file_id, file.filename, parsed_data, output_format)
+    progress("formatted")
+    result["redactions"] = summarize_redactions(redaction_map)
+    return result
+
+def _error_result(filename: str, error: Exception) -> dict:
+    detail = error.detail if isinstance(error, HTTPException) else str(error)
+    return {"originalName": filename, "error": detail}
+
+async def process_batch(files: List[UploadFile], bypass_cache: bool = False, output_format: str = DEFAULT_OUTPUT_FORMAT) -> list:
+    """
+    Process many resume files, packing short ones into shared model requests.
+    Each file gets its own result entry; one failure does not fail the batch.
+    """
+    start_time = time.time()
+    logger.info(f"Starting batch of {len(files)} files")
+    extracted = await asyncio.gather(*(extract_upload(f) for f in files), return_exceptions=True)
+
+    results = [None] * len(files)
+    pending = []  # (index, file_id, redacted_text, redaction_map) for files that extracted successfully
+    for index, (file, outcome) in enumerate(zip(files, extracted)):
+        if isinstance(outcome, BaseException):
+            results[index] = _error_result(file.filename, outcome)
+        else:
+            file_id, text = outcome
+            pending.append((index, file_id, *pipeline.redact(text)))
+
+    logger.info(f"Starting AI model processing for {len(pending)} files in batch")
+    parsed = await pipeline.parse_resumes_batch([text for _, _, text, _ in pending], bypass_cache=bypass_cache)
+
+    async def finish(index, file_id, redaction_map, parsed_data):
+        filename = files[index].filename
+        if isinstance(parsed_data, BaseException):
+            logger.error(f"AI model processing failed for {filename}: {str(parsed_data)}")
+            return index, _error_result(filename, parsed_data)
+        parsed_data = pipeline.verify_redactions(parsed_data, redaction_map)
+        try:
+            result = await write_anonymized(file_id, filename, parsed_data, output_format)
+        except HTTPException as e:
+            return index, _error_result(filename, e)
+        result["redactions"] = summarize_redactions(redaction_map)
+        return index, result
+
+    for index, result in await asyncio.gather(*(
+        finish(index, file_id, redaction_map, parsed_data)
+        for (index, file_id, _, redaction_map), parsed_data in zip(pending, parsed)
+    )):
+        results[index] = result
+
+    for result in results:
+        metrics.resumes_processed.inc(outcome="error" if "error" in result else "success")
+    processing_time = time.time() - start_time
+    logger.info(f"Finished batch of {len(files)} files in {processing_time:.2f} seconds")
+    return results
 
 @app.post("/anonymize-single", tags=["Resume Processing"])
-async def anonymize_single_resume(file: UploadFile = File(..., description="Resume file in .pdf or .docx format")):
+async def anonymize_single_resume(
+    file: UploadFile = File(..., description="Resume file in .pdf or .docx format"),
+    bypass_cache: bool = Query(False, description="Always call the AI model, ignoring cached parses"),
+    output_format: str = Query(DEFAULT_OUTPUT_FORMAT, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION),
+):
     """
     Process a single resume file and return its download URL
     """
-    result = await process_single_file(file)
+    result = await process_single_file(file, bypass_cache=bypass_cache, output_format=output_format)
     return result
 
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/anonymize-stream", tags=["Resume Processing"])
+async def anonymize_stream(
+    file: UploadFile = File(..., description="Resume file in .pdf or .docx format"),
+    bypass_cache: bool = Query(False, description="Always call the AI model, ignoring cached parses"),
+    output_format: str = Query(DEFAULT_OUTPUT_FORMAT, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION),
+):
+    """
+    Process a single resume file, streaming pipeline progress as server-sent
+    events, including a preview event with the HTML preview URL, and finishing
+    with a ready (download URL) or error event
+    """
+    events = asyncio.Queue()
+
+    def progress(event: str, **data) -> None:
+        events.put_nowait((event, data))
+
+    async def run():
+        try:
+            result = await process_single_file(
+                file, bypass_cache=bypass_cache, progress=progress, output_format=output_format, preview=True
+            )
+            progress("ready", **result)
+        except HTTPException as e:
+            progress("error", status=e.status_code, detail=e.detail)
+        except Exception as e:
+            logger.error(f"Streaming processing failed for {file.filename}: {str(e)}")
+            progress("error", status=500, detail=str(e))
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.create_task(run())
+
+    async def stream():
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(events.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield format_sse(*item)
+        finally:
+            # The client went away; stop working on a result nobody will fetch
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/anonymize-batch", tags=["Resume Processing"])
+async def anonymize_batch(
+    files: List[UploadFile] = File(..., description="Resume files in .pdf or .docx format"),
+    bypass_cache: bool = Query(False, description="Always call the AI model, ignoring cached parses"),
+    output_format: str = Query(DEFAULT_OUTPUT_FORMAT, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description=OUTPUT_FORMAT_DESCRIPTION),
+):
+    """
+    Process many resume files in one request and return a result per file
+    """
+    results = await process_batch(files, bypass_cache=bypass_cache, output_format=output_format)
+
+    # Remember the batch so all of its outputs can be downloaded as one ZIP
+    batch_id = str(uuid.uuid4())
+    await asyncio.to_thread(output_store.add_batch, batch_id, [
+        {"originalName": result["originalName"], "name": result.get("fileName"), "error": result.get("error")}
+        for result in results
+    ])
+    return {
+        "batchId": batch_id,
+        "bundleUrl": f"http://localhost:8000/download-bundle?batch_id={batch_id}",
+        "results": results,
+    }
+
+@app.post("/jobs", status_code=202, tags=["Jobs"])
+async def submit_job(
+    file: UploadFile = File(..., description="Resume file in .pdf or .docx format"),
+    bypass_cache: bool = Query(False, description="Always call the AI model, ignoring cached parses"),
+):
+    """
+    Queue a resume for background processing and return its job id immediately
+    """
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in [".pdf", ".docx"]:
+        logger.error(f"Invalid file type: {file_extension} for file {file.filename}")
+        raise HTTPException(status_code=400, detail=f"Unsupported file type for {file.filename}. Please upload .pdf or .docx files only.")
+
+    # The upload is kept until the job finishes, so it survives restarts and retries
+    job_id = str(uuid.uuid4())
+    input_path = os.path.join(UPLOAD_DIR, f"{job_id}{file_extension}")
+    stream = upload_stream(file)
+    try:
+        with stage_timer("upload"):
+            await asyncio.to_thread(save_upload, stream, input_path)
+    except BaseException:
+        if os.path.exists(input_path):
+            os.remove(input_path)
+        raise
+    await asyncio.to_thread(job_queue.submit, file.filename, input_path, bypass_cache, job_id)
+    job_worker.wakeup.set()
+    logger.info(f"Queued job {job_id} for {file.filename}")
+    return {"jobId": job_id, "statusUrl": f"http://localhost:8000/jobs/{job_id}"}
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def job_status(job_id: str):
+    """
+    Report a job's status, current stage, per-stage timings and download URL once done
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    status = {
+        "jobId": job["id"],
+        "originalName": job["filename"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "attempts": job["attempts"],
+        "createdAt": job["created_at"],
+        "startedAt": job["started_at"],
+        "finishedAt": job["finished_at"],
+        "timings": json.loads(job["timings"]),
+    }
+    if job["output_filename"]:
+        status["downloadUrl"] = f"http://localhost:8000/download/{job['output_filename']}"
+        status["downloads"] = output_links(job["output_filename"])
+    if job["error"]:
+        status["error"] = job["error"]
+    return status
+
+@app.get("/healthz", tags=["Monitoring"])
+async def healthz():
+    """
+    Liveness: the process is up and serving requests, warmed up or not
+    """
+    return {"status": "ok"}
+
+@app.get("/readyz", tags=["Monitoring"])
+async def readyz():
+    """
+    Readiness: 503 until the worker has warmed up (and again while it shuts
+    down), then 200 with the warm-up timings
+    """
+    if not readiness["ready"]:
+        raise HTTPException(status_code=503, detail="Worker is not ready")
+    return {"status": "ready", "warmup": readiness["warmup"]}
+
+@app.get("/metrics", tags=["Monitoring"])
+async def prometheus_metrics():
+    """
+    Pipeline metrics in the Prometheus text format
+    """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/model/status", tags=["Monitoring"])
+async def model_status():
+    """
+    Report the model client's quota, in-flight calls and circuit breaker state
+    """
+    return model_client.state()
+
+@app.get("/cache/stats", tags=["Resume Processing"])
+async def cache_stats():
+    """
+    Report parsed-resume cache size and hit/miss counters
+    """
+    return await asyncio.to_thread(result_cache.stats)
+
+@app.get("/outputs/stats", tags=["Monitoring"])
+async def output_stats():
+    """
+    Report stored outputs, distinct files on disk and their total size
+    """
+    return await asyncio.to_thread(output_store.stats)
+
+@app.get("/download-bundle")
+async def download_bundle(
+    batch_id: Optional[str] = Query(None, description="Batch id returned by /anonymize-batch"),
+    name: Optional[List[str]] = Query(None, description="Output file names to include, when no batch id is given"),
+    manifest: str = Query("none", pattern="^(none|json|csv)$", description="Also include a manifest of the parsed fields"),
+    output_format: Optional[str] = Query(None, alias="format", pattern=OUTPUT_FORMAT_PATTERN, description="Bundle this format instead of the stored one, rendering it where missing"),
+):
+    """
+    Stream many processed resumes as one ZIP archive, written on the fly in
+    chunks without a temporary file
+    """
+    if batch_id is not None:
+        items = await asyncio.to_thread(output_store.get_batch, batch_id)
+        if items is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+    elif name:
+        invalid = [n for n in name if not valid_output_name(n)]
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid file name: {invalid[0]}")
+        items = [{"originalName": None, "name": n, "error": None} for n in dict.fromkeys(name)]
+    else:
+        raise HTTPException(status_code=400, detail="Pass a batch_id or one or more name parameters")
+
+    if output_format is not None:
+        extension = get_renderer(output_format).extension
+        for item in items:
+            if item["name"]:
+                item["name"] = os.path.splitext(item["name"])[0] + extension
+
+    details = await asyncio.to_thread(output_store.details, [item["name"] for item in items if item["name"]])
+    members, manifest_items, taken = [], [], set()
+    for item in items:
+        entry = await get_output(item["name"]) if item["name"] else None
+        detail = details.get(item["name"], {})
+        original_name = item["originalName"] or detail.get("originalName")
+        manifest_item = {"originalName": original_name, "file": None, "error": item["error"], "parsed": detail.get("parsed")}
+        if entry is not None:
+            manifest_item["file"] = archive_name(original_name, entry.name, taken)
+            members.append((manifest_item["file"], entry.path))
+        elif not item["error"]:
+            manifest_item["error"] = "File not found or expired"
+        manifest_items.append(manifest_item)
+
+    if not members:
+        raise HTTPException(status_code=404, detail="None of the requested files are available")
+    logger.info(f"Streaming bundle of {len(members)} files")
+    bundle_manifest = build_manifest(manifest_items, manifest) if manifest != "none" else None
+    # A plain generator: Starlette iterates it on a worker thread, so file reads stay off the event loop
+    return StreamingResponse(
+        stream_bundle(members, bundle_manifest),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="resumes_{batch_id or "bundle"}.zip"'},
+    )
+
+async def get_output(filename: str):
+    """
+    Look up a stored output, rendering it from the recorded parse when only
+    another format of the same resume has been rendered so far
+    """
+    # Store lookups query SQLite and can wait on a sweep, so they run off the event loop
+    entry = await asyncio.to_thread(output_store.get, filename)
+    if entry is None:
+        try:
+            entry = await pipeline.render_on_demand(filename)
+        except Exception as e:
+            logger.error(f"On-demand rendering of {filename} failed: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to render {filename}. Error: {e}")
+    return entry
+
 @app.get("/download/{filename}")
-async def download_file(filename: str):
+async def download_file(filename: str, request: Request):
     """
-    Download a processed resume file
+    Download a processed resume file in the format given by its extension,
+    rendering formats not produced yet on first request. The ETag is the
+    content hash, so If-None-Match revalidations get a 304; Range requests
+    are supported.
     """
     logger.info(f"Download requested for file: {filename}")
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
+    if not valid_output_name(filename):
+        raise HTTPException(status_code=400, detail="Invalid file name")
+
+    entry = await get_output(filename)
+    if entry is None:
+        logger.error(f"File not found: {filename}")
         raise HTTPException(status_code=404, detail="File not found")
-    
-    logger.info(f"Serving file: {file_path}")
+
+    etag = f'"{entry.digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        stat_result = await asyncio.to_thread(os.stat, entry.path)
+    except FileNotFoundError:
+        logger.error(f"Stored file missing for {filename}: {entry.path}")
+        await asyncio.to_thread(output_store.discard, filename)
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Outputs from before other formats existed are all DOCX
+    renderer = renderer_for_name(filename) or RENDERERS["docx"]
+    logger.info(f"Serving file: {filename}")
     return FileResponse(
-        path=file_path,
+        path=entry.path,
         filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        media_type=renderer.media_type,
+        stat_result=stat_result,
+        headers=headers,
+        content_disposition_type="inline" if renderer.inline else "attachment",
     )
\ No newline at end of file
@@ -1,20 +1,21 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from anonymizer import parse_resume_to_json_gemini
+from dotenv import load_dotenv
+
+# Load .env before the project modules below read their settings at import
+load_dotenv()
+
+from anonymizer import parse_resume_to_json_gemini_async
 from formatter import format_resume_from_json
 import os
 import uuid
 import shutil
 import pdfplumber
 from docx import Document
-from dotenv import load_dotenv
 from typing import List
 import json
 
-# Load environment variables from .env file
-load_dotenv()
-
 app = FastAPI(
     title="Resume Anonymizer API",
     description="Upload resumes (PDF or DOCX), and get anonymized, formatted DOCX files back.",
@@ -75,7 +76,7 @@ async def process_single_file(file: UploadFile) -> dict:
 
         # Parse with Gemini
         try:
-            parsed_data = parse_resume_to_json_gemini(text)
+            parsed_data = await parse_resume_to_json_gemini_async(text)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to parse {file.filename} with the AI model: {e}")
 
@@ -0,0 +1,151 @@
+# metrics.py
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Adds a Server-Timing header with per-stage durations to each response
+METRICS_TIMING_HEADER = os.getenv("METRICS_TIMING_HEADER", "false").lower() == "true"
+
+# Stage durations collected for the current request, when the timing header is on
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+_registry = []
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with optional labels
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # label key -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def snapshot(self) -> dict:
+        """
+        Observation count and sum per label set, keyed by the labels dict items
+        """
+        with self._lock:
+            return {key: (sum(state[:-1]), state[-1]) for key, state in self._values.items()}
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+                cumulative += state[len(self.buckets)]
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {state[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+stage_seconds = Histogram("resume_stage_seconds", "Time spent per pipeline stage", _SECONDS_BUCKETS)
+stage_errors = Counter("resume_stage_errors_total", "Errors raised per pipeline stage")
+upload_bytes = Counter("resume_upload_bytes_total", "Bytes received in resume uploads")
+extracted_chars = Histogram("resume_extracted_chars", "Characters of text extracted per resume", _SIZE_BUCKETS)
+prompt_chars = Histogram("llm_prompt_chars", "Characters sent to the model per request", _SIZE_BUCKETS)
+response_chars = Histogram("llm_response_chars", "Characters received from the model per request", _SIZE_BUCKETS)
+cache_lookups = Counter("resume_cache_lookups_total", "Parsed-resume cache lookups by result")
+resumes_processed = Counter("resumes_processed_total", "Resumes processed by outcome")
+model_retries = Counter("llm_retries_total", "Model calls retried after a transient error, by reason")
+model_rejections = Counter("llm_failures_total", "Model calls given up on after retries, by reason")
+json_repairs = Counter("llm_json_repairs_total", "Model responses that needed repair to parse as JSON")
+first_section_seconds = Histogram("llm_first_section_seconds", "Time from the start of a streamed model response to its first complete section", _SECONDS_BUCKETS)
+resume_tokens = Histogram("llm_resume_tokens", "Estimated tokens of resume text per prompt, raw and after compaction", _TOKEN_BUCKETS)
+compaction_removed_lines = Counter("llm_compaction_removed_lines_total", "Lines dropped from resume text before prompting, by reason")
+missing_fields = Counter("resume_missing_fields_total", "Required fields missing from model output, by outcome (repaired, unrepaired, skipped)")
+warmup_seconds = Histogram("worker_warmup_seconds", "Time spent loading dependencies and state before a worker reports ready, by step", _SECONDS_BUCKETS)
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Time a pipeline stage into resume_stage_seconds, and count its errors
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0) + elapsed
+
+def start_request_timings() -> dict:
+    """
+    Begin collecting stage durations for the current request
+    """
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+def server_timing_header(timings: dict) -> str:
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+def render_prometheus() -> str:
+    """
+    All metrics in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
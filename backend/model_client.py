@@ -0,0 +1,323 @@
+# model_client.py
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from functools import lru_cache
+from metrics import stage_timer, model_retries, model_rejections
+
+logger = logging.getLogger(__name__)
+
+# Quota the client paces itself to (defaults match the Gemini 2.5 Flash paid tier 1)
+MODEL_RPM = int(os.getenv("MODEL_RPM", "1000"))
+MODEL_TPM = int(os.getenv("MODEL_TPM", "1000000"))
+# Maximum in-flight Gemini requests per process
+MODEL_CONCURRENCY = int(os.getenv("MODEL_CONCURRENCY", "8"))
+# Per-attempt timeout, and the overall deadline for a call including retries
+MODEL_CALL_TIMEOUT_SECONDS = float(os.getenv("MODEL_CALL_TIMEOUT_SECONDS", "60"))
+MODEL_DEADLINE_SECONDS = float(os.getenv("MODEL_DEADLINE_SECONDS", "180"))
+MODEL_MAX_RETRIES = int(os.getenv("MODEL_MAX_RETRIES", "4"))
+MODEL_BACKOFF_BASE_SECONDS = float(os.getenv("MODEL_BACKOFF_BASE_SECONDS", "1"))
+MODEL_BACKOFF_MAX_SECONDS = float(os.getenv("MODEL_BACKOFF_MAX_SECONDS", "30"))
+# Consecutive failed calls that open the circuit breaker, and how long it stays open
+MODEL_BREAKER_THRESHOLD = int(os.getenv("MODEL_BREAKER_THRESHOLD", "5"))
+MODEL_BREAKER_COOLDOWN_SECONDS = float(os.getenv("MODEL_BREAKER_COOLDOWN_SECONDS", "30"))
+
+@lru_cache(maxsize=None)
+def _rate_limit_errors() -> tuple:
+    # google.api_core comes with the Gemini SDK; it is imported on first use to keep startup fast
+    from google.api_core import exceptions as api_exceptions
+    return (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)
+
+@lru_cache(maxsize=None)
+def _transient_errors() -> tuple:
+    from google.api_core import exceptions as api_exceptions
+    return _rate_limit_errors() + (
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.InternalServerError,
+        api_exceptions.DeadlineExceeded,
+        api_exceptions.GatewayTimeout,
+        api_exceptions.Aborted,
+        asyncio.TimeoutError,
+        ConnectionError,
+    )
+
+_RETRY_IN_RE = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+_RETRY_DELAY_RE = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+
+class ModelUnavailableError(Exception):
+    """
+    The model could not be reached within the deadline. status_code is the
+    HTTP status to answer with and retry_after a hint in seconds, if known.
+    """
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ModelRateLimitedError(ModelUnavailableError):
+    status_code = 429
+
+class ModelDeadlineError(ModelUnavailableError):
+    status_code = 504
+
+class ModelCircuitOpenError(ModelUnavailableError):
+    status_code = 503
+
+def retry_after_seconds(error: Exception):
+    """
+    Server-suggested wait from a quota error: the RetryInfo detail, a
+    Retry-After header, or the "retry in Ns" hint in the message
+    """
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers and headers.get("retry-after"):
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            pass
+    match = _RETRY_IN_RE.search(str(error)) or _RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+class TokenBucket:
+    """
+    Refills at rate_per_minute, holding at most one minute's worth. The level
+    may go negative when a call used more than was reserved for it.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = rate_per_minute
+        self.rate = rate_per_minute / 60
+        self.level = float(rate_per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failed calls and rejects calls for the
+    cooldown, then lets a single probe call through (half-open)
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self.probing):
+            retry_after = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            raise ModelCircuitOpenError("AI model temporarily unavailable after repeated failures", retry_after or 1.0)
+        if state == "half_open":
+            self.probing = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            if self.state != "open":
+                logger.warning(f"Opening model circuit breaker after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release_probe(self) -> None:
+        # The probe ended without a verdict on the model (cancelled, bad request); the next call probes
+        self.probing = False
+
+class ModelClient:
+    """
+    Long-lived Gemini model shared by all requests. Paces calls to the
+    requests/min and tokens/min quota, caps in-flight calls, retries
+    transient errors with jittered backoff until a deadline, and trips a
+    circuit breaker when the model keeps failing.
+    """
+
+    def __init__(self, model_name: str, factory):
+        self.model_name = model_name
+        self._factory = factory
+        self._model = None
+        self.requests = TokenBucket(MODEL_RPM)
+        self.tokens = TokenBucket(MODEL_TPM)
+        self.breaker = CircuitBreaker(MODEL_BREAKER_THRESHOLD, MODEL_BREAKER_COOLDOWN_SECONDS)
+        self._slots = asyncio.Semaphore(MODEL_CONCURRENCY)
+        self._admission = asyncio.Lock()
+        self._paused_until = 0.0
+        self.inflight = 0
+        self.waiting = 0
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self._factory(self.model_name)
+        return self._model
+
+    def warm_up(self):
+        """
+        Create the model and load the SDK's error classes ahead of the first call
+        """
+        _transient_errors()
+        return self.model
+
+    def set_factory(self, factory) -> None:
+        self._factory = factory
+        self._model = None
+
+    async def _admit(self, tokens: int) -> None:
+        # One caller at a time reserves quota, so waiters are served in order
+        async with self._admission:
+            while True:
+                wait = max(
+                    self._paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    async def generate(self, contents, tokens: int, stage: str = "model", consume=None, **kwargs):
+        """
+        Call generate_content_async with the given contents. tokens is the
+        estimated prompt plus response size reserved against the TPM quota.
+        For streamed calls, consume is an async function reading the response;
+        it runs within the attempt's timeout and its result is returned.
+        Raises ModelUnavailableError subclasses when the model stays unavailable.
+        """
+        deadline = time.monotonic() + MODEL_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            self.waiting += 1
+            try:
+                with stage_timer("model_queue"):
+                    await self._slots.acquire()
+                    try:
+                        await self._admit(tokens)
+                    except BaseException:
+                        self._slots.release()
+                        raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            finally:
+                self.waiting -= 1
+
+            self.inflight += 1
+            try:
+                timeout = min(MODEL_CALL_TIMEOUT_SECONDS, deadline - time.monotonic())
+                with stage_timer(stage):
+                    response, result = await asyncio.wait_for(self._attempt(contents, consume, kwargs), timeout)
+            except _transient_errors() as e:
+                error = e
+            except BaseException:
+                # Not a capacity problem (bad request, auth) or cancelled; surface it unchanged
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                self._reconcile(response, tokens)
+                return result
+            finally:
+                self.inflight -= 1
+                self._slots.release()
+
+            delay = self._retry_delay(error, attempt)
+            reason = "rate_limited" if isinstance(error, _rate_limit_errors()) else "timeout" if isinstance(error, asyncio.TimeoutError) else "unavailable"
+            if attempt >= MODEL_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                # The breaker counts failed calls, so a call's retries add one failure, not one each
+                self.breaker.record_failure()
+                raise self._give_up(error, reason, delay)
+            if self.breaker.probing:
+                # A failed half-open probe reopens the breaker instead of retrying
+                self.breaker.record_failure()
+            model_retries.inc(reason=reason)
+            logger.warning(f"Model call failed ({reason}), retrying in {delay:.1f}s: {str(error) or type(error).__name__}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self, contents, consume, kwargs) -> tuple:
+        response = await self.model.generate_content_async(contents, **kwargs)
+        if consume is None:
+            return response, response
+        return response, await consume(response)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        backoff = random.uniform(0, min(MODEL_BACKOFF_MAX_SECONDS, MODEL_BACKOFF_BASE_SECONDS * 2 ** attempt))
+        if isinstance(error, _rate_limit_errors()):
+            retry_after = retry_after_seconds(error)
+            if retry_after is not None:
+                # The quota is shared, so hold back every caller, not just this one
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                return retry_after + backoff * 0.1
+        return backoff
+
+    def _give_up(self, error: Exception, reason: str, retry_after: float) -> ModelUnavailableError:
+        model_rejections.inc(reason=reason)
+        message = str(error) or type(error).__name__
+        if reason == "rate_limited":
+            return ModelRateLimitedError(f"AI model quota exhausted: {message}", retry_after)
+        if reason == "timeout":
+            return ModelDeadlineError(f"AI model did not answer in time: {message}", retry_after)
+        return ModelUnavailableError(f"AI model unavailable: {message}", retry_after)
+
+    def _reconcile(self, response, reserved: int) -> None:
+        # Settle the token reservation against the usage the API reported
+        usage = getattr(response, "usage_metadata", None)
+        used = getattr(usage, "total_token_count", None)
+        if used:
+            self.tokens.adjust(reserved - used)
+
+    def state(self) -> dict:
+        self.requests.adjust(0)
+        self.tokens.adjust(0)
+        return {
+            "model": self.model_name,
+            "requestsPerMinute": MODEL_RPM,
+            "tokensPerMinute": MODEL_TPM,
+            "requestsAvailable": round(max(0.0, self.requests.level), 1),
+            "tokensAvailable": round(max(0.0, self.tokens.level)),
+            "maxInflight": MODEL_CONCURRENCY,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "pausedForSeconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            "circuit": self.breaker.state,
+            "consecutiveFailures": self.breaker.failures,
+        }
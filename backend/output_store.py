@@ -0,0 +1,351 @@
+# output_store.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = os.getenv("OUTPUT_DIR", "outputs")
+OUTPUT_INDEX_PATH = os.getenv("OUTPUT_INDEX_PATH", "outputs.db")
+OUTPUT_TTL_SECONDS = int(os.getenv("OUTPUT_TTL_SECONDS", str(7 * 24 * 3600)))
+OUTPUT_MAX_BYTES = int(os.getenv("OUTPUT_MAX_BYTES", str(1024 * 1024 * 1024)))
+OUTPUT_SWEEP_INTERVAL = float(os.getenv("OUTPUT_SWEEP_INTERVAL", "300"))
+
+# Download names are plain file names: no separators, no leading dot
+_NAME_RE = re.compile(r"^[\w\-. ()]{1,255}$")
+
+def valid_output_name(name: str) -> bool:
+    return bool(_NAME_RE.match(name)) and not name.startswith(".")
+
+_UNSAFE_NAME_CHARS_RE = re.compile(r"[^\w\-. ()]")
+# Longest part of the upload file name kept in output names
+OUTPUT_STEM_MAX_CHARS = 100
+
+def output_name(prefix: str, filename: str, extension: str) -> str:
+    """
+    Download name for an upload: prefix_stem_anonymized.ext, with characters
+    not allowed in output names replaced by "_" and the stem shortened
+    """
+    stem = os.path.splitext(os.path.basename(filename or ""))[0]
+    stem = _UNSAFE_NAME_CHARS_RE.sub("_", stem)[:OUTPUT_STEM_MAX_CHARS].strip(" .") or "resume"
+    return f"{prefix}_{stem}_anonymized{extension}"
+
+class StoredOutput:
+    """
+    A download name and the content-addressed blob holding its bytes
+    """
+    __slots__ = ("name", "digest", "path", "size", "created_at", "last_accessed")
+
+    def __init__(self, name: str, digest: str, path: str, size: int, created_at: float, last_accessed: float):
+        self.name = name
+        self.digest = digest
+        self.path = path
+        self.size = size
+        self.created_at = created_at
+        self.last_accessed = last_accessed
+
+class OutputStore:
+    """
+    Generated files keyed by download name, with the bytes stored once per
+    distinct content hash under root/blobs. The SQLite index is mirrored in
+    memory, so lookups rarely touch the database: only names written by
+    another process sharing the index (the standalone job worker, other API
+    workers) are read from it, then cached. Access times are recorded in
+    memory and written back by sweep(), which works from the database and
+    drops outputs past their TTL and the least recently used ones over the
+    size cap.
+    """
+
+    def __init__(self, root: str, index_path: str, ttl_seconds: int, max_bytes: int):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(index_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " digest TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            " name TEXT PRIMARY KEY,"
+            " digest TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_accessed REAL NOT NULL)"
+        )
+        # Source file and parsed fields per output, for bundle manifests
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " name TEXT PRIMARY KEY,"
+            " original_name TEXT,"
+            " parsed TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " batch_id TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " original_name TEXT,"
+            " name TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (batch_id, position))"
+        )
+        self._conn.commit()
+
+        self._blob_sizes = dict(self._conn.execute("SELECT digest, size FROM blobs"))
+        self._outputs = {}
+        for name, digest, created_at, last_accessed in self._conn.execute("SELECT * FROM outputs"):
+            self._outputs[name] = self._entry(name, digest, created_at, last_accessed)
+        self._touched = set()
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _entry(self, name: str, digest: str, created_at: float, last_accessed: float) -> StoredOutput:
+        return StoredOutput(name, digest, self.blob_path(digest), self._blob_sizes.get(digest, 0), created_at, last_accessed)
+
+    def put(self, name: str, content: bytes, original_name: str = None, parsed: dict = None) -> StoredOutput:
+        """
+        Store content under name, writing the blob only if no output has the
+        same bytes yet. original_name and parsed are kept for bundle manifests.
+        """
+        if not valid_output_name(name):
+            raise ValueError(f"Invalid output name: {name}")
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest)
+        with self._lock:
+            stored = digest in self._blob_sizes
+        if not stored:
+            self._write_blob(path, content)
+
+        now = time.time()
+        with self._lock:
+            # Holding the database write lock, so a sweep in another process cannot remove the blob in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if not os.path.exists(path):
+                    # A sweep removed the blob since it was found above
+                    self._write_blob(path, content)
+                self._conn.execute("INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(content)))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO outputs (name, digest, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                    (name, digest, now, now),
+                )
+                if original_name is not None or parsed is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO details (name, original_name, parsed) VALUES (?, ?, ?)",
+                        (name, original_name, json.dumps(parsed) if parsed is not None else None),
+                    )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._blob_sizes[digest] = len(content)
+            entry = self._outputs[name] = self._entry(name, digest, now, now)
+        return entry
+
+    def _write_blob(self, path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def get(self, name: str):
+        """
+        Look up an output by download name, or return None
+        """
+        with self._lock:
+            entry = self._outputs.get(name)
+            if entry is None:
+                entry = self._load(name)
+            if entry is not None:
+                entry.last_accessed = time.time()
+                self._touched.add(name)
+        return entry
+
+    def _load(self, name: str):
+        # An output another process stored after this one read the index
+        row = self._conn.execute(
+            "SELECT o.digest, o.created_at, o.last_accessed, b.size FROM outputs o"
+            " LEFT JOIN blobs b ON b.digest = o.digest WHERE o.name = ?",
+            (name,),
+        ).fetchone()
+        if row is None:
+            return None
+        digest, created_at, last_accessed, size = row
+        self._blob_sizes[digest] = size or 0
+        entry = self._outputs[name] = self._entry(name, digest, created_at, last_accessed)
+        return entry
+
+    def discard(self, name: str) -> None:
+        """
+        Forget an output whose blob went missing on disk
+        """
+        with self._lock:
+            entry = self._outputs.pop(name, None)
+            if entry is not None:
+                # Only the row pointing at the missing blob; another process may have stored the name again
+                self._conn.execute("DELETE FROM outputs WHERE name = ? AND digest = ?", (name, entry.digest))
+                self._conn.commit()
+
+    def sweep(self) -> dict:
+        """
+        Persist access times, expire outputs past the TTL, evict least recently
+        used outputs while the blobs exceed max_bytes, and delete orphaned
+        blobs. Works from the database, so outputs stored by other processes
+        count too, and reloads the in-memory index from it.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = self._sweep(now)
+            except BaseException:
+                self._conn.rollback()
+                raise
+        if result["expired"] or result["evicted"]:
+            logger.info(f"Output sweep: {result['expired']} expired, {result['evicted']} evicted, "
+                        f"{result['blobsRemoved']} files removed")
+        return result
+
+    def _sweep(self, now: float) -> dict:
+        # Runs under the lock and the database write lock, so no put() here or elsewhere interleaves
+        self._conn.executemany(
+            "UPDATE outputs SET last_accessed = MAX(last_accessed, ?) WHERE name = ?",
+            [(self._outputs[name].last_accessed, name) for name in self._touched if name in self._outputs],
+        )
+        self._touched.clear()
+        self._blob_sizes = dict(self._conn.execute("SELECT digest, size FROM blobs"))
+        self._outputs = {
+            name: self._entry(name, digest, created_at, last_accessed)
+            for name, digest, created_at, last_accessed in self._conn.execute("SELECT * FROM outputs")
+        }
+
+        expired = [name for name, entry in self._outputs.items() if now - entry.created_at > self.ttl_seconds]
+        for name in expired:
+            del self._outputs[name]
+
+        references = {}
+        for entry in self._outputs.values():
+            references[entry.digest] = references.get(entry.digest, 0) + 1
+        total = sum(self._blob_sizes.get(digest, 0) for digest in references)
+        evicted = []
+        if total > self.max_bytes:
+            for entry in sorted(self._outputs.values(), key=lambda e: e.last_accessed):
+                if total <= self.max_bytes:
+                    break
+                del self._outputs[entry.name]
+                evicted.append(entry.name)
+                references[entry.digest] -= 1
+                if not references[entry.digest]:
+                    total -= self._blob_sizes.get(entry.digest, 0)
+
+        orphans = [digest for digest in self._blob_sizes if not references.get(digest)]
+        for digest in orphans:
+            del self._blob_sizes[digest]
+        removed = [(name,) for name in expired + evicted]
+        self._conn.executemany("DELETE FROM outputs WHERE name = ?", removed)
+        self._conn.executemany("DELETE FROM details WHERE name = ?", removed)
+        self._conn.executemany("DELETE FROM blobs WHERE digest = ?", [(digest,) for digest in orphans])
+        self._conn.execute("DELETE FROM batches WHERE created_at < ?", (now - self.ttl_seconds,))
+        # Files go before the commit, while other processes' put() still waits on the write lock
+        for digest in orphans:
+            try:
+                os.remove(self.blob_path(digest))
+            except FileNotFoundError:
+                pass
+        self._conn.commit()
+        return {"expired": len(expired), "evicted": len(evicted), "blobsRemoved": len(orphans)}
+
+    def details(self, names: list) -> dict:
+        """
+        Original file name and parsed fields per output name, where recorded
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT name, original_name, parsed FROM details WHERE name IN ({','.join('?' * len(names))})",
+                names,
+            ).fetchall()
+        return {name: {"originalName": original_name, "parsed": json.loads(parsed) if parsed else None}
+                for name, original_name, parsed in rows}
+
+    def add_batch(self, batch_id: str, items: list) -> None:
+        """
+        Record a batch as a list of dicts with originalName and either the
+        output name or the error, in upload order
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO batches (batch_id, position, original_name, name, error, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(batch_id, position, item["originalName"], item.get("name"), item.get("error"), now)
+                 for position, item in enumerate(items)],
+            )
+            self._conn.commit()
+
+    def get_batch(self, batch_id: str):
+        """
+        The items recorded by add_batch, or None for an unknown batch
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT original_name, name, error FROM batches WHERE batch_id = ? ORDER BY position", (batch_id,)
+            ).fetchall()
+        if not rows:
+            return None
+        return [{"originalName": original_name, "name": name, "error": error} for original_name, name, error in rows]
+
+    def import_legacy(self) -> int:
+        """
+        Move files written straight into root by older versions into the store
+        """
+        imported = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isfile(path) or not name.endswith(".docx") or not valid_output_name(name):
+                continue
+            with open(path, "rb") as f:
+                self.put(name, f.read())
+            os.remove(path)
+            imported += 1
+        if imported:
+            logger.info(f"Imported {imported} existing output file(s) into the output store")
+        return imported
+
+    def stats(self) -> dict:
+        with self._lock:
+            # From the database, which also holds other processes' outputs
+            outputs = self._conn.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]
+            files, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            return {
+                "outputs": outputs,
+                "files": files,
+                "bytes": size,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl_seconds,
+            }
+
+async def sweep_periodically(store: OutputStore, interval: float = OUTPUT_SWEEP_INTERVAL) -> None:
+    """
+    Background sweeper task; runs the blocking sweep off the event loop
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(store.sweep)
+        except Exception as e:
+            logger.error(f"Output sweep failed: {str(e)}")
+
+output_store = OutputStore(OUTPUT_DIR, OUTPUT_INDEX_PATH, OUTPUT_TTL_SECONDS, OUTPUT_MAX_BYTES)
@@ -0,0 +1,143 @@
+# pdf_extract.py
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pdf_writer import PdfDocument, FONTS, encode_text
+
+logger = logging.getLogger(__name__)
+
+# "pdfplumber" (default) or "pdfium", a faster text-only backend without layout
+# analysis. pdfplumber is always kept as the fallback.
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber").lower()
+# Pages beyond this limit are not extracted
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+# Documents with at least this many pages are split across the process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn, since the parent runs threads and an event loop that must not be forked
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PDF_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    return source.read()
+
+def _open_source(source):
+    """
+    The source as the PDF libraries take it: a path or rewound seekable file
+    object as is, so uploads are read in place, and bytes wrapped in a stream
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    return source
+
+def _extract_pages_pdfplumber(source, start: int, stop: int) -> list:
+    # Imported on first use: pdfplumber and pdfminer add a noticeable share of startup time
+    import pdfplumber
+
+    with pdfplumber.open(_open_source(source), pages=list(range(start + 1, stop + 1))) as pdf:
+        # extract_text() is the expensive call, so it runs exactly once per page
+        return [page.extract_text() or "" for page in pdf.pages]
+
+def _extract_pages_pdfium(source, start: int, stop: int) -> list:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(_open_source(source))
+    try:
+        texts = []
+        for index in range(start, stop):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+def _extract_pages(source, start: int, stop: int, backend: str) -> list:
+    """
+    Extract the text of pages [start, stop) of a path, file object or bytes.
+    Top-level so it can run in the process pool, which is sent bytes.
+    """
+    if backend == "pdfium":
+        try:
+            return _extract_pages_pdfium(source, start, stop)
+        except Exception as e:
+            logger.warning(f"pdfium extraction failed, falling back to pdfplumber: {str(e)}")
+    return _extract_pages_pdfplumber(source, start, stop)
+
+def _page_count(source, backend: str) -> int:
+    if backend == "pdfium":
+        try:
+            import pypdfium2
+
+            pdf = pypdfium2.PdfDocument(_open_source(source))
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        except Exception:
+            pass
+    import pdfplumber
+
+    with pdfplumber.open(_open_source(source)) as pdf:
+        return len(pdf.pages)
+
+def extract_pdf_text(source, backend: str = PDF_BACKEND, max_pages: int = PDF_MAX_PAGES) -> str:
+    """
+    Extract text from a PDF path or binary file object, stopping after
+    max_pages. Short documents are read in place; long ones are extracted in
+    page ranges across a process pool, which is the only case that copies the
+    whole file into memory.
+    """
+    page_count = min(_page_count(source, backend), max_pages)
+
+    if page_count < PDF_PARALLEL_MIN_PAGES or PDF_PROCESS_WORKERS <= 1:
+        pages = _extract_pages(source, 0, page_count, backend)
+    else:
+        data = _read_bytes(source)
+        chunk_size = -(-page_count // PDF_PROCESS_WORKERS)  # ceiling division
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        pool = _get_process_pool()
+        futures = [pool.submit(_extract_pages, data, start, stop, backend) for start, stop in ranges]
+        pages = [text for future in futures for text in future.result()]
+
+    # Form feeds keep page boundaries for prompt compaction; they still split lines
+    return "\f".join(text for text in pages if text)
+
+def warm_up() -> None:
+    """
+    Import the extraction backend and run it once on a one-line PDF, so the
+    first upload does not pay for imports and pdfminer's lazily built tables
+    """
+    pdf = PdfDocument()
+    pdf.new_page()
+    pdf.text(72, 720, [(FONTS["regular"], 11, encode_text("Warm-up"))])
+    extract_pdf_text(io.BytesIO(pdf.to_bytes()))
+
+def shutdown() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+            _process_pool = None
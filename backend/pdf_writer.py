@@ -0,0 +1,235 @@
+# pdf_writer.py
+import struct
+import zlib
+
+# Advance widths (1/1000 em) of the standard Helvetica faces for codes 32-126;
+# the oblique face shares the regular widths. Codes above 126 are WinAnsi.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# Punctuation common in resumes: quotes, bullet, en and em dash (regular, bold)
+_WINANSI_WIDTHS = {0x91: (222, 278), 0x92: (222, 278), 0x93: (333, 500), 0x94: (333, 500),
+                   0x95: (350, 350), 0x96: (556, 556), 0x97: (1000, 1000)}
+
+def _width_table(ascii_widths: tuple, bold: bool) -> list:
+    table = [556] * 256
+    table[32:127] = ascii_widths
+    for code, widths in _WINANSI_WIDTHS.items():
+        table[code] = widths[bold]
+    return table
+
+class Font:
+    __slots__ = ("key", "base_font", "widths")
+
+    def __init__(self, key: str, base_font: str, widths: list):
+        self.key = key
+        self.base_font = base_font
+        self.widths = widths
+
+    def width(self, encoded: bytes, size: float) -> float:
+        widths = self.widths
+        return sum(widths[b] for b in encoded) * size / 1000
+
+FONTS = {
+    "regular": Font("F1", "Helvetica", _width_table(_HELVETICA_WIDTHS, False)),
+    "bold": Font("F2", "Helvetica-Bold", _width_table(_HELVETICA_BOLD_WIDTHS, True)),
+    "italic": Font("F3", "Helvetica-Oblique", _width_table(_HELVETICA_WIDTHS, False)),
+}
+
+def encode_text(text: str) -> bytes:
+    """
+    Encode text for the WinAnsi-encoded standard fonts; characters outside
+    the code page become '?'
+    """
+    return text.encode("cp1252", "replace")
+
+def _escape(encoded: bytes) -> bytes:
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r")
+
+class PdfImage:
+    """
+    An RGB image with an optional alpha channel, ready to embed as an XObject.
+    Both are stored deflated, so a cached image is only compressed once.
+    """
+    __slots__ = ("width", "height", "rgb", "alpha")
+
+    def __init__(self, width: int, height: int, rgb: bytes, alpha: bytes = None):
+        self.width = width
+        self.height = height
+        self.rgb = rgb
+        self.alpha = alpha
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+def _interleave(pixels: bytearray, channels: int, keep: int) -> bytes:
+    """
+    The first keep channels of every pixel, e.g. RGB out of RGBA
+    """
+    out = bytearray(len(pixels) // channels * keep)
+    for c in range(keep):
+        out[c::keep] = pixels[c::channels]
+    return bytes(out)
+
+def load_png(path: str):
+    """
+    Decode an 8-bit, non-interlaced grey, RGB or RGBA PNG into a PdfImage,
+    or return None for anything else
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    pos, idat = 8, []
+    width = height = bit_depth = color_type = interlace = None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        if kind == b"IHDR":
+            width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if bit_depth != 8 or interlace or channels is None:
+        return None
+
+    raw = zlib.decompress(b"".join(idat))
+    stride = width * channels
+    pixels = bytearray(height * stride)
+    previous = bytearray(stride)
+    for y in range(height):
+        filter_type = raw[y * (stride + 1)]
+        line = bytearray(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)])
+        if filter_type == 1:
+            for i in range(channels, stride):
+                line[i] = (line[i] + line[i - channels]) & 0xFF
+        elif filter_type == 2:
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, previous))
+        elif filter_type == 3:
+            for i in range(stride):
+                left = line[i - channels] if i >= channels else 0
+                line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                left = line[i - channels] if i >= channels else 0
+                upper_left = previous[i - channels] if i >= channels else 0
+                line[i] = (line[i] + _paeth(left, previous[i], upper_left)) & 0xFF
+        pixels[y * stride:(y + 1) * stride] = line
+        previous = line
+
+    if channels >= 3:
+        rgb = _interleave(pixels, channels, 3)
+    else:
+        rgb = bytearray(width * height * 3)
+        rgb[0::3] = rgb[1::3] = rgb[2::3] = pixels[0::channels]
+    alpha = pixels[channels - 1::channels] if channels in (2, 4) else None
+    return PdfImage(width, height, zlib.compress(rgb, 9), zlib.compress(alpha, 9) if alpha is not None else None)
+
+class PdfDocument:
+    """
+    Minimal PDF writer: pages of text in the standard Helvetica faces, lines
+    and images. Content streams are deflated and no timestamps or ids are
+    written, so the same input always gives the same bytes.
+    """
+
+    def __init__(self, page_width: float = 612, page_height: float = 792):
+        self.page_width = page_width
+        self.page_height = page_height
+        self.pages = []
+        self.images = []
+        self._ops = None
+
+    def new_page(self) -> None:
+        self._ops = []
+        self.pages.append(self._ops)
+
+    def add_image(self, image: PdfImage) -> str:
+        self.images.append(image)
+        return f"Im{len(self.images)}"
+
+    def text(self, x: float, y: float, runs: list) -> None:
+        """
+        Draw (font, size, encoded) runs one after another from x, y (baseline)
+        """
+        ops = [f"BT {x:.2f} {y:.2f} Td".encode()]
+        for font, size, encoded in runs:
+            ops.append(f" /{font.key} {size:g} Tf (".encode() + _escape(encoded) + b") Tj")
+        ops.append(b" ET")
+        self._ops.append(b"".join(ops))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.75) -> None:
+        self._ops.append(f"{width:g} w {x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S".encode())
+
+    def image(self, name: str, x: float, y: float, width: float, height: float) -> None:
+        self._ops.append(f"q {width:.2f} 0 0 {height:.2f} {x:.2f} {y:.2f} cm /{name} Do Q".encode())
+
+    def to_bytes(self) -> bytes:
+        objects = [None, None]  # catalog and page tree, filled in below
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        def stream(dictionary: str, data: bytes, compressed: bool = False) -> int:
+            if not compressed:
+                data = zlib.compress(data, 6)
+            return add(f"<< {dictionary} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream")
+
+        font_refs = {
+            font.key: add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{font.base_font} /Encoding /WinAnsiEncoding >>".encode())
+            for font in FONTS.values()
+        }
+        image_refs = {}
+        for index, image in enumerate(self.images, 1):
+            smask = ""
+            if image.alpha is not None:
+                alpha_ref = stream(f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height}"
+                                   " /ColorSpace /DeviceGray /BitsPerComponent 8", image.alpha, True)
+                smask = f" /SMask {alpha_ref} 0 R"
+            image_refs[f"Im{index}"] = stream(f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height}"
+                                              f" /ColorSpace /DeviceRGB /BitsPerComponent 8{smask}", image.rgb, True)
+
+        fonts = " ".join(f"/{key} {ref} 0 R" for key, ref in font_refs.items())
+        xobjects = " ".join(f"/{key} {ref} 0 R" for key, ref in image_refs.items())
+        resources = f"<< /Font << {fonts} >>" + (f" /XObject << {xobjects} >>" if xobjects else "") + " >>"
+        page_refs = []
+        for ops in self.pages:
+            content_ref = stream("", b"\n".join(ops))
+            page_refs.append(add(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.page_width:g} {self.page_height:g}]"
+                f" /Resources {resources} /Contents {content_ref} 0 R >>".encode()
+            ))
+        objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+        kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+        objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode()
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+        out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+        out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        return bytes(out)
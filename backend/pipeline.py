@@ -0,0 +1,302 @@
+# pipeline.py
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pdf_extract
+from anonymizer import (
+    parse_resume_to_json_gemini_async,
+    parse_resumes_batch_gemini_async,
+    estimate_tokens,
+    MODEL_NAME,
+    PROMPT_VERSION,
+    model_client,
+)
+from cache import result_cache, make_key, RESULT_CACHE_ENABLED
+from docx_extract import extract_docx_text
+from renderers import RENDERERS, renderer_for_name, render_resume
+from heuristic_parser import parse_resume_heuristic
+from metrics import stage_timer, extracted_chars, warmup_seconds
+from output_store import output_store, StoredOutput
+from redactor import redact_text, find_leaks, scrub_leaks, summarize_redactions, REDACTION_ENABLED
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Concurrency limits per pipeline stage
+# (model calls are paced and capped by model_client)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "4"))
+FORMAT_WORKERS = int(os.getenv("FORMAT_WORKERS", "4"))
+
+# Parser routing: "llm" always calls the model, "local" only uses the heuristic
+# parser, "auto" uses the local parse when its confidence reaches the threshold
+# and otherwise calls the model, falling back to the local parse if the model fails
+PARSER_ENGINE = os.getenv("PARSER_ENGINE", "llm").lower()
+LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_CONFIDENCE_THRESHOLD", "0.85"))
+
+# Packing of short resumes into shared model requests on the batch path
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", "12000"))
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "8"))
+
+# Bounded worker pools for the blocking stages, so they never run on the event loop
+extract_executor = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix="extract")
+format_executor = ThreadPoolExecutor(max_workers=FORMAT_WORKERS, thread_name_prefix="format")
+
+# Model calls currently running per cache key, so concurrent uploads of the
+# same resume share one call instead of all missing the cache at once
+_inflight_parses = {}
+# On-demand renders running per output name, shared the same way
+_inflight_renders = {}
+
+async def extract_text(source, file_extension: str) -> str:
+    """
+    Extract text from a PDF or DOCX on the extraction pool. The source is a
+    file path or a seekable binary file object, such as a spooled upload.
+    """
+    extractor = pdf_extract.extract_pdf_text if file_extension == ".pdf" else extract_docx_text
+    loop = asyncio.get_running_loop()
+    with stage_timer("extract"):
+        text = await loop.run_in_executor(extract_executor, extractor, source)
+    extracted_chars.observe(len(text))
+    return text
+
+def redact(text: str) -> tuple:
+    """
+    Strip contact details locally before the text reaches the model.
+    Returns (redacted_text, redaction_map).
+    """
+    if not REDACTION_ENABLED:
+        return text, {}
+    with stage_timer("redact"):
+        redacted, redaction_map = redact_text(text)
+    if redaction_map:
+        logger.info(f"Redacted before AI processing: {summarize_redactions(redaction_map)}")
+    return redacted, redaction_map
+
+def verify_redactions(parsed_data: dict, redaction_map: dict) -> dict:
+    """
+    Check the model output against the redaction map and scrub any removed
+    value that still made it into the output
+    """
+    leaks = find_leaks(parsed_data, redaction_map)
+    if not leaks:
+        return parsed_data
+    logger.warning(f"Model output contained {len(leaks)} redacted value(s); scrubbing them")
+    return scrub_leaks(parsed_data, leaks)
+
+async def parse_resume(text: str, bypass_cache: bool = False, engine: str = PARSER_ENGINE, on_section=None) -> dict:
+    """
+    Parse resume text with the engine chosen by the router (see PARSER_ENGINE).
+    on_section(key, value) is called for each section of a streamed model response.
+    """
+    if engine == "llm":
+        return await _parse_with_model(text, bypass_cache, on_section)
+
+    local_data, confidence = await _parse_locally(text)
+    if engine == "local" or confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+        logger.info(f"Using local parse (confidence {confidence:.2f})")
+        return local_data
+
+    logger.info(f"Local parse confidence {confidence:.2f} below {LOCAL_CONFIDENCE_THRESHOLD}, calling the AI model")
+    try:
+        return await _parse_with_model(text, bypass_cache, on_section)
+    except Exception as e:
+        logger.warning(f"AI model processing failed, falling back to local parse: {str(e)}")
+        return local_data
+
+async def _parse_locally(text: str) -> tuple:
+    loop = asyncio.get_running_loop()
+    with stage_timer("local_parse"):
+        return await loop.run_in_executor(extract_executor, parse_resume_heuristic, text)
+
+async def _parse_with_model(text: str, bypass_cache: bool = False, on_section=None) -> dict:
+    """
+    Parse resume text with the model, paced by the shared model client. Identical
+    text is served from the result cache without calling the model.
+    """
+    use_cache = RESULT_CACHE_ENABLED and not bypass_cache
+    if use_cache:
+        cache_key = make_key(text, PROMPT_VERSION, MODEL_NAME)
+        cached = await asyncio.to_thread(result_cache.get, cache_key)
+        if cached is not None:
+            return cached
+        if cache_key in _inflight_parses:
+            return await asyncio.shield(_inflight_parses[cache_key])
+
+        task = asyncio.ensure_future(parse_resume_to_json_gemini_async(text, on_section))
+        _inflight_parses[cache_key] = task
+        try:
+            parsed_data = await asyncio.shield(task)
+        finally:
+            _inflight_parses.pop(cache_key, None)
+        await asyncio.to_thread(result_cache.put, cache_key, parsed_data)
+        return parsed_data
+
+    return await parse_resume_to_json_gemini_async(text, on_section)
+
+def pack_batches(texts: list, token_budget: int = BATCH_TOKEN_BUDGET, max_resumes: int = BATCH_MAX_RESUMES) -> list:
+    """
+    Greedily group text indexes so each group's estimated prompt tokens stay
+    within token_budget. A resume over the budget on its own gets its own group.
+    """
+    groups = []
+    current, current_tokens = [], 0
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_resumes):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+async def _call_model_batch(texts: list) -> list:
+    """
+    Parse a packed group with one model request. If the combined response
+    cannot be split cleanly, fall back to one request per resume. Any other
+    failure (model unavailable, a rejected request) is given to every resume
+    in the group, leaving the other groups of the batch unaffected.
+    """
+    if len(texts) == 1:
+        return await asyncio.gather(parse_resume_to_json_gemini_async(texts[0]), return_exceptions=True)
+    try:
+        return await parse_resumes_batch_gemini_async(texts)
+    except ValueError:
+        return await asyncio.gather(*(parse_resume_to_json_gemini_async(text) for text in texts), return_exceptions=True)
+    except Exception as e:
+        return [e] * len(texts)
+
+async def parse_resumes_batch(texts: list, bypass_cache: bool = False, engine: str = PARSER_ENGINE) -> list:
+    """
+    Parse many resume texts, routing each like parse_resume. Returns one entry
+    per text, in order: the parsed dict or the exception raised for it.
+    """
+    if engine == "llm":
+        return await _parse_batch_with_model(texts, bypass_cache)
+
+    local_results = await asyncio.gather(*(_parse_locally(text) for text in texts))
+    results = [None] * len(texts)
+    remaining = []
+    for index, (local_data, confidence) in enumerate(local_results):
+        if engine == "local" or confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+            results[index] = local_data
+        else:
+            remaining.append(index)
+
+    logger.info(f"Local parse accepted for {len(texts) - len(remaining)} of {len(texts)} resumes in batch")
+    parsed = await _parse_batch_with_model([texts[i] for i in remaining], bypass_cache)
+    for index, parsed_data in zip(remaining, parsed):
+        if isinstance(parsed_data, BaseException):
+            logger.warning(f"AI model processing failed, falling back to local parse: {str(parsed_data)}")
+            parsed_data = local_results[index][0]
+        results[index] = parsed_data
+    return results
+
+async def _parse_batch_with_model(texts: list, bypass_cache: bool = False) -> list:
+    """
+    Parse many resume texts, packing cache misses into shared model requests.
+    Returns one entry per text, in order: the parsed dict or the exception raised for it.
+    """
+    use_cache = RESULT_CACHE_ENABLED and not bypass_cache
+    keys = [make_key(text, PROMPT_VERSION, MODEL_NAME) for text in texts]
+    results = {}
+
+    if use_cache:
+        for key in set(keys):
+            cached = await asyncio.to_thread(result_cache.get, key)
+            if cached is not None:
+                results[key] = cached
+
+    # Identical resumes inside the batch are only sent once
+    missing_keys = list(dict.fromkeys(key for key in keys if key not in results))
+    missing_texts = [texts[keys.index(key)] for key in missing_keys]
+    groups = pack_batches(missing_texts)
+    group_results = await asyncio.gather(
+        *(_call_model_batch([missing_texts[i] for i in group]) for group in groups)
+    )
+
+    for group, parsed_list in zip(groups, group_results):
+        for i, parsed_data in zip(group, parsed_list):
+            results[missing_keys[i]] = parsed_data
+            if use_cache and not isinstance(parsed_data, BaseException):
+                await asyncio.to_thread(result_cache.put, missing_keys[i], parsed_data)
+
+    return [results[key] for key in keys]
+
+def _render_and_store(parsed_data: dict, output_name: str, original_name: str) -> StoredOutput:
+    renderer = renderer_for_name(output_name)
+    if renderer is None:
+        raise ValueError(f"No renderer for output {output_name}")
+    content = render_resume(parsed_data, renderer.output_format)
+    return output_store.put(output_name, content, original_name, parsed_data)
+
+async def format_resume(parsed_data: dict, output_name: str, original_name: str = None) -> StoredOutput:
+    """
+    Render the anonymized resume on the formatting pool, in the format given
+    by output_name's extension, and keep it in the output store under
+    output_name with the parsed fields for manifests and other formats
+    """
+    loop = asyncio.get_running_loop()
+    with stage_timer("format"):
+        return await loop.run_in_executor(format_executor, _render_and_store, parsed_data, output_name, original_name)
+
+async def render_on_demand(output_name: str):
+    """
+    Render output_name from the parse recorded with another format of the same
+    resume, e.g. the PDF of a resume so far only rendered as DOCX. Returns the
+    stored output, or None when no such parse is recorded.
+    """
+    renderer = renderer_for_name(output_name)
+    if renderer is None:
+        return None
+    if output_name in _inflight_renders:
+        return await asyncio.shield(_inflight_renders[output_name])
+
+    stem = os.path.splitext(output_name)[0]
+    siblings = [stem + other.extension for other in RENDERERS.values() if other is not renderer]
+    details = await asyncio.to_thread(output_store.details, siblings)
+    detail = next((details[name] for name in siblings if details.get(name, {}).get("parsed") is not None), None)
+    if detail is None:
+        return None
+
+    logger.info(f"Rendering {output_name} on demand")
+    task = asyncio.ensure_future(format_resume(detail["parsed"], output_name, detail["originalName"]))
+    _inflight_renders[output_name] = task
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _inflight_renders.pop(output_name, None)
+
+def warm_up() -> dict:
+    """
+    Load each stage's heavy dependencies and one-time state ahead of the first
+    request: the model client, the PDF extractor, the DOCX template engine and
+    the logos. Returns seconds per step; a step that fails is logged and left
+    to happen on first use.
+    """
+    steps = {"pdf_extract": pdf_extract.warm_up}
+    if PARSER_ENGINE != "local":
+        steps["model_client"] = model_client.warm_up
+    for output_format, renderer in RENDERERS.items():
+        steps[f"render_{output_format}"] = renderer.warm_up
+
+    timings = {}
+    for step, warm in steps.items():
+        start = time.perf_counter()
+        try:
+            warm()
+        except Exception as e:
+            logger.warning(f"Warm-up step {step} failed: {str(e)}")
+        timings[step] = time.perf_counter() - start
+        warmup_seconds.observe(timings[step], step=step)
+    return timings
+
+def shutdown() -> None:
+    """
+    Stop the worker pools, letting queued work finish
+    """
+    extract_executor.shutdown(wait=True)
+    format_executor.shutdown(wait=True)
+    pdf_extract.shutdown()
@@ -0,0 +1,152 @@
+# prompt_compaction.py
+import math
+import os
+import re
+from collections import Counter
+from heuristic_parser import SECTION_HEADINGS
+
+PROMPT_COMPACTION = os.getenv("PROMPT_COMPACTION", "true").lower() == "true"
+# Estimated tokens of resume text allowed into a prompt; the tail beyond it is cut
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+# A line at the top or bottom of at least this share of pages is a running header or footer
+FURNITURE_PAGE_SHARE = 0.5
+FURNITURE_EDGE_LINES = 2
+# Lines dropped at most after a low-value heading, in case the next heading is not recognised
+LOW_VALUE_MAX_LINES = 12
+# A line repeating the previous one (text the PDF draws twice) is dropped when at
+# least this long; short repeats such as dates are kept
+DUPLICATE_MIN_CHARS = 30
+
+# Sections never carried into the parsed output, dropped along with their lines
+LOW_VALUE_HEADINGS = {
+    "references", "referees", "references available upon request", "hobbies", "interests",
+    "hobbies and interests", "personal interests", "personal details", "personal information",
+    "personal particulars", "declaration",
+}
+_KEPT_HEADINGS = {heading for headings in SECTION_HEADINGS.values() for heading in headings}
+
+_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u3000]+")
+_CID_RE = re.compile(r"\(cid:\d+\)")
+_LEADER_RE = re.compile(r"([.\-_=~*·])\1{3,}")
+_JUNK_LINE_RE = re.compile(r"^[\W_]*$")
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?[-–(]?\s*\d{1,3}\s*[-–)]?(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (about four characters per token for English text)
+    """
+    return len(text) // 4 + 1
+
+def _heading_key(line: str):
+    key = line.strip(" :").lower()
+    return key if len(key) <= 40 else None
+
+def _clean_line(line: str) -> str:
+    line = _CID_RE.sub("", line)
+    line = _LEADER_RE.sub(" ", line)
+    return _SPACE_RE.sub(" ", line).strip()
+
+def _mask(line: str) -> str:
+    # Page counters vary between pages; other numbers have to repeat exactly
+    line = line.lower()
+    return _DIGITS_RE.sub("#", line) if "page" in line else line
+
+def _edges(lines: list) -> dict:
+    """
+    Index of each of the first and last non-empty lines of a page -> "top" or "bottom"
+    """
+    content = [i for i, line in enumerate(lines) if line]
+    edges = {i: "bottom" for i in content[-FURNITURE_EDGE_LINES:]}
+    edges.update((i, "top") for i in content[:FURNITURE_EDGE_LINES])
+    return edges
+
+def _furniture(pages: list) -> set:
+    """
+    (edge, masked line) pairs found at the same edge of enough pages to be
+    running headers or footers; "Name - Page 2" matches "Name - Page 3"
+    """
+    if len(pages) < 2:
+        return set()
+    seen = Counter()
+    for lines in pages:
+        seen.update({(edge, _mask(lines[i])) for i, edge in _edges(lines).items()})
+    needed = max(2, math.ceil(len(pages) * FURNITURE_PAGE_SHARE))
+    return {key for key, count in seen.items() if count >= needed}
+
+def compact_resume_text(text: str, token_budget: int = PROMPT_TOKEN_BUDGET) -> tuple:
+    """
+    Shrink extracted resume text before it goes into a prompt: collapse
+    whitespace, drop pdfplumber table junk, page numbers, running headers and
+    footers (pages are separated by form feeds), longer lines repeated back
+    to back and sections that never reach the output, then cut the tail to
+    token_budget.
+    Returns (compacted_text, stats) with token estimates before and after.
+    """
+    pages = [[_clean_line(line) for line in page.splitlines()] for page in text.split("\f")]
+    furniture = _furniture(pages)
+    removed = Counter()
+    kept, seen_furniture = [], set()
+    previous = None  # last kept non-empty line
+    skipping = 0  # lines left to drop in a low-value section
+    for lines in pages:
+        edges = _edges(lines)
+        for i, line in enumerate(lines):
+            if not line:
+                if kept and kept[-1]:
+                    kept.append("")
+                continue
+            if _JUNK_LINE_RE.match(line):
+                removed["junk"] += 1
+                continue
+            if i in edges and len(pages) > 1 and _PAGE_NUMBER_RE.match(line):
+                removed["page_number"] += 1
+                continue
+            key = (edges.get(i), _mask(line))
+            if key in furniture:
+                # The first occurrence may be real content, e.g. the name heading page one
+                if key in seen_furniture:
+                    removed["furniture"] += 1
+                    continue
+                seen_furniture.add(key)
+
+            heading = _heading_key(line)
+            if heading in LOW_VALUE_HEADINGS:
+                skipping = LOW_VALUE_MAX_LINES + 1
+            elif heading in _KEPT_HEADINGS or line.isupper():
+                skipping = 0
+            if skipping:
+                skipping -= 1
+                removed["low_value"] += 1
+                continue
+
+            # Only back-to-back repeats: the same bullet under two jobs is real content
+            if len(line) >= DUPLICATE_MIN_CHARS and line == previous:
+                removed["duplicate"] += 1
+                continue
+            kept.append(line)
+            previous = line
+
+    while kept and not kept[-1]:
+        kept.pop()
+    compacted = "\n".join(kept)
+
+    if estimate_tokens(compacted) > token_budget:
+        # Keep whole lines up to the budget; the tail of a long resume carries the least
+        budget_chars = token_budget * 4
+        total, cut = 0, len(kept)
+        for index, line in enumerate(kept):
+            total += len(line) + 1
+            if total > budget_chars:
+                cut = index
+                break
+        removed["truncated"] += len(kept) - cut
+        compacted = "\n".join(kept[:cut] + [f"[{len(kept) - cut} further lines omitted]"])
+
+    stats = {
+        "tokensBefore": estimate_tokens(text),
+        "tokensAfter": estimate_tokens(compacted),
+        "linesRemoved": dict(removed),
+    }
+    return compacted, stats
@@ -0,0 +1,109 @@
+# redactor.py
+import os
+import re
+from collections import Counter
+
+REDACTION_ENABLED = os.getenv("REDACTION_ENABLED", "true").lower() == "true"
+# Also mask people named next to labels such as "Reference:" or "Supervisor:"
+REDACT_ENTITIES = os.getenv("REDACT_ENTITIES", "false").lower() == "true"
+
+# One alternation with named groups, so the text is scanned in a single pass.
+# Order matters: earlier alternatives win where patterns overlap (an email
+# contains something URL-like, a URL can contain digit runs).
+_PATTERNS = {
+    "EMAIL": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "URL": r"(?:https?://|www\.)[^\s<>()\"']+"
+           r"|\b(?:linkedin\.com|github\.com|gitlab\.com|twitter\.com|x\.com|facebook\.com|instagram\.com)/[^\s<>()\"']*",
+    # A number right after a phone label, kept apart so the label stays in the text
+    "LABELLED_PHONE": r"(?i:\b(?:phone|telephone|tel|mobile|mob|cell|hp|whatsapp)\b)\.?(?:\s*(?:no\.?|number|#))?\s*[:.]?[ \t]*"
+                      r"(?!(?:19|20)\d{2}\s*[-–]\s*(?:19|20)\d{2}\b)(?=(?:\D{0,3}\d){7})"
+                      r"(?P<LABELLED_NUMBER>\+?\(?\d[\d ().-]{5,}\d)",
+    # Unlabelled numbers need a phone context: a leading + or bracketed area
+    # code, or at least 9 digits in groups split by spaces, dots or dashes.
+    # Shorter groups ("ISO 9001 2015", "SKU 123-4567"), plain digit runs
+    # (amounts, IDs) and dotted numbers such as IP addresses are left alone.
+    "PHONE": r"(?<![\w.+-])(?:"
+             r"\+\d{1,3}[ .-]?(?:\(\d{1,4}\)[ .-]?)?\d{2,4}(?:[ .-]?\d{2,4}){1,3}"
+             r"|\(\d{2,4}\)[ .-]?\d{3,4}[ .-]?\d{3,4}"
+             r"|(?!(?:19|20)\d{2}[ ]*[-– ][ ]*(?:19|20)\d{2}\b)(?=(?:\d[ .-]?){9})\d{2,4}[ .-]\d{3,4}[ .-]\d{3,4}"
+             r")(?![\w-]|\.\d)",
+    # A street number starting a line or following punctuation, not a word ("Ran 5 Marathons Way")
+    "ADDRESS": r"(?<![A-Za-z][ \t])\b\d{1,5}\s+(?:[A-Z][a-z]+\s+){1,4}"
+               r"(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Way|Place|Pl|Terrace|Crescent)\b\.?"
+               r"(?:,?\s+(?:Apt|Suite|Unit|#)\s*\w+)?"
+               r"|\b(?:Blk|Block)\s+\d{1,4}[A-Z]?\b|#\d{1,3}-\d{1,4}\b",
+    "POSTCODE": r"\b(?:Singapore\s+\d{6}|[A-Z]{1,2}\d[A-Z\d]?\s+\d[A-Z]{2}|[A-Z]{2}\s+\d{5}(?:-\d{4})?)\b",
+    "ENTITY": r"(?:(?<=Reference: )|(?<=Referee: )|(?<=Supervisor: )|(?<=Contact: )|(?<=Manager: ))"
+              r"(?:(?:Dr|Mr|Mrs|Ms|Prof)\.?\s+)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,2}",
+}
+
+def _compile(include_entities: bool):
+    names = [name for name in _PATTERNS if include_entities or name != "ENTITY"]
+    return re.compile("|".join(f"(?P<{name}>{_PATTERNS[name]})" for name in names))
+
+_REDACTION_RE = _compile(REDACT_ENTITIES)
+
+def redact_text(text: str, pattern=None) -> tuple:
+    """
+    Replace emails, phone numbers, URLs and postal addresses (and optionally
+    named references) with [CATEGORY] placeholders in a single pass.
+
+    Returns (redacted_text, redaction_map) where redaction_map maps each
+    category to the list of values removed.
+    """
+    pattern = pattern or _REDACTION_RE
+    removed = {}
+
+    def replace(match):
+        category = match.lastgroup
+        if category == "LABELLED_PHONE":
+            number = match.group("LABELLED_NUMBER")
+            removed.setdefault("PHONE", []).append(number)
+            return match.group()[:match.start("LABELLED_NUMBER") - match.start()] + "[PHONE]"
+        removed.setdefault(category, []).append(match.group())
+        return f"[{category}]"
+
+    return pattern.sub(replace, text), removed
+
+def summarize_redactions(redaction_map: dict) -> dict:
+    """
+    Count removed values per category, without the values themselves, for logs and responses
+    """
+    return dict(Counter({category: len(values) for category, values in redaction_map.items()}))
+
+def find_leaks(parsed_data, redaction_map: dict) -> list:
+    """
+    Return the redacted values that still appear anywhere in the model output
+    """
+    values = {value.strip() for found in redaction_map.values() for value in found if len(value.strip()) >= 4}
+    if not values:
+        return []
+
+    leaks = []
+
+    def walk(node):
+        if isinstance(node, str):
+            leaks.extend(value for value in values if value in node)
+        elif isinstance(node, dict):
+            for item in node.values():
+                walk(item)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(parsed_data)
+    return sorted(set(leaks))
+
+def scrub_leaks(parsed_data, leaks: list):
+    """
+    Remove leaked values from every string in the model output
+    """
+    if isinstance(parsed_data, str):
+        for value in leaks:
+            parsed_data = parsed_data.replace(value, "")
+        return parsed_data
+    if isinstance(parsed_data, dict):
+        return {key: scrub_leaks(item, leaks) for key, item in parsed_data.items()}
+    if isinstance(parsed_data, list):
+        return [scrub_leaks(item, leaks) for item in parsed_data]
+    return parsed_data
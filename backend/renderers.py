@@ -0,0 +1,276 @@
+# renderers.py
+import base64
+import html
+import os
+import re
+import threading
+from layout import Layout, build_layout
+from pdf_writer import PdfDocument, FONTS, encode_text, load_png
+
+# The logo formatter.py puts in DOCX headers; resolved here so that importing
+# the renderers does not load python-docx, which only the DOCX renderer needs
+LOGO_PATH = os.path.join(os.path.dirname(__file__), "templates", "company_logo.png")
+
+class Renderer:
+    """
+    Turns a Layout into the bytes of one output format
+    """
+    output_format = None
+    extension = None
+    media_type = None
+    # Served for display in the browser rather than as an attachment
+    inline = False
+
+    def render(self, layout: Layout) -> bytes:
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """
+        Load whatever the first render would otherwise load
+        """
+
+def _template_engine():
+    from formatter import get_template_engine
+
+    return get_template_engine()
+
+class DocxRenderer(Renderer):
+    output_format = "docx"
+    extension = ".docx"
+    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    def render(self, layout: Layout) -> bytes:
+        return _template_engine().render_layout(layout)
+
+    def warm_up(self) -> None:
+        _template_engine()
+
+# Font style and size of each run per block kind, mirroring the DOCX fragments
+_PDF_RUNS = {
+    "heading": (("bold", 16),),
+    "text": (("regular", 11),),
+    "entry_title": (("bold", 12),),
+    "entry_title_dates": (("bold", 12), ("regular", 11)),
+    "role": (("italic", 11), ("regular", 11)),
+    "bullet": (("regular", 11),),
+    "labeled": (("bold", 11), ("regular", 11)),
+}
+_PDF_MARGIN = 72
+_PDF_LEADING = 1.2
+_PDF_PARAGRAPH_SPACE = 3
+_PDF_BULLET_INDENT = 18
+_PDF_LOGO_WIDTH = 72
+_WORD_RE = re.compile(r"\s*\S+\s*|\s+")
+
+class PdfRenderer(Renderer):
+    """
+    Letter-size PDF in the standard Helvetica faces, laid out like the DOCX:
+    name and logo header, ruled section headings, wrapped text and bullets
+    """
+    output_format = "pdf"
+    extension = ".pdf"
+    media_type = "application/pdf"
+
+    def __init__(self):
+        self._logo = None
+        self._logo_loaded = False
+        self._lock = threading.Lock()
+
+    def _load_logo(self):
+        with self._lock:
+            if not self._logo_loaded:
+                self._logo = load_png(LOGO_PATH) if os.path.exists(LOGO_PATH) else None
+                self._logo_loaded = True
+        return self._logo
+
+    def warm_up(self) -> None:
+        self._load_logo()
+
+    def render(self, layout: Layout) -> bytes:
+        pdf = PdfDocument()
+        pdf.new_page()
+        top = pdf.page_height - _PDF_MARGIN
+        width = pdf.page_width - 2 * _PDF_MARGIN
+        y = top
+
+        def ensure_room(height):
+            nonlocal y
+            if y - height < _PDF_MARGIN:
+                pdf.new_page()
+                y = top
+
+        def draw(runs, x, max_width):
+            nonlocal y
+            for line in self._wrap(runs, max_width):
+                size = max(run[1] for run in line)
+                height = size * _PDF_LEADING
+                ensure_room(height)
+                pdf.text(x, y - size, line)
+                y -= height
+
+        # Header: name on the left, logo on the right, vertically centred
+        logo = self._load_logo()
+        logo_height = _PDF_LOGO_WIDTH * logo.height / logo.width if logo else 0
+        name_lines = self._wrap([(FONTS["bold"], 20, layout.name)], width - _PDF_LOGO_WIDTH - 12)
+        name_height = len(name_lines) * 20 * _PDF_LEADING
+        header_height = max(name_height, logo_height)
+        if logo:
+            pdf.image(pdf.add_image(logo), _PDF_MARGIN + width - _PDF_LOGO_WIDTH, top - (header_height + logo_height) / 2,
+                      _PDF_LOGO_WIDTH, logo_height)
+        y = top - (header_height - name_height) / 2
+        for line in name_lines:
+            pdf.text(_PDF_MARGIN, y - 20, line)
+            y -= 20 * _PDF_LEADING
+        y = top - header_height - 2 * 11 * _PDF_LEADING
+
+        for kind, texts in layout.blocks:
+            if kind == "blank":
+                y -= 11 * _PDF_LEADING
+            elif kind == "border":
+                ensure_room(15)
+                pdf.line(_PDF_MARGIN, y - 3, _PDF_MARGIN + width, y - 3)
+                y -= 15
+            elif kind == "bullet":
+                runs = [(FONTS["regular"], 11, texts[0])]
+                ensure_room(11 * _PDF_LEADING)
+                pdf.text(_PDF_MARGIN + _PDF_BULLET_INDENT / 2, y - 11, [(FONTS["regular"], 11, encode_text("•"))])
+                draw(runs, _PDF_MARGIN + _PDF_BULLET_INDENT, width - _PDF_BULLET_INDENT)
+                y -= _PDF_PARAGRAPH_SPACE
+            else:
+                runs = [(FONTS[style], size, text) for (style, size), text in zip(_PDF_RUNS[kind], texts)]
+                draw(runs, _PDF_MARGIN, width)
+                if kind != "heading":
+                    y -= _PDF_PARAGRAPH_SPACE
+        return pdf.to_bytes()
+
+    @staticmethod
+    def _wrap(runs: list, max_width: float) -> list:
+        """
+        Break (font, size, text) runs into lines of (font, size, encoded) runs
+        no wider than max_width, splitting at spaces and inside overlong words
+        """
+        lines, line, line_width = [], [], 0.0
+
+        def append(font, size, piece):
+            if line and line[-1][0] is font and line[-1][1] == size:
+                line[-1] = (font, size, line[-1][2] + piece)
+            else:
+                line.append((font, size, piece))
+
+        for font, size, text in runs:
+            for word in _WORD_RE.findall(text):
+                piece = encode_text(word)
+                if not line:
+                    piece = piece.lstrip()
+                piece_width = font.width(piece.rstrip(), size)
+                if line and line_width + piece_width > max_width:
+                    lines.append(line)
+                    line, line_width = [], 0.0
+                    piece = piece.lstrip()
+                    piece_width = font.width(piece.rstrip(), size)
+                while piece_width > max_width and len(piece) > 1:
+                    # A word wider than the line: break it at the last byte that fits
+                    cut = len(piece) - 1
+                    while cut > 1 and font.width(piece[:cut], size) > max_width:
+                        cut -= 1
+                    lines.append([(font, size, piece[:cut])])
+                    piece = piece[cut:]
+                    piece_width = font.width(piece.rstrip(), size)
+                if piece:
+                    append(font, size, piece)
+                    line_width += font.width(piece, size)
+        if line:
+            lines.append(line)
+        return lines or [[(runs[0][0], runs[0][1], b"")]]
+
+_HTML_STYLE = (
+    "body{font-family:Helvetica,Arial,sans-serif;font-size:11pt;max-width:8.5in;margin:0 auto;padding:1in;color:#000}"
+    "header{display:flex;justify-content:space-between;align-items:center;margin-bottom:2em}"
+    "header h1{font-size:20pt;margin:0}header img{width:1in}"
+    "h2{font-size:16pt;margin:0 0 12pt;border-bottom:1px solid #000}"
+    "h3{font-size:12pt;margin:0}h3 span{font-size:11pt;font-weight:normal}"
+    "p,ul{margin:0 0 3pt}.gap{height:1em}"
+)
+
+class HtmlRenderer(Renderer):
+    """
+    Self-contained HTML preview, cheap enough to render on every request
+    """
+    output_format = "html"
+    extension = ".html"
+    media_type = "text/html; charset=utf-8"
+    inline = True
+
+    def __init__(self):
+        self._logo_tag = None
+
+    def _logo(self) -> str:
+        if self._logo_tag is None:
+            tag = ""
+            if os.path.exists(LOGO_PATH):
+                with open(LOGO_PATH, "rb") as f:
+                    tag = f'<img src="data:image/png;base64,{base64.b64encode(f.read()).decode("ascii")}" alt="">'
+            self._logo_tag = tag
+        return self._logo_tag
+
+    def warm_up(self) -> None:
+        self._logo()
+
+    def render(self, layout: Layout) -> bytes:
+        escape = html.escape
+        name = escape(layout.name)
+        parts = [
+            f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{name}</title>'
+            f"<style>{_HTML_STYLE}</style></head><body><header><h1>{name}</h1>{self._logo()}</header>"
+        ]
+        in_list = False
+        for kind, texts in layout.blocks:
+            if kind == "bullet":
+                if not in_list:
+                    parts.append("<ul>")
+                    in_list = True
+                parts.append(f"<li>{escape(texts[0])}</li>")
+                continue
+            if in_list:
+                parts.append("</ul>")
+                in_list = False
+            if kind == "heading":
+                parts.append(f"<h2>{escape(texts[0])}</h2>")
+            elif kind == "text":
+                parts.append(f"<p>{escape(texts[0])}</p>")
+            elif kind == "blank":
+                parts.append('<div class="gap"></div>')
+            elif kind == "entry_title":
+                parts.append(f"<h3>{escape(texts[0])}</h3>")
+            elif kind == "entry_title_dates":
+                parts.append(f"<h3>{escape(texts[0])}<span>{escape(texts[1])}</span></h3>")
+            elif kind == "role":
+                parts.append(f"<p><em>{escape(texts[0])}</em>{escape(texts[1])}</p>")
+            elif kind == "labeled":
+                parts.append(f"<p><strong>{escape(texts[0])}</strong>{escape(texts[1])}</p>")
+        if in_list:
+            parts.append("</ul>")
+        parts.append("</body></html>")
+        return "".join(parts).encode("utf-8")
+
+RENDERERS = {renderer.output_format: renderer for renderer in (DocxRenderer(), PdfRenderer(), HtmlRenderer())}
+OUTPUT_FORMATS = tuple(RENDERERS)
+DEFAULT_OUTPUT_FORMAT = "docx"
+
+def get_renderer(output_format: str) -> Renderer:
+    if output_format not in RENDERERS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return RENDERERS[output_format]
+
+def renderer_for_name(name: str):
+    """
+    The renderer producing files with name's extension, or None
+    """
+    extension = os.path.splitext(name)[1].lower()
+    return next((renderer for renderer in RENDERERS.values() if renderer.extension == extension), None)
+
+def render_resume(data: dict, output_format: str = DEFAULT_OUTPUT_FORMAT) -> bytes:
+    """
+    Render parsed resume data in the given output format
+    """
+    return get_renderer(output_format).render(build_layout(data))
@@ -0,0 +1,205 @@
+# resume_schema.py
+import re
+from functools import lru_cache
+
+# Field shapes: "text" is one string, "lines" a list of non-empty lines split
+# on newlines, "items" a list of entries split on commas and newlines
+_ITEM_SPLIT_RE = re.compile(r"[,\n;]")
+_KEY_RE = re.compile(r"[\s\-]+")
+_PATH_RE = re.compile(r"^(\w+)(?:\[(\d+)\]\.(\w+))?$")
+
+@lru_cache(maxsize=1024)
+def _key(name) -> str:
+    return _KEY_RE.sub("_", str(name).strip().lower())
+
+def to_text(value) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(text for text in map(to_text, value) if text)
+    if isinstance(value, dict):
+        return " ".join(text for text in map(to_text, value.values()) if text)
+    return str(value)
+
+def to_lines(value) -> list:
+    if isinstance(value, str):
+        lines = value.split("\n")
+    elif isinstance(value, (list, tuple)):
+        lines = [to_text(line) for line in value]
+    else:
+        lines = [to_text(value)]
+    return [line.strip() for line in lines if line.strip()]
+
+def to_items(value) -> list:
+    if isinstance(value, str):
+        return [item.strip() for item in _ITEM_SPLIT_RE.split(value) if item.strip()]
+    return to_lines(value)
+
+_COERCE = {"text": to_text, "lines": to_lines, "items": to_items}
+
+class _Record:
+    """
+    Base of the typed resume records. Subclasses list their fields with a
+    shape each, the alternative key names models use for them, and the
+    fields that have to be present in model output.
+    """
+    __slots__ = ()
+    FIELDS = {}
+    ALIASES = {}
+    REQUIRED = ()
+    _KEYS = {}
+
+    def __init_subclass__(cls):
+        # Field name for each accepted key, so well-formed keys take one dict lookup
+        cls._KEYS = {**{name: name for name in cls.FIELDS}, **cls.ALIASES}
+
+    @classmethod
+    def from_dict(cls, data: dict, path: str, missing: list):
+        """
+        Coerce a parsed dict, appending the path of each required field that
+        is absent (not merely empty) to missing
+        """
+        keys = cls._KEYS
+        values = {}
+        for key, value in data.items():
+            name = keys.get(key) or keys.get(_key(key))
+            if name is not None and value is not None and name not in values:
+                values[name] = value
+        for name in cls.REQUIRED:
+            if name not in values:
+                missing.append(f"{path}.{name}")
+        record = cls.__new__(cls)
+        for name, shape in cls.FIELDS.items():
+            setattr(record, name, _COERCE[shape](values.get(name)))
+        return record
+
+    def set_field(self, name: str, value) -> bool:
+        shape = self.FIELDS.get(name)
+        if shape is None:
+            return False
+        setattr(self, name, _COERCE[shape](value))
+        return True
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+class Experience(_Record):
+    __slots__ = ("job_title", "company", "dates", "description")
+    FIELDS = {"job_title": "text", "company": "text", "dates": "text", "description": "lines"}
+    ALIASES = {"title": "job_title", "role": "job_title", "position": "job_title", "employer": "company",
+               "organization": "company", "organisation": "company", "date": "dates", "duration": "dates",
+               "responsibilities": "description", "highlights": "description"}
+    REQUIRED = ("job_title", "company", "dates")
+
+class Education(_Record):
+    __slots__ = ("degree", "school", "dates", "description")
+    FIELDS = {"degree": "text", "school": "text", "dates": "text", "description": "text"}
+    ALIASES = {"qualification": "degree", "institution": "school", "university": "school", "college": "school",
+               "date": "dates", "duration": "dates", "details": "description"}
+    REQUIRED = ("degree", "school", "dates")
+
+class Project(_Record):
+    __slots__ = ("title", "description", "technologies", "dates")
+    FIELDS = {"title": "text", "description": "lines", "technologies": "items", "dates": "text"}
+    ALIASES = {"name": "title", "project": "title", "tech": "technologies", "tech_stack": "technologies",
+               "tools": "technologies", "date": "dates"}
+    REQUIRED = ("title",)
+
+# Top-level key, record type of its entries (None for plain fields) and shape
+_SECTIONS = {
+    "Name": (None, "text"),
+    "Summary": (None, "text"),
+    "Skills": (None, "items"),
+    "Experience": (Experience, None),
+    "Education": (Education, None),
+    "Projects": (Project, None),
+    "Achievements": (None, "lines"),
+}
+_SECTION_KEYS = {**{name: name for name in _SECTIONS}, **{_key(name): name for name in _SECTIONS}}
+_SECTION_KEYS.update({"work_experience": "Experience", "professional_summary": "Summary", "project": "Projects"})
+REQUIRED_SECTIONS = ("Name",)
+
+class Resume:
+    """
+    Parsed resume with every field in one shape: strings for single values,
+    lists of strings for skills, descriptions and achievements, and typed
+    records for experience, education and project entries
+    """
+    __slots__ = ("name", "summary", "skills", "experience", "education", "projects", "achievements")
+
+    def __init__(self, name: str = "", summary: str = "", skills: list = None, experience: list = None,
+                 education: list = None, projects: list = None, achievements: list = None):
+        self.name = name
+        self.summary = summary
+        self.skills = skills or []
+        self.experience = experience or []
+        self.education = education or []
+        self.projects = projects or []
+        self.achievements = achievements or []
+
+    def _section(self, key: str):
+        return getattr(self, key.lower())
+
+    def to_dict(self) -> dict:
+        """
+        The model's JSON layout, as stored in the caches and manifests
+        """
+        return {
+            key: [entry.to_dict() for entry in self._section(key)] if record else self._section(key)
+            for key, (record, _) in _SECTIONS.items()
+        }
+
+    def set_path(self, path: str, value) -> bool:
+        """
+        Set a field by the path reported as missing, e.g. "Experience[1].company"
+        """
+        match = _PATH_RE.match(path)
+        if not match or match.group(1) not in _SECTIONS:
+            return False
+        key, index, name = match.groups()
+        record, shape = _SECTIONS[key]
+        if index is None:
+            if record is not None:
+                return False
+            setattr(self, key.lower(), _COERCE[shape](value))
+            return True
+        entries = self._section(key) if record is not None else []
+        if int(index) >= len(entries):
+            return False
+        return entries[int(index)].set_field(name, value)
+
+def normalize_resume(data) -> tuple:
+    """
+    Coerce parsed resume JSON into a Resume in one pass. Returns
+    (resume, missing) where missing lists the paths of required fields the
+    data did not contain, e.g. ["Name", "Experience[0].company"].
+    """
+    if isinstance(data, Resume):
+        return data, []
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object for the resume, got {type(data).__name__}")
+
+    values, missing = {}, []
+    for key, value in data.items():
+        section = _SECTION_KEYS.get(key) or _SECTION_KEYS.get(_key(key))
+        if section is not None and value is not None:
+            values.setdefault(section, value)
+    missing.extend(key for key in REQUIRED_SECTIONS if key not in values)
+
+    resume = Resume()
+    for key, (record, shape) in _SECTIONS.items():
+        value = values.get(key)
+        if record is None:
+            setattr(resume, key.lower(), _COERCE[shape](value))
+            continue
+        if isinstance(value, dict):
+            value = [value]
+        elif not isinstance(value, (list, tuple)):
+            value = []
+        setattr(resume, key.lower(), [
+            record.from_dict(entry, f"{key}[{index}]", missing)
+            for index, entry in enumerate(entry for entry in value if isinstance(entry, dict))
+        ])
+    return resume, missing
@@ -0,0 +1,71 @@
+# tests/conftest.py
+"""
+Shared test setup. The queue, caches, output store and log file that the
+modules open at import go to a temporary directory instead of the backend
+directory, and the api fixture serves the app against a fake Gemini model.
+"""
+import atexit
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+STATE_DIR = tempfile.mkdtemp(prefix="resume-anonymizer-tests-")
+atexit.register(shutil.rmtree, STATE_DIR, True)
+os.environ.update(
+    JOB_DB_PATH=os.path.join(STATE_DIR, "jobs.db"),
+    JOB_WORKERS="0",
+    RESULT_CACHE_PATH=os.path.join(STATE_DIR, "cache.db"),
+    OUTPUT_DIR=os.path.join(STATE_DIR, "outputs"),
+    OUTPUT_INDEX_PATH=os.path.join(STATE_DIR, "outputs.db"),
+    LOG_FILE="",
+    LOG_CONSOLE="false",
+    WARMUP_ON_START="false",
+)
+
+@pytest.fixture(scope="session")
+def fake_gemini():
+    import anonymizer
+    from fake_gemini import FakeGeminiFactory
+
+    fake = FakeGeminiFactory(latency=0, jitter=0)
+    original = anonymizer.model_client._factory
+    anonymizer.set_model_factory(fake)
+    yield fake
+    anonymizer.model_client.set_factory(original)
+
+@pytest.fixture(scope="session")
+def api(fake_gemini):
+    """
+    Test client for the app. Session-wide, since leaving the app's lifespan
+    shuts the pipeline's worker pools down.
+    """
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+def resume_docx(lines: list = None) -> bytes:
+    """
+    A small DOCX resume, as uploaded
+    """
+    from corpus import write_docx
+
+    lines = lines or ["Jane Doe", "Experience", "Engineer, Acme", "2019 - 2023", "Education", "BSc Computing"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.docx")
+        write_docx(path, lines)
+        with open(path, "rb") as f:
+            return f.read()
+
+def upload(name: str, content: bytes = None) -> tuple:
+    return (name, io.BytesIO(resume_docx() if content is None else content),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
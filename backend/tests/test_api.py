@@ -0,0 +1,80 @@
+# tests/test_api.py
+import json
+
+from conftest import resume_docx, upload
+
+def test_batch_returns_a_result_per_file_in_order(api):
+    response = api.post("/anonymize-batch", files=[
+        ("files", upload("first.docx")),
+        ("files", upload("notes.txt", b"plain text")),
+        ("files", upload("second.docx", resume_docx(["John Roe", "Skills", "Go, Rust"]))),
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    results = body["results"]
+    assert [result["originalName"] for result in results] == ["first.docx", "notes.txt", "second.docx"]
+    assert "Unsupported file type" in results[1]["error"]
+    for result in (results[0], results[2]):
+        assert "error" not in result
+        assert api.get(result["downloadUrl"].removeprefix("http://localhost:8000")).status_code == 200
+    assert body["batchId"]
+
+def test_batch_packs_resumes_into_one_model_request(api, fake_gemini):
+    calls = fake_gemini.calls
+    contents = [resume_docx([f"Candidate {n}", "Experience", f"Role {n}, Company {n}", "2020 - 2022"]) for n in range(3)]
+    response = api.post("/anonymize-batch", params={"bypass_cache": "true"},
+                        files=[("files", upload(f"resume_{n}.docx", content)) for n, content in enumerate(contents)])
+    assert all("error" not in result for result in response.json()["results"])
+    assert fake_gemini.calls - calls == 1
+
+def test_single_upload_is_extracted_in_place(api):
+    from corpus import make_pdf
+
+    response = api.post("/anonymize-single", files={"file": ("cv.pdf", make_pdf([["Jane Doe", "Experience", "Engineer"]]), "application/pdf")})
+    assert response.status_code == 200
+    assert response.json()["fileName"].endswith("_cv_anonymized.docx")
+
+def test_oversized_file_is_refused(api, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 1000)
+    response = api.post("/anonymize-single", files={"file": upload("big.docx")})
+    assert response.status_code == 413
+
+def test_oversized_request_is_refused_before_reading_the_body(api, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 0)
+    monkeypatch.setattr(main, "MULTIPART_OVERHEAD_BYTES", 100)
+    response = api.post("/anonymize-single", content=b"x" * 1000, headers={"content-type": "multipart/form-data; boundary=x"})
+    assert response.status_code == 413
+    assert "maximum upload size" in response.json()["detail"]
+
+def test_unsupported_file_type_is_rejected(api):
+    response = api.post("/anonymize-single", files={"file": upload("resume.txt", b"plain text")})
+    assert response.status_code == 400
+
+def read_events(response) -> list:
+    events = []
+    for block in response.text.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_stream_reports_each_stage_then_the_download(api):
+    response = api.post("/anonymize-stream", params={"bypass_cache": "true"}, files={"file": upload("streamed.docx")})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+    names = [name for name, _ in events]
+    assert names[:4] == ["received", "extracted", "redacted", "model_started"]
+    assert "section" in names and "preview" in names
+    assert names.index("model_finished") < names.index("formatted") < names.index("ready") == len(names) - 1
+    assert events[-1][1]["fileName"].endswith("_streamed_anonymized.docx")
+
+def test_stream_reports_rejected_files_as_an_error_event(api):
+    response = api.post("/anonymize-stream", files={"file": upload("notes.txt", b"plain text")})
+    assert response.status_code == 200
+    name, data = read_events(response)[-1]
+    assert (name, data["status"]) == ("error", 400)
+    assert "Unsupported file type" in data["detail"]
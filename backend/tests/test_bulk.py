@@ -0,0 +1,67 @@
+# tests/test_bulk.py
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import bulk
+import pipeline
+from anonymizer import model_client, set_model_factory
+from cache import ResultCache
+from corpus import generate_corpus
+from fake_gemini import FakeGeminiFactory
+
+@pytest.fixture
+def fake_model(tmp_path, monkeypatch):
+    fake = FakeGeminiFactory(latency=0, jitter=0)
+    original = model_client._factory
+    set_model_factory(fake)
+    cache = ResultCache(str(tmp_path / "cache.db"), 3600, 100)
+    monkeypatch.setattr(pipeline, "result_cache", cache)
+    monkeypatch.setattr(bulk, "result_cache", cache)
+    yield fake
+    model_client.set_factory(original)
+
+def read_records(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_bulk_parses_through_the_pipeline_router(tmp_path, fake_model, monkeypatch):
+    routed = []
+    parse_resume = pipeline.parse_resume
+
+    async def spy(text, **kwargs):
+        routed.append(text)
+        return await parse_resume(text, **kwargs)
+
+    monkeypatch.setattr(pipeline, "parse_resume", spy)
+    input_dir = tmp_path / "in"
+    paths = generate_corpus(str(input_dir), 3)
+    shutil.copy(paths[1], input_dir / "copy_of_resume_0001.docx")
+
+    report = bulk.main([str(input_dir), str(tmp_path / "out"), "--workers", "1"])
+    assert report["succeeded"] == 4 and report["failed"] == 0
+    assert len(routed) == 4
+    # The copy shares the in-flight call or the cached parse of the original
+    assert fake_model.calls == 3
+    records = read_records(tmp_path / "out" / bulk.RESULTS_FILE)
+    parsed = {record["source"]: record["parsed"] for record in records}
+    assert parsed["copy_of_resume_0001.docx"] == parsed["resume_0001.docx"]
+
+    report = bulk.main([str(input_dir), str(tmp_path / "again"), "--workers", "1"])
+    assert report["cacheHits"] == 4
+    assert fake_model.calls == 3
+
+def test_checkpoint_skips_finished_resumes(tmp_path, fake_model):
+    input_dir = tmp_path / "in"
+    generate_corpus(str(input_dir), 2)
+    bulk.main([str(input_dir), str(tmp_path / "out"), "--workers", "1", "--bypass-cache"])
+    report = bulk.main([str(input_dir), str(tmp_path / "out"), "--workers", "1", "--bypass-cache"])
+    assert report["skipped"] == 2 and report["succeeded"] == 0
+    assert fake_model.calls == 2
@@ -0,0 +1,62 @@
+# tests/test_bundle.py
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bundle
+from bundle import archive_name, build_manifest, stream_bundle
+from conftest import upload
+
+def test_archive_names_are_readable_and_unique():
+    taken = set()
+    assert archive_name("cv.pdf", "1_cv_anonymized.docx", taken) == "cv_anonymized.docx"
+    assert archive_name("uploads/cv.docx", "2_cv_anonymized.docx", taken) == "cv_anonymized (2).docx"
+    assert archive_name(None, "3_x_anonymized.pdf", taken) == "3_x_anonymized.pdf"
+
+def test_bundle_is_streamed_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(bundle, "BUNDLE_CHUNK_SIZE", 1024)
+    members = []
+    for n in range(3):
+        path = tmp_path / f"{n}.docx"
+        path.write_bytes(os.urandom(5000))
+        members.append((f"resume_{n}.docx", str(path)))
+    chunks = list(stream_bundle(members, ("manifest.json", b"[]")))
+    assert len(chunks) > len(members)
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["resume_0.docx", "resume_1.docx", "resume_2.docx", "manifest.json"]
+        assert archive.read("resume_1.docx") == (tmp_path / "1.docx").read_bytes()
+        assert archive.getinfo("resume_0.docx").compress_type == zipfile.ZIP_STORED
+
+def test_csv_manifest_flattens_parsed_fields():
+    items = [{"originalName": "cv.pdf", "file": "cv_anonymized.docx", "error": None,
+              "parsed": {"Name": "Candidate", "Skills": ["Python", "SQL"]}}]
+    name, data = build_manifest(items, "csv")
+    assert name == "manifest.csv"
+    row = next(csv.DictReader(io.StringIO(data.decode("utf-8-sig"))))
+    assert (row["originalName"], row["Name"]) == ("cv.pdf", "Candidate")
+    assert "Python" in row["Skills"] and "SQL" in row["Skills"]
+
+def test_batch_bundle_has_every_file_and_a_manifest(api):
+    results = api.post("/anonymize-batch", files=[
+        ("files", upload("cv.docx")),
+        ("files", upload("cv.docx")),
+        ("files", upload("notes.txt", b"plain text")),
+    ]).json()
+    response = api.get("/download-bundle", params={"batch_id": results["batchId"], "manifest": "json"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.namelist() == ["cv_anonymized.docx", "cv_anonymized (2).docx", "manifest.json"]
+        manifest = json.loads(archive.read("manifest.json"))
+    assert [item["file"] for item in manifest] == ["cv_anonymized.docx", "cv_anonymized (2).docx", None]
+    assert "Unsupported file type" in manifest[2]["error"]
+
+def test_bundle_errors(api):
+    assert api.get("/download-bundle").status_code == 400
+    assert api.get("/download-bundle", params={"batch_id": "missing"}).status_code == 404
+    assert api.get("/download-bundle", params={"name": "../etc/passwd"}).status_code == 400
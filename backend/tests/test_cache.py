@@ -0,0 +1,72 @@
+# tests/test_cache.py
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+from cache import ResultCache, make_key
+
+def make_cache(tmp_path, ttl_seconds=3600, max_entries=100) -> ResultCache:
+    return ResultCache(str(tmp_path / "cache.db"), ttl_seconds, max_entries)
+
+def test_keys_ignore_whitespace_but_not_prompt_or_model():
+    key = make_key("Jane Doe\r\nEngineer  ", "1", "model")
+    assert key == make_key("Jane Doe\nEngineer", "1", "model")
+    assert key != make_key("Jane Doe\nEngineer", "2", "model")
+    assert key != make_key("Jane Doe\nEngineer", "1", "other-model")
+
+def test_get_returns_what_was_put(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("key", {"Name": "Jane"})
+    assert cache.get("key") == {"Name": "Jane"}
+    assert cache.get("other") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=0)
+    cache.put("key", {"Name": "Jane"})
+    time.sleep(0.01)
+    assert cache.get("key") is None
+    assert not cache.contains("key")
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", {"n": 1})
+    time.sleep(0.01)
+    cache.put("b", {"n": 2})
+    time.sleep(0.01)
+    cache.get("a")
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.evictions == 1
+
+def test_contains_does_not_count_a_lookup(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("key", {})
+    assert cache.contains("key")
+    assert (cache.hits, cache.misses) == (0, 0)
+
+def test_concurrent_parses_of_the_same_text_share_one_model_call(tmp_path, monkeypatch):
+    calls = []
+
+    async def parse(text, on_section=None):
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        return {"Name": "Jane"}
+
+    monkeypatch.setattr(pipeline, "result_cache", make_cache(tmp_path))
+    monkeypatch.setattr(pipeline, "parse_resume_to_json_gemini_async", parse)
+
+    async def run():
+        first = await asyncio.gather(*(pipeline.parse_resume("Jane Doe resume", engine="llm") for _ in range(3)))
+        again = await pipeline.parse_resume("Jane  Doe\nresume", engine="llm")
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert first == [{"Name": "Jane"}] * 3
+    assert again == {"Name": "Jane"}
+    assert len(calls) == 1
@@ -0,0 +1,45 @@
+# tests/test_docx_extract.py
+import os
+import random
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from bench_docx_extract import check_parity, python_docx_text, write_templated_docx
+from corpus import resume_lines, write_docx
+from docx_extract import extract_docx_text
+
+def test_plain_resume_matches_python_docx(tmp_path):
+    path = str(tmp_path / "plain.docx")
+    write_docx(path, resume_lines(random.Random(1), jobs=4))
+    assert extract_docx_text(path) == python_docx_text(path)
+    assert check_parity(path, []) == []
+
+@pytest.mark.parametrize("seed", range(3))
+def test_templated_resume_keeps_headers_tables_and_text_boxes(tmp_path, seed):
+    # Header and footer lines, table cells and a text box written both as
+    # mc:Choice and mc:Fallback, each expected exactly once
+    path = str(tmp_path / "templated.docx")
+    expected = write_templated_docx(path, random.Random(seed))
+    assert check_parity(path, expected) == []
+
+def test_long_resume_matches_python_docx(tmp_path):
+    path = str(tmp_path / "long.docx")
+    write_docx(path, resume_lines(random.Random(2), jobs=200))
+    assert extract_docx_text(path) == python_docx_text(path)
+
+def test_file_objects_are_read_like_paths(tmp_path):
+    path = str(tmp_path / "templated.docx")
+    write_templated_docx(path, random.Random(3))
+    with open(path, "rb") as f:
+        assert extract_docx_text(f) == extract_docx_text(path)
+
+def test_not_a_docx_raises_value_error(tmp_path):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"not a zip file")
+    with pytest.raises(ValueError):
+        extract_docx_text(str(path))
@@ -0,0 +1,51 @@
+# tests/test_fake_gemini.py
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from google.api_core.exceptions import ResourceExhausted
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from bench_e2e import percentile, stage_means
+from fake_gemini import CANNED_RESUME, FakeGeminiFactory
+from json_stream import repair_json
+
+def test_batch_prompts_get_one_resume_per_text():
+    model = FakeGeminiFactory(latency=0, jitter=0)("fake")
+    response = model.generate_content(["system", "Given these 3 resume texts, ..."])
+    assert repair_json(response.text) == [CANNED_RESUME] * 3
+    assert repair_json(model.generate_content("one resume").text) == CANNED_RESUME
+
+def test_streamed_response_reassembles_to_the_canned_resume():
+    model = FakeGeminiFactory(latency=0, jitter=0)("fake")
+
+    async def run():
+        response = await model.generate_content_async("one resume", stream=True)
+        return [chunk.text async for chunk in response]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) > 1
+    assert json.loads("".join(chunks).strip("`json\n")) == CANNED_RESUME
+
+def test_errors_are_injected_at_the_configured_rate():
+    factory = FakeGeminiFactory(latency=0, jitter=0, error_rate=1.0)
+    with pytest.raises(ResourceExhausted):
+        factory("fake").generate_content("one resume")
+    assert factory.calls == 1
+
+def test_latency_stays_within_the_jitter():
+    factory = FakeGeminiFactory(latency=1.0, jitter=0.2)
+    assert all(0.8 <= factory.delay() <= 1.2 for _ in range(100))
+
+def test_percentiles_and_stage_means():
+    assert percentile([], 50) == 0.0
+    assert percentile(list(range(1, 101)), 50) == 50
+    assert percentile(list(range(1, 101)), 99) == 99
+    before = {(("stage", "model"),): (2, 2.0)}
+    after = {(("stage", "model"),): (4, 5.0), (("stage", "extract"),): (1, 0.5)}
+    assert stage_means(before, after) == {"model": 1.5, "extract": 0.5}
@@ -0,0 +1,21 @@
+# tests/test_formatter.py
+import pytest
+
+from bench_formatter import paragraph_signature, sample_resume
+from formatter import format_resume_from_json, format_resume_to_bytes
+from reference_formatter import render_with_python_docx
+
+@pytest.mark.parametrize("entries", [0, 1, 5])
+def test_template_engine_matches_the_python_docx_layout(tmp_path, entries):
+    data = sample_resume(entries)
+    reference_path = str(tmp_path / "reference.docx")
+    render_with_python_docx(data, reference_path)
+    assert paragraph_signature(format_resume_to_bytes(data)) == paragraph_signature(reference_path)
+
+def test_text_is_escaped_for_xml(tmp_path):
+    data = sample_resume(1)
+    data["Summary"] = 'Built <fast> & "safe" APIs'
+    path = str(tmp_path / "escaped.docx")
+    format_resume_from_json(data, path)
+    texts = [text for _, text, _, _ in paragraph_signature(path)[1:]]
+    assert 'Built <fast> & "safe" APIs' in texts
@@ -0,0 +1,56 @@
+# tests/test_heuristic_parser.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heuristic_parser import parse_resume_heuristic
+
+RESUME = """Jane Doe
+[EMAIL] | [PHONE]
+
+Summary
+Backend engineer with eight years of experience building payment systems.
+
+Experience
+Senior Engineer, Acme Payments
+Jan 2020 - Present
+- Led the migration of the ledger to PostgreSQL
+- Managed a team of 5 engineers
+
+Engineer, Globex
+2016 - 2019
+- Built the settlement batch jobs
+
+Education
+National University of Singapore
+Bachelor of Computing
+2012 - 2016
+
+Skills
+Python, Go, PostgreSQL, Kafka
+"""
+
+def test_well_structured_resume_is_parsed_confidently():
+    parsed, confidence = parse_resume_heuristic(RESUME)
+    assert confidence >= 0.85
+    assert [job["company"] for job in parsed["Experience"]] == ["Acme Payments", "Globex"]
+    assert parsed["Education"][0]["school"] == "National University of Singapore"
+    assert parsed["Skills"] == ["Python", "Go", "PostgreSQL", "Kafka"]
+
+def test_personal_details_section_is_dropped():
+    text = RESUME.replace("Skills\n", "Personal Details\nDate of Birth: 1 May 1990\nNationality: Singaporean\nNRIC: S1234567A\n\nSkills\n")
+    parsed, _ = parse_resume_heuristic(text)
+    flattened = repr(parsed)
+    for detail in ("1 May 1990", "Singaporean", "S1234567A"):
+        assert detail not in flattened
+    assert parsed["Skills"] == ["Python", "Go", "PostgreSQL", "Kafka"]
+
+def test_unrecognised_heading_leaves_the_parse_to_the_model():
+    text = RESUME + "\nMILITARY SERVICE\nNational Service, 3rd Battalion, 2010 - 2012\n"
+    _, confidence = parse_resume_heuristic(text)
+    assert confidence == 0.0
+
+def test_references_are_dropped():
+    parsed, _ = parse_resume_heuristic(RESUME + "\nReferences\nJohn Smith, CTO at Acme, john@acme.example\n")
+    assert "John Smith" not in repr(parsed)
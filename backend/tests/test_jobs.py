@@ -0,0 +1,67 @@
+# tests/test_jobs.py
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jobs
+from jobs import JobQueue, JobWorker
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(jobs, "JOB_RETRY_BASE_SECONDS", 0)
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+def submit(queue, tmp_path, name="resume.pdf", content=b"%PDF-1.4"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return queue.submit(name, str(path)), path
+
+def expire_lease(queue, job_id):
+    with queue._lock:
+        queue._conn.execute("UPDATE jobs SET lease_expires_at = 0 WHERE id = ?", (job_id,))
+
+def test_claim_takes_each_job_once(queue, tmp_path):
+    job_id, _ = submit(queue, tmp_path)
+    job = queue.claim()
+    assert job["id"] == job_id
+    assert queue.claim() is None
+    assert queue.get(job_id)["attempts"] == 1
+
+def test_expired_lease_is_claimed_again(queue, tmp_path):
+    job_id, _ = submit(queue, tmp_path)
+    queue.claim()
+    expire_lease(queue, job_id)
+    assert queue.claim()["id"] == job_id
+    assert queue.get(job_id)["attempts"] == 2
+
+def test_expired_lease_after_the_last_attempt_fails_the_job(queue, tmp_path):
+    job_id, path = submit(queue, tmp_path)
+    for _ in range(3):
+        assert queue.claim()["id"] == job_id
+        expire_lease(queue, job_id)
+    assert queue.claim() is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["attempts"] == 3
+    assert not path.exists()
+
+def test_retryable_failures_stop_at_max_attempts(queue, tmp_path):
+    job_id, _ = submit(queue, tmp_path)
+    for attempt in range(1, 4):
+        queue.claim()
+        queue.fail(job_id, "model unavailable", retry=True)
+        assert queue.get(job_id)["status"] == ("queued" if attempt < 3 else "failed")
+
+def test_corrupt_document_fails_without_retrying(queue, tmp_path):
+    job_id, path = submit(queue, tmp_path, content=b"not a pdf at all")
+    worker = JobWorker(queue)
+    asyncio.run(worker.process(queue.claim()))
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert job["error"].startswith("Could not read resume.pdf")
+    assert not path.exists()
@@ -0,0 +1,85 @@
+# tests/test_json_stream.py
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import anonymizer
+import model_client
+from fake_gemini import CANNED_RESUME, FakeResponse
+from json_stream import SectionStreamParser, repair_json
+from model_client import ModelClient
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1}\n```', {"a": 1}),
+    ('Here you go: {"a": [1, 2,], "b": {"c": "d",},} Thanks!', {"a": [1, 2], "b": {"c": "d"}}),
+    ('{"a": "line one\nline two"}', {"a": "line one\nline two"}),
+    ('[{"a": 1} {"a": 2}]', [{"a": 1}, {"a": 2}]),
+    ('{"a": "unterminated', {"a": "unterminated"}),
+    ('{"a": 1, "b": tr', {"a": 1, "b": None}),
+    ('{"a": [1, {"b": 2}, ', {"a": [1, {"b": 2}]}),
+    ('{"a": 1, "dangling"', {"a": 1}),
+])
+def test_repair_json(text, expected):
+    assert repair_json(text) == expected
+
+def test_repair_json_without_json_raises():
+    with pytest.raises(ValueError):
+        repair_json("The model declined to answer.")
+
+def test_sections_are_returned_as_soon_as_they_complete():
+    text = "```json\n" + json.dumps(CANNED_RESUME) + "\n```"
+    parser = SectionStreamParser()
+    completed = []
+    for i in range(0, len(text), 7):
+        completed.append([key for key, _ in parser.feed(text[i:i + 7])])
+    sections = [key for keys in completed for key in keys]
+    assert sections == list(CANNED_RESUME)
+    # Name is handed on long before the last chunk
+    assert next(i for i, keys in enumerate(completed) if "Name" in keys) < len(completed) // 10
+
+def test_section_values_with_nested_brackets_and_escapes():
+    parser = SectionStreamParser()
+    sections = parser.feed('{"a": {"b": ["}", "]"]}, "c": "say \\"hi\\", ok"}')
+    assert sections == [("a", {"b": ["}", "]"]}), ("c", 'say "hi", ok')]
+
+class DroppingStreamModel:
+    """
+    Streams the canned resume; the first stream fails after its first section
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, contents, stream=False, **kwargs):
+        self.calls += 1
+        text = json.dumps(CANNED_RESUME)
+        first_section_end = text.index(', "Summary"') + 1
+        fail = self.calls == 1
+
+        async def chunks():
+            yield FakeResponse(text[:first_section_end])
+            if fail:
+                raise api_exceptions.ServiceUnavailable("stream dropped")
+            yield FakeResponse(text[first_section_end:])
+
+        return chunks()
+
+def test_streamed_sections_are_handed_on_once_across_retries(monkeypatch):
+    model = DroppingStreamModel()
+    monkeypatch.setattr(model_client, "MODEL_BACKOFF_BASE_SECONDS", 0)
+    monkeypatch.setattr(anonymizer, "MODEL_STREAMING", True)
+    monkeypatch.setattr(anonymizer, "model_client", ModelClient("fake", lambda name: model))
+    received = []
+    parsed = asyncio.run(anonymizer.parse_resume_to_json_gemini_async(
+        "Alex Tan\nSoftware engineer", on_section=lambda key, value: received.append(key)))
+    assert model.calls == 2
+    assert received == list(CANNED_RESUME)
+    assert parsed["Name"] == CANNED_RESUME["Name"]
@@ -0,0 +1,65 @@
+# tests/test_log_config.py
+import json
+import logging
+import os
+import queue
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_config
+from log_config import JsonFormatter, LazyJson, _ContextFilter, _NonBlockingQueueHandler, request_id
+
+def make_record(level=logging.INFO, msg="Processed %s", args=("cv.pdf",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("resume", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_records_carry_the_request_id_and_extra_fields():
+    token = request_id.set("req-1")
+    try:
+        record = make_record(seconds=1.5)
+        assert _ContextFilter(1.0).filter(record)
+    finally:
+        request_id.reset(token)
+    entry = json.loads(JsonFormatter().format(record))
+    assert (entry["requestId"], entry["message"], entry["seconds"]) == ("req-1", "Processed cv.pdf", 1.5)
+    assert entry["level"] == "INFO" and entry["logger"] == "resume"
+    assert "args" not in entry and "request_id" not in entry
+
+def test_exceptions_are_formatted_into_the_record():
+    try:
+        raise ValueError("bad resume")
+    except ValueError:
+        record = logging.LogRecord("resume", logging.ERROR, __file__, 1, "Failed", (), sys.exc_info())
+    assert "ValueError: bad resume" in json.loads(JsonFormatter().format(record))["exc"]
+
+def test_debug_records_are_sampled():
+    sampled = _ContextFilter(0.0)
+    assert not sampled.filter(make_record(logging.DEBUG))
+    assert sampled.filter(make_record(logging.INFO))
+    assert _ContextFilter(1.0).filter(make_record(logging.DEBUG))
+
+class Payload:
+    serialized = 0
+
+    def __repr__(self):
+        Payload.serialized += 1
+        return "payload"
+
+def test_lazy_json_is_serialized_only_when_written():
+    value = LazyJson({"payload": Payload()})
+    record = make_record(msg="Response %s", args=(value,))
+    handler = _NonBlockingQueueHandler(queue.Queue())
+    handler.handle(record)
+    assert Payload.serialized == 0
+    assert record.getMessage() == 'Response {"payload": "payload"}'
+    assert Payload.serialized == 1
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = log_config.dropped_records._values.get((), 0)
+    for _ in range(3):
+        handler.handle(make_record())
+    assert handler.queue.qsize() == 1
+    assert log_config.dropped_records._values[()] == before + 2
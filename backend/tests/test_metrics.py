@@ -0,0 +1,52 @@
+# tests/test_metrics.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+from conftest import upload
+from metrics import Counter, Histogram, render_prometheus, stage_timer
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_histogram_seconds", "Test histogram", (1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value, stage="parse")
+    lines = histogram.render()
+    assert 'test_histogram_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'test_histogram_seconds_bucket{stage="parse",le="5"} 3' in lines
+    assert 'test_histogram_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'test_histogram_seconds_count{stage="parse"} 4' in lines
+    assert 'test_histogram_seconds_sum{stage="parse"} 14.5' in lines
+
+def test_counters_are_kept_per_label_set():
+    counter = Counter("test_events_total", "Test counter")
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    counter.inc(outcome="error")
+    assert "# TYPE test_events_total counter" in render_prometheus()
+    assert counter.render()[2:] == ['test_events_total{outcome="error"} 1', 'test_events_total{outcome="ok"} 3']
+
+def test_stage_timer_counts_errors_and_fills_request_timings():
+    timings = metrics.start_request_timings()
+    before = metrics.stage_seconds.snapshot().get((("stage", "test_stage"),), (0, 0))[0]
+    with stage_timer("test_stage"):
+        pass
+    with pytest.raises(ValueError):
+        with stage_timer("test_stage"):
+            raise ValueError("boom")
+    assert metrics.stage_seconds.snapshot()[(("stage", "test_stage"),)][0] == before + 2
+    assert 'resume_stage_errors_total{stage="test_stage"} 1' in metrics.stage_errors.render()
+    assert list(timings) == ["test_stage"]
+    assert metrics.server_timing_header(timings).startswith("test_stage;dur=")
+
+def test_metrics_endpoint_and_server_timing_header(api, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TIMING_HEADER", True)
+    response = api.post("/anonymize-single", files={"file": upload("timed.docx")})
+    assert response.status_code == 200
+    assert "extract;dur=" in response.headers["Server-Timing"]
+    body = api.get("/metrics").text
+    assert 'resume_stage_seconds_count{stage="extract"}' in body
+    assert "# TYPE resumes_processed_total counter" in body
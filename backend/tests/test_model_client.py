@@ -0,0 +1,116 @@
+# tests/test_model_client.py
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_client
+from model_client import CircuitBreaker, ModelClient, ModelCircuitOpenError, ModelUnavailableError
+
+class FakeModel:
+    """
+    Answers each generate_content_async call with the next outcome: an
+    exception to raise, a number of seconds to hang, or a response
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def generate_content_async(self, contents, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if isinstance(outcome, (int, float)):
+            await asyncio.sleep(outcome)
+        return outcome
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(model_client, "MODEL_MAX_RETRIES", 2)
+    monkeypatch.setattr(model_client, "MODEL_BACKOFF_BASE_SECONDS", 0)
+
+def make_client(model, threshold=2, cooldown=0.1) -> ModelClient:
+    client = ModelClient("fake", lambda name: model)
+    client.breaker = CircuitBreaker(threshold, cooldown)
+    return client
+
+def unavailable():
+    return api_exceptions.ServiceUnavailable("overloaded")
+
+def test_transient_errors_are_retried():
+    model = FakeModel(unavailable(), unavailable(), "done")
+    client = make_client(model)
+    assert asyncio.run(client.generate("prompt", tokens=10)) == "done"
+    assert model.calls == 3
+    assert client.breaker.state == "closed"
+
+def test_breaker_counts_failed_calls_not_attempts():
+    model = FakeModel(*[unavailable() for _ in range(6)])
+    client = make_client(model, threshold=2)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(ModelUnavailableError):
+                await client.generate("prompt", tokens=10)
+            assert client.breaker.failures <= 2
+        with pytest.raises(ModelCircuitOpenError):
+            await client.generate("prompt", tokens=10)
+
+    asyncio.run(run())
+    assert model.calls == 6
+    assert client.breaker.state == "open"
+
+def test_successful_probe_closes_the_breaker():
+    client = make_client(FakeModel("done"), threshold=1)
+    client.breaker.record_failure()
+    time.sleep(0.15)
+    assert client.breaker.state == "half_open"
+    assert asyncio.run(client.generate("prompt", tokens=10)) == "done"
+    assert client.breaker.state == "closed"
+
+def test_failed_probe_reopens_without_retrying():
+    model = FakeModel(unavailable(), "done")
+    client = make_client(model, threshold=1)
+    client.breaker.record_failure()
+    time.sleep(0.15)
+    with pytest.raises(ModelUnavailableError):
+        asyncio.run(client.generate("prompt", tokens=10))
+    assert client.breaker.state == "open"
+
+def test_cancelled_probe_lets_the_next_call_probe():
+    client = make_client(FakeModel(5, "done"), threshold=1)
+    client.breaker.record_failure()
+    time.sleep(0.15)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.generate("prompt", tokens=10), 0.05)
+        assert not client.breaker.probing
+        return await client.generate("prompt", tokens=10)
+
+    assert asyncio.run(run()) == "done"
+    assert client.breaker.state == "closed"
+
+def test_non_transient_error_leaves_the_breaker_alone():
+    client = make_client(FakeModel(api_exceptions.InvalidArgument("bad request")), threshold=3)
+    client.breaker.failures = 2
+    with pytest.raises(api_exceptions.InvalidArgument):
+        asyncio.run(client.generate("prompt", tokens=10))
+    assert client.breaker.failures == 2
+
+def test_non_transient_error_on_a_probe_does_not_close_the_breaker():
+    client = make_client(FakeModel(api_exceptions.PermissionDenied("bad key")), threshold=1)
+    client.breaker.record_failure()
+    time.sleep(0.15)
+    with pytest.raises(api_exceptions.PermissionDenied):
+        asyncio.run(client.generate("prompt", tokens=10))
+    assert client.breaker.state == "half_open"
+    assert not client.breaker.probing
+    assert client.breaker.failures == 1
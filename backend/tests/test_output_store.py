@@ -0,0 +1,77 @@
+# tests/test_output_store.py
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from output_store import OutputStore, output_name, valid_output_name
+
+def make_store(tmp_path, ttl_seconds=3600, max_bytes=1024 * 1024) -> OutputStore:
+    return OutputStore(str(tmp_path / "outputs"), str(tmp_path / "outputs.db"), ttl_seconds, max_bytes)
+
+def blob_files(tmp_path) -> list:
+    return [name for _, _, names in os.walk(tmp_path / "outputs" / "blobs") for name in names]
+
+@pytest.mark.parametrize("filename, expected", [
+    ("Jane Doe CV.pdf", "id_Jane Doe CV_anonymized.docx"),
+    ("John's résumé (final).docx", "id_John_s résumé (final)_anonymized.docx"),
+    ("../../etc/passwd", "id_passwd_anonymized.docx"),
+    ("...", "id_resume_anonymized.docx"),
+])
+def test_output_names_are_safe(filename, expected):
+    name = output_name("id", filename, ".docx")
+    assert name == expected
+    assert valid_output_name(name)
+
+def test_long_file_names_are_shortened():
+    assert len(output_name("id", "x" * 500 + ".pdf", ".docx")) < 255
+
+def test_same_content_is_stored_once(tmp_path):
+    store = make_store(tmp_path)
+    first = store.put("a_anonymized.docx", b"same bytes")
+    second = store.put("b_anonymized.docx", b"same bytes")
+    assert first.digest == second.digest
+    assert len(blob_files(tmp_path)) == 1
+    assert store.stats()["outputs"] == 2
+
+def test_outputs_stored_by_another_process_are_found(tmp_path):
+    writer, reader = make_store(tmp_path), make_store(tmp_path)
+    writer.put("a_anonymized.docx", b"content")
+    entry = reader.get("a_anonymized.docx")
+    assert entry is not None
+    assert open(entry.path, "rb").read() == b"content"
+
+def test_sweep_expires_outputs_past_the_ttl(tmp_path):
+    store = make_store(tmp_path, ttl_seconds=0)
+    store.put("a_anonymized.docx", b"old")
+    time.sleep(0.01)
+    assert store.sweep() == {"expired": 1, "evicted": 0, "blobsRemoved": 1}
+    assert store.get("a_anonymized.docx") is None
+    assert blob_files(tmp_path) == []
+
+def test_sweep_evicts_least_recently_used_over_the_cap(tmp_path):
+    store = make_store(tmp_path, max_bytes=10)
+    store.put("a_anonymized.docx", b"123456")
+    store.put("b_anonymized.docx", b"abcdef")
+    store.get("a_anonymized.docx")
+    assert store.sweep()["evicted"] == 1
+    assert store.get("a_anonymized.docx") is not None
+    assert store.get("b_anonymized.docx") is None
+
+def test_sweep_covers_outputs_of_other_processes(tmp_path):
+    writer = make_store(tmp_path, ttl_seconds=0)
+    sweeper = make_store(tmp_path, ttl_seconds=0)
+    writer.put("a_anonymized.docx", b"content")
+    time.sleep(0.01)
+    assert sweeper.sweep()["expired"] == 1
+    assert blob_files(tmp_path) == []
+
+def test_discard_forgets_an_output_with_a_missing_blob(tmp_path):
+    store = make_store(tmp_path)
+    entry = store.put("a_anonymized.docx", b"content")
+    os.remove(entry.path)
+    store.discard("a_anonymized.docx")
+    assert store.get("a_anonymized.docx") is None
@@ -0,0 +1,44 @@
+# tests/test_pdf_extract.py
+import io
+
+import pytest
+
+import pdf_extract
+from corpus import make_pdf
+from pdf_extract import extract_pdf_text
+
+PAGES = [[f"Page {n} heading", f"Line two of page {n}"] for n in range(1, 11)]
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdf") / "resume.pdf"
+    path.write_bytes(make_pdf(PAGES))
+    return str(path)
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+def test_pages_are_extracted_in_order_and_separated(pdf_path, backend, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "PDF_PROCESS_WORKERS", 1)
+    pages = extract_pdf_text(pdf_path, backend=backend).split("\f")
+    assert len(pages) == 10
+    for n, text in enumerate(pages, 1):
+        assert f"Page {n} heading" in text and f"Line two of page {n}" in text
+
+def test_pages_beyond_the_limit_are_skipped(pdf_path):
+    assert extract_pdf_text(pdf_path, max_pages=3).count("\f") == 2
+
+def test_paths_file_objects_and_bytes_give_the_same_text(pdf_path):
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+        f.seek(5)  # a consumed stream is rewound
+        from_file = extract_pdf_text(f, max_pages=4)
+    assert from_file == extract_pdf_text(pdf_path, max_pages=4) == extract_pdf_text(io.BytesIO(data), max_pages=4)
+
+def test_long_documents_split_across_processes_match(pdf_path, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "PDF_PROCESS_WORKERS", 1)
+    serial = extract_pdf_text(pdf_path)
+    monkeypatch.setattr(pdf_extract, "PDF_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(pdf_extract, "PDF_PARALLEL_MIN_PAGES", 4)
+    try:
+        assert extract_pdf_text(pdf_path) == serial
+    finally:
+        pdf_extract.shutdown()
@@ -0,0 +1,43 @@
+# tests/test_pipeline.py
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+from pipeline import pack_batches
+
+def test_pack_batches_keeps_groups_within_the_budget():
+    texts = ["x" * 400] * 5  # about 100 tokens each
+    assert pack_batches(texts, token_budget=250, max_resumes=8) == [[0, 1], [2, 3], [4]]
+
+def test_pack_batches_caps_resumes_per_group():
+    assert pack_batches(["short"] * 5, token_budget=10000, max_resumes=2) == [[0, 1], [2, 3], [4]]
+
+def test_oversized_resume_gets_its_own_group():
+    assert pack_batches(["x" * 4000, "short"], token_budget=100, max_resumes=8) == [[0], [1]]
+
+def test_failing_group_only_fails_its_own_resumes(monkeypatch):
+    async def batch_parser(texts):
+        if "bad" in texts:
+            raise RuntimeError("request rejected")
+        return [{"Name": text} for text in texts]
+
+    monkeypatch.setattr(pipeline, "parse_resumes_batch_gemini_async", batch_parser)
+    monkeypatch.setattr(pipeline, "pack_batches", lambda texts: [[0, 1], [2, 3]])
+    results = asyncio.run(pipeline.parse_resumes_batch(["a", "b", "bad", "c"], bypass_cache=True, engine="llm"))
+    assert results[:2] == [{"Name": "a"}, {"Name": "b"}]
+    assert all(isinstance(result, RuntimeError) for result in results[2:])
+
+def test_identical_resumes_in_a_batch_are_sent_once(monkeypatch):
+    sent = []
+
+    async def batch_parser(texts):
+        sent.extend(texts)
+        return [{"Name": text} for text in texts]
+
+    monkeypatch.setattr(pipeline, "parse_resumes_batch_gemini_async", batch_parser)
+    results = asyncio.run(pipeline.parse_resumes_batch(["a", "b", "a"], bypass_cache=True, engine="llm"))
+    assert results == [{"Name": "a"}, {"Name": "b"}, {"Name": "a"}]
+    assert sent == ["a", "b"]
@@ -0,0 +1,41 @@
+# tests/test_prompt_compaction.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_compaction import compact_resume_text
+
+BULLET = "- Managed a team of 5 engineers across two sites"
+
+def page(number: int, body: list) -> str:
+    return "\n".join(["Jane Doe - Curriculum Vitae", *body, f"Page {number} of 3"])
+
+def test_running_headers_and_page_numbers_are_dropped():
+    text = "\f".join(page(n, [f"Line {n} of the body text"]) for n in range(1, 4))
+    compacted, stats = compact_resume_text(text)
+    assert compacted.count("Jane Doe - Curriculum Vitae") == 1
+    assert "Page 2 of 3" not in compacted
+    assert all(f"Line {n} of the body text" in compacted for n in range(1, 4))
+    assert stats["tokensAfter"] < stats["tokensBefore"]
+
+def test_bullet_repeated_under_different_jobs_is_kept():
+    text = "\n".join(["Engineer, Acme", "2018 - 2020", BULLET, "Lead, Globex", "2020 - 2023", BULLET])
+    compacted, stats = compact_resume_text(text)
+    assert compacted.count(BULLET) == 2
+    assert "duplicate" not in stats["linesRemoved"]
+
+def test_line_repeated_back_to_back_is_dropped():
+    compacted, stats = compact_resume_text("\n".join(["Engineer, Acme", BULLET, BULLET]))
+    assert compacted.count(BULLET) == 1
+    assert stats["linesRemoved"]["duplicate"] == 1
+
+def test_low_value_sections_are_dropped():
+    compacted, _ = compact_resume_text("Skills\nPython\nHobbies\nChess and hiking\nEducation\nBSc Computing")
+    assert "Chess" not in compacted
+    assert "BSc Computing" in compacted
+
+def test_text_over_the_budget_is_cut_at_a_line():
+    compacted, stats = compact_resume_text("\n".join(f"Achievement number {n} of many" for n in range(200)), token_budget=100)
+    assert compacted.endswith("further lines omitted]")
+    assert stats["linesRemoved"]["truncated"] > 0
@@ -0,0 +1,81 @@
+# tests/test_redactor.py
+"""
+Run from the backend directory:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redactor import redact_text, find_leaks
+
+@pytest.mark.parametrize("text, phone", [
+    ("Call +65 9123 4567 after 6pm", "+65 9123 4567"),
+    ("+6591234567", "+6591234567"),
+    ("+1 (555) 123-4567", "+1 (555) 123-4567"),
+    ("+44 20 7946 0958", "+44 20 7946 0958"),
+    ("(555) 123-4567", "(555) 123-4567"),
+    ("555-123-4567", "555-123-4567"),
+    ("555.123.4567", "555.123.4567"),
+    ("Call 0912 345 678", "0912 345 678"),
+    ("Mobile: 91234567", "91234567"),
+    ("Phone 9123-4567", "9123-4567"),
+    ("TEL. +65 6123 4567", "+65 6123 4567"),
+    ("HP: 81234567 | john@example.com", "81234567"),
+])
+def test_phone_shaped_numbers_are_redacted(text, phone):
+    redacted, removed = redact_text(text)
+    assert removed["PHONE"] == [phone]
+    assert phone not in redacted
+    assert "[PHONE]" in redacted
+
+@pytest.mark.parametrize("text", [
+    "Grew revenue by 1500000",
+    "Budget SGD 1200000",
+    "Student ID 12345678",
+    "Project 2019 2020",
+    "Software Engineer, 2016-2020",
+    "Analyst 2014 – 2016",
+    "Configured hosts on 192.168.0.1 and 10.0.0.254",
+    "Version 2.4.1 released 12.05.2020",
+    "Reduced costs by 35% across 1200 stores",
+    "Certified to ISO 9001 2015",
+    "Served 1200 1500 customers a day",
+    "Type rated on the Boeing 737 8000 series",
+    "Ordered SKU 123-4567 in bulk",
+    "Unlabelled 9123 4567",
+    "Projects 2019 2020 2021",
+])
+def test_other_numbers_are_kept(text):
+    redacted, removed = redact_text(text)
+    assert redacted == text
+    assert "PHONE" not in removed
+
+def test_label_stays_and_only_the_number_is_recorded():
+    redacted, removed = redact_text("Mobile No.: +65 9123 4567\nWorked at Acme 2019 2020")
+    assert redacted == "Mobile No.: [PHONE]\nWorked at Acme 2019 2020"
+    assert removed == {"PHONE": ["+65 9123 4567"]}
+
+def test_label_followed_by_years_is_not_a_phone():
+    text = "HP 2019 - 2021: led the printer firmware team"
+    assert redact_text(text) == (text, {})
+
+def test_street_names_in_prose_are_not_addresses():
+    text = "Ran 5 Marathons Way faster than planned"
+    assert redact_text(text) == (text, {})
+
+def test_addresses_after_a_label_are_redacted():
+    assert redact_text("Address: 12 Baker Street") == ("Address: [ADDRESS]", {"ADDRESS": ["12 Baker Street"]})
+
+def test_other_contact_details():
+    redacted, removed = redact_text("jane.doe@example.com\nlinkedin.com/in/janedoe\n12 Baker Street")
+    assert redacted == "[EMAIL]\n[URL]\n[ADDRESS]"
+    assert removed["EMAIL"] == ["jane.doe@example.com"]
+
+def test_find_leaks_reports_redacted_numbers_in_model_output():
+    _, removed = redact_text("Call +65 9123 4567")
+    parsed = {"Name": "Jane", "Summary": "Reach me on +65 9123 4567", "Skills": ["Python"]}
+    assert find_leaks(parsed, removed) == ["+65 9123 4567"]
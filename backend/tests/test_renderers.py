@@ -0,0 +1,50 @@
+# tests/test_renderers.py
+import io
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from conftest import upload
+from docx_extract import extract_docx_text
+from fake_gemini import CANNED_RESUME
+from renderers import OUTPUT_FORMATS, get_renderer, render_resume, renderer_for_name
+
+def test_docx_holds_every_section():
+    text = extract_docx_text(io.BytesIO(render_resume(CANNED_RESUME, "docx")))
+    for expected in ("Alex Tan", "Acme Corp", "Automated weekly dashboards", "National University of Singapore", "Hackathon winner"):
+        assert expected in text
+
+def test_pdf_is_a_complete_document():
+    data = render_resume(CANNED_RESUME, "pdf")
+    assert data.startswith(b"%PDF-")
+    assert data.rstrip().endswith(b"%%EOF")
+
+def test_html_preview_escapes_resume_text():
+    resume = dict(CANNED_RESUME, Name="A <b>bold</b> & Co", Achievements=["<script>alert(1)</script>"])
+    page = render_resume(resume, "html").decode("utf-8")
+    assert "A &lt;b&gt;bold&lt;/b&gt; &amp; Co" in page
+    assert "<script>" not in page
+
+def test_renderers_are_found_by_format_and_extension():
+    assert OUTPUT_FORMATS == ("docx", "pdf", "html")
+    assert renderer_for_name("x_anonymized.PDF") is get_renderer("pdf")
+    assert renderer_for_name("x_anonymized.txt") is None
+    with pytest.raises(ValueError):
+        get_renderer("txt")
+
+def test_other_formats_are_rendered_on_first_download(api, fake_gemini):
+    result = api.post("/anonymize-single", params={"format": "html"}, files={"file": upload("formats.docx")}).json()
+    assert result["fileName"].endswith(".html")
+    calls = fake_gemini.calls
+    for output_format, media_type in (("docx", "application/vnd.openxmlformats"), ("pdf", "application/pdf")):
+        response = api.get(result["downloads"][output_format].removeprefix("http://localhost:8000"))
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(media_type)
+    # Rendered from the recorded parse, without asking the model again
+    assert fake_gemini.calls == calls
+    assert api.get("/download/0_missing_anonymized.pdf").status_code == 404
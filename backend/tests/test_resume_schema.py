@@ -0,0 +1,80 @@
+# tests/test_resume_schema.py
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import anonymizer
+from fake_gemini import CANNED_RESUME, FakeResponse
+from model_client import ModelClient
+from resume_schema import normalize_resume
+
+def test_canned_resume_is_already_in_shape():
+    resume, missing = normalize_resume(CANNED_RESUME)
+    assert missing == []
+    data = resume.to_dict()
+    assert data["Experience"][1]["description"] == ["Built reporting pipelines", "Automated weekly dashboards"]
+    assert data["Projects"][0]["technologies"] == ["Python", "FastAPI"]
+
+def test_aliases_and_shapes_are_coerced():
+    resume, missing = normalize_resume({
+        "name": " Candidate ",
+        "Work Experience": {"Role": "Engineer", "employer": "Acme", "duration": "2020", "responsibilities": "Built\n\nShipped"},
+        "skills": "Python, SQL; Go\nRust",
+        "Education": [{"qualification": "BSc", "university": "NUS", "date": "2018", "details": ["Honours", "Dean's list"]}],
+        "Achievements": None,
+        "Hobbies": ["Chess"],
+    })
+    assert missing == []
+    data = resume.to_dict()
+    assert data["Name"] == "Candidate"
+    assert data["Skills"] == ["Python", "SQL", "Go", "Rust"]
+    assert data["Experience"] == [{"job_title": "Engineer", "company": "Acme", "dates": "2020", "description": ["Built", "Shipped"]}]
+    assert data["Education"][0]["description"] == "Honours Dean's list"
+    assert data["Achievements"] == [] and "Hobbies" not in data
+
+def test_missing_required_fields_are_reported_by_path():
+    _, missing = normalize_resume({"Experience": [{"job_title": "Engineer", "company": ""}, "not an entry"], "Projects": [{}]})
+    # Empty is not missing; only absent keys are
+    assert missing == ["Name", "Experience[0].dates", "Projects[0].title"]
+
+def test_set_path_fills_plain_fields_and_entries():
+    resume, _ = normalize_resume({"Experience": [{"job_title": "Engineer"}]})
+    assert resume.set_path("Name", "Candidate")
+    assert resume.set_path("Experience[0].company", "Acme")
+    assert not resume.set_path("Experience[1].company", "Globex")
+    assert not resume.set_path("Experience[0].salary", "1")
+    assert not resume.set_path("Experience", "Acme")
+    assert (resume.name, resume.experience[0].company) == ("Candidate", "Acme")
+
+def test_non_object_output_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_resume(["not", "a", "resume"])
+
+class RepairModel:
+    def __init__(self, answer: dict):
+        self.answer = answer
+        self.prompts = []
+
+    async def generate_content_async(self, contents, **kwargs):
+        self.prompts.append(contents[-1])
+        return FakeResponse(json.dumps(self.answer))
+
+def test_missing_fields_are_asked_for_once(monkeypatch):
+    model = RepairModel({"Name": "Candidate", "Experience[0].dates": "2020 - 2022"})
+    monkeypatch.setattr(anonymizer, "SCHEMA_REPAIR", True)
+    monkeypatch.setattr(anonymizer, "model_client", ModelClient("fake", lambda name: model))
+    parsed = {"Experience": [{"job_title": "Engineer", "company": "Acme"}], "Projects": [{"description": "A tool"}]}
+    data = asyncio.run(anonymizer.complete_resume("resume text", parsed))
+    assert len(model.prompts) == 1
+    assert "Projects[0].title" in model.prompts[0]
+    assert data["Name"] == "Candidate"
+    assert data["Experience"][0]["dates"] == "2020 - 2022"
+    # Not answered, so left empty
+    assert data["Projects"][0]["title"] == ""
@@ -0,0 +1,33 @@
+# tests/test_settings.py
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs from a directory holding the .env; prints settings read at import time
+CHILD = """
+import json, sys
+sys.path.insert(0, {backend!r})
+import main, model_client, prompt_compaction, pdf_extract, metrics
+print(json.dumps([model_client.MODEL_RPM, prompt_compaction.PROMPT_TOKEN_BUDGET,
+                  pdf_extract.PDF_MAX_PAGES, metrics.METRICS_TIMING_HEADER]))
+"""
+
+def test_dotenv_settings_reach_modules_read_at_import(tmp_path):
+    (tmp_path / ".env").write_text("MODEL_RPM=7\nPROMPT_TOKEN_BUDGET=1234\nPDF_MAX_PAGES=9\nMETRICS_TIMING_HEADER=true\n")
+    env = {name: value for name, value in os.environ.items()
+           if name not in ("MODEL_RPM", "PROMPT_TOKEN_BUDGET", "PDF_MAX_PAGES", "METRICS_TIMING_HEADER")}
+    env.update(
+        JOB_DB_PATH=str(tmp_path / "jobs.db"),
+        JOB_WORKERS="0",
+        RESULT_CACHE_PATH=str(tmp_path / "cache.db"),
+        OUTPUT_DIR=str(tmp_path / "outputs"),
+        OUTPUT_INDEX_PATH=str(tmp_path / "outputs.db"),
+        LOG_FILE="",
+        LOG_CONSOLE="false",
+    )
+    completed = subprocess.run([sys.executable, "-c", CHILD.format(backend=BACKEND_DIR)],
+                               cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == [7, 1234, 9, True]
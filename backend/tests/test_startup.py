@@ -0,0 +1,52 @@
+# tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import BACKEND_DIR
+
+HEAVY_MODULES = ("google.generativeai", "google.api_core", "pdfplumber", "pdfminer", "docx")
+
+# Runs in a fresh interpreter, since the test session has long imported everything
+CHILD = """
+import json, sys
+sys.path.insert(0, {backend!r})
+import main
+before = [name for name in {modules!r} if name in sys.modules]
+steps = main.pipeline.warm_up()
+after = [name for name in {modules!r} if name in sys.modules]
+print(json.dumps({{"before": before, "after": after, "steps": sorted(steps)}}))
+"""
+
+def test_import_is_light_and_warm_up_loads_each_stage(tmp_path):
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD.format(backend=BACKEND_DIR, modules=HEAVY_MODULES)],
+        cwd=tmp_path, env=dict(os.environ, PARSER_ENGINE="llm"), capture_output=True, text=True, check=True,
+    )
+    result = json.loads(completed.stdout.splitlines()[-1])
+    assert result["before"] == []
+    assert {"pdfplumber", "docx", "google.generativeai"} <= set(result["after"])
+    assert result["steps"] == ["model_client", "pdf_extract", "render_docx", "render_html", "render_pdf"]
+
+def test_failed_warm_up_step_is_left_to_first_use(monkeypatch):
+    import pipeline
+
+    def broken():
+        raise OSError("extractor unavailable")
+
+    monkeypatch.setattr(pipeline.pdf_extract, "warm_up", broken)
+    monkeypatch.setattr(pipeline, "PARSER_ENGINE", "local")
+    steps = pipeline.warm_up()
+    assert "pdf_extract" in steps and "model_client" not in steps
+
+def test_health_and_readiness(api, monkeypatch):
+    import main
+
+    assert api.get("/healthz").json() == {"status": "ok"}
+    assert api.get("/readyz").status_code == 200
+    monkeypatch.setitem(main.readiness, "ready", False)
+    assert api.get("/readyz").status_code == 503
+    assert api.get("/healthz").status_code == 200
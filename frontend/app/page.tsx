@@ -2,14 +2,65 @@
 
 import { useState } from 'react'
 
+type FileProgress = {
+  status: 'pending' | 'processing' | 'completed' | 'error',
+  stage?: string,
+  url?: string,
+  previewUrl?: string,
+  error?: string
+}
+
+type EventData = Record<string, unknown>
+
+// Human-readable stage for each server-sent pipeline event
+const describeEvent = (event: string, data: EventData): string => {
+  switch (event) {
+    case 'received': return 'Uploaded'
+    case 'extracted': return `Extracted ${data.chars} characters`
+    case 'redacted': return 'Contact details removed'
+    case 'model_started': return 'Parsing with AI...'
+    case 'section': return `Parsed ${data.section}`
+    case 'model_finished': return 'Parsed'
+    case 'preview': return 'Preview ready'
+    case 'formatted': return 'Document ready'
+    default: return event
+  }
+}
+
+// Read a text/event-stream response body, calling onEvent for each event
+const readEvents = async (response: Response, onEvent: (event: string, data: EventData) => void) => {
+  const reader = response.body!.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const frame = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      let event = 'message'
+      let data = ''
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim()
+        else if (line.startsWith('data:')) data += line.slice(5).trim()
+      }
+      if (data) onEvent(event, JSON.parse(data))
+    }
+  }
+}
+
+// One ZIP of all finished resumes, with a CSV manifest of the parsed fields
+const bundleUrl = (downloadUrls: string[]) => {
+  const names = downloadUrls.map(url => `name=${encodeURIComponent(url.split('/').pop()!)}`)
+  return `http://localhost:8000/download-bundle?${names.join('&')}&manifest=csv`
+}
+
 export default function Home() {
   const [files, setFiles] = useState<File[]>([])
   const [uploading, setUploading] = useState(false)
   const [downloadUrls, setDownloadUrls] = useState<string[]>([])
-  const [progress, setProgress] = useState<{[key: string]: {
-    status: 'pending' | 'processing' | 'completed' | 'error',
-    url?: string
-  }}>({})
+  const [progress, setProgress] = useState<{[key: string]: FileProgress}>({})
 
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files) {
@@ -23,32 +74,51 @@ export default function Home() {
     
     setProgress(prev => ({
       ...prev,
-      [file.name]: { status: 'processing' }
+      [file.name]: { status: 'processing', stage: 'Uploading...' }
     }))
 
     try {
-      const response = await fetch('http://localhost:8000/anonymize-single', {
+      const response = await fetch('http://localhost:8000/anonymize-stream', {
         method: 'POST',
         body: formData,
       })
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Failed to anonymize resume')
       }
 
-      const data = await response.json()
-      
+      const outcome: { url?: string, previewUrl?: string, error?: string } = {}
+      await readEvents(response, (event, data) => {
+        if (event === 'ready') {
+          outcome.url = data.downloadUrl as string
+          outcome.previewUrl = data.previewUrl as string
+        } else if (event === 'error') {
+          outcome.error = data.detail as string
+        } else {
+          // The HTML preview can be opened while the document is still being formatted
+          if (event === 'preview') outcome.previewUrl = data.previewUrl as string
+          setProgress(prev => ({
+            ...prev,
+            [file.name]: { status: 'processing', stage: describeEvent(event, data), previewUrl: outcome.previewUrl }
+          }))
+        }
+      })
+
+      if (!outcome.url) {
+        throw new Error(outcome.error ?? 'Processing ended without a result')
+      }
+
       setProgress(prev => ({
         ...prev,
-        [file.name]: { status: 'completed', url: data.downloadUrl }
+        [file.name]: { status: 'completed', url: outcome.url, previewUrl: outcome.previewUrl }
       }))
       
-      return data.downloadUrl
+      return outcome.url
     } catch (error) {
       console.error('Error processing file:', file.name, error)
       setProgress(prev => ({
         ...prev,
-        [file.name]: { status: 'error' }
+        [file.name]: { status: 'error', error: error instanceof Error ? error.message : undefined }
       }))
       return null
     }
@@ -59,7 +129,7 @@ export default function Home() {
     if (files.length === 0) return
 
     setUploading(true)
-    const newProgress: {[key: string]: {status: 'pending' | 'processing' | 'completed' | 'error', url?: string}} = {}
+    const newProgress: {[key: string]: FileProgress} = {}
     files.forEach(file => {
       newProgress[file.name] = { status: 'pending' }
     })
@@ -129,6 +199,16 @@ export default function Home() {
                       }`} />
                       <span className="text-sm">{fileName}</span>
                     </div>
+                    {status.previewUrl && (
+                      <a
+                        href={status.previewUrl}
+                        target="_blank"
+                        rel="noopener noreferrer"
+                        className="ml-auto mr-4 text-sm text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300 underline"
+                      >
+                        Preview
+                      </a>
+                    )}
                     {status.status === 'completed' && status.url && (
                       <a
                         href={status.url}
@@ -139,10 +219,10 @@ export default function Home() {
                       </a>
                     )}
                     {status.status === 'error' && (
-                      <span className="text-sm text-red-500">Failed to process</span>
+                      <span className="text-sm text-red-500" title={status.error}>Failed to process</span>
                     )}
                     {status.status === 'processing' && (
-                      <span className="text-sm text-blue-500">Processing...</span>
+                      <span className="text-sm text-blue-500">{status.stage ?? 'Processing...'}</span>
                     )}
                     {status.status === 'pending' && (
                       <span className="text-sm text-gray-500">Pending...</span>
@@ -150,6 +230,15 @@ export default function Home() {
                   </li>
                 ))}
               </ul>
+              {!uploading && downloadUrls.length > 1 && (
+                <a
+                  href={bundleUrl(downloadUrls)}
+                  download
+                  className="mt-4 block w-full text-center py-2 px-4 rounded-md text-sm font-medium text-white bg-green-600 hover:bg-green-700"
+                >
+                  Download all ({downloadUrls.length}) as ZIP
+                </a>
+              )}
             </div>
           )}
         </div>